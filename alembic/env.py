@@ -14,6 +14,7 @@ from app.models.raid import Raid
 from app.models.troop_type import TroopType  # noqa: F401, E402
 from app.models.city_troop import CityTroop  # noqa: F401, E402
 from app.models.raid_troop import RaidTroop  # noqa: F401, E402
+from app.models.tick_lease import TickLease  # noqa: F401, E402
 
 # --- Make sure project root is on sys.path so "import app..." works ---
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -0,0 +1,48 @@
+"""add hot query indexes
+
+Revision ID: 8b4d2e6f1a37
+Revises: 3f1c2a9d7b44
+Create Date: 2026-10-15 11:20:07.514903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b4d2e6f1a37'
+down_revision: Union[str, Sequence[str], None] = '3f1c2a9d7b44'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns)
+INDEXES = [
+    ("ix_raids_status_arrives_at", "raids", ["status", "arrives_at"]),
+    ("ix_raids_status_returns_at", "raids", ["status", "returns_at"]),
+    ("ix_upgrades_completes_at", "upgrades", ["completes_at"]),
+    ("ix_training_queue_status_finishes_at", "training_queue", ["status", "finishes_at"]),
+    ("ix_research_queue_status_finishes_at", "research_queue", ["status", "finishes_at"]),
+    ("ix_mail_messages_user_read", "mail_messages", ["user_id", "is_read", "id"]),
+    ("ix_mail_messages_user_kind", "mail_messages", ["user_id", "kind", "id"]),
+]
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    # mail_messages / research_queue predate migrations on some databases,
+    # and create_all() databases already have these indexes.
+    for name, table, columns in INDEXES:
+        if _has_table(table):
+            op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _columns in reversed(INDEXES):
+        if _has_table(table):
+            op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,33 @@
+"""add world_clock
+
+Revision ID: a7c4e1f08b93
+Revises: f3b7d2a94c61
+Create Date: 2026-10-15 19:21:47.803215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c4e1f08b93'
+down_revision: Union[str, Sequence[str], None] = 'f3b7d2a94c61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # No row yet: the first world tick records one (app/game/world_clock.py)
+    op.create_table(
+        "world_clock",
+        sa.Column("name", sa.String(length=40), nullable=False),
+        sa.Column("ticked_to", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("world_clock")
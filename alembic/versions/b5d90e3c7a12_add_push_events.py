@@ -0,0 +1,34 @@
+"""add push_events
+
+Revision ID: b5d90e3c7a12
+Revises: a7c4e1f08b93
+Create Date: 2026-10-15 21:02:36.418902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d90e3c7a12'
+down_revision: Union[str, Sequence[str], None] = 'a7c4e1f08b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'push_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_push_events_created_at'), 'push_events', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_push_events_created_at'), table_name='push_events')
+    op.drop_table('push_events')
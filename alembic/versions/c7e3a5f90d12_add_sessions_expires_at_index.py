@@ -0,0 +1,27 @@
+"""add sessions expires_at index
+
+Revision ID: c7e3a5f90d12
+Revises: 8b4d2e6f1a37
+Create Date: 2026-10-15 11:58:44.031276
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e3a5f90d12'
+down_revision: Union[str, Sequence[str], None] = '8b4d2e6f1a37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # session pruning and /auth/token both filter on expires_at
+    op.create_index(op.f("ix_sessions_expires_at"), "sessions", ["expires_at"], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_sessions_expires_at"), table_name="sessions", if_exists=True)
@@ -0,0 +1,37 @@
+"""add city full_at
+
+Revision ID: d4f8b2c61e07
+Revises: c7e3a5f90d12
+Create Date: 2026-10-15 14:06:12.480913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f8b2c61e07'
+down_revision: Union[str, Sequence[str], None] = 'c7e3a5f90d12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('cities', sa.Column('full_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_cities_full_at'), 'cities', ['full_at'], unique=False)
+
+    # Cities already sitting at every cap stop producing from their last tick
+    op.execute(
+        "UPDATE cities SET full_at = last_tick_at"
+        " WHERE last_tick_at IS NOT NULL"
+        " AND food = max_food AND wood = max_wood"
+        " AND stone = max_stone AND iron = max_iron"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_cities_full_at'), table_name='cities')
+    with op.batch_alter_table('cities') as batch_op:
+        batch_op.drop_column('full_at')
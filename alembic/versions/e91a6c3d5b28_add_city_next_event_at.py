@@ -0,0 +1,44 @@
+"""add city next_event_at
+
+Revision ID: e91a6c3d5b28
+Revises: d4f8b2c61e07
+Create Date: 2026-10-15 15:42:37.201644
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e91a6c3d5b28'
+down_revision: Union[str, Sequence[str], None] = 'd4f8b2c61e07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('cities', sa.Column('next_event_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_cities_next_event_at'), 'cities', ['next_event_at'], unique=False)
+
+    # Earliest pending event per city (see app/game/next_event.py)
+    op.execute(
+        "UPDATE cities SET next_event_at = ("
+        " SELECT MIN(p.due) FROM ("
+        "  SELECT attacker_city_id AS city_id, arrives_at AS due FROM raids WHERE status = 'enroute'"
+        "  UNION ALL SELECT target_city_id, arrives_at FROM raids WHERE status = 'enroute'"
+        "  UNION ALL SELECT attacker_city_id, returns_at FROM raids"
+        "   WHERE status = 'returning' AND returns_at IS NOT NULL"
+        "  UNION ALL SELECT city_id, completes_at FROM upgrades"
+        "  UNION ALL SELECT city_id, finishes_at FROM training_queue WHERE status = 'training'"
+        "  UNION ALL SELECT city_id, finishes_at FROM research_queue WHERE status = 'researching'"
+        " ) AS p WHERE p.city_id = cities.id"
+        ")"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_cities_next_event_at'), table_name='cities')
+    with op.batch_alter_table('cities') as batch_op:
+        batch_op.drop_column('next_event_at')
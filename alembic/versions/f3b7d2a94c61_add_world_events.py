@@ -0,0 +1,56 @@
+"""add world_events
+
+Revision ID: f3b7d2a94c61
+Revises: e91a6c3d5b28
+Create Date: 2026-10-15 18:06:12.548310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b7d2a94c61'
+down_revision: Union[str, Sequence[str], None] = 'e91a6c3d5b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'world_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('due_at', sa.DateTime(), nullable=False),
+        sa.Column('kind', sa.String(length=16), nullable=False),
+        sa.Column('ref_id', sa.Integer(), nullable=False),
+        sa.Column('city_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.ForeignKeyConstraint(['city_id'], ['cities.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('kind', 'ref_id', name='uq_world_events_kind_ref'),
+    )
+    op.create_index(op.f('ix_world_events_city_id'), 'world_events', ['city_id'], unique=False)
+    op.create_index('ix_world_events_status_due_at', 'world_events', ['status', 'due_at'], unique=False)
+
+    # Pending work already scheduled (see app/game/world_events.py)
+    op.execute(
+        "INSERT INTO world_events (due_at, kind, ref_id, city_id, status)"
+        " SELECT arrives_at, 'raid_arrival', id, attacker_city_id, 'pending' FROM raids"
+        "  WHERE status = 'enroute' AND arrives_at IS NOT NULL"
+        " UNION ALL SELECT returns_at, 'raid_return', id, attacker_city_id, 'pending' FROM raids"
+        "  WHERE status = 'returning' AND returns_at IS NOT NULL"
+        " UNION ALL SELECT completes_at, 'upgrade', id, city_id, 'pending' FROM upgrades"
+        "  WHERE completes_at IS NOT NULL"
+        " UNION ALL SELECT finishes_at, 'training', id, city_id, 'pending' FROM training_queue"
+        "  WHERE status = 'training' AND finishes_at IS NOT NULL"
+        " UNION ALL SELECT finishes_at, 'research', id, city_id, 'pending' FROM research_queue"
+        "  WHERE status = 'researching' AND finishes_at IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_world_events_status_due_at', table_name='world_events')
+    op.drop_index(op.f('ix_world_events_city_id'), table_name='world_events')
+    op.drop_table('world_events')
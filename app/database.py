@@ -1,19 +1,185 @@
 # app/database.py
 from __future__ import annotations
 
-from typing import Generator
+import re
+from typing import AsyncGenerator, Dict, Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker, Session
 
-from app.config import DATABASE_URL
-
-engine = create_engine(
+from app.config import (
     DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    future=True,
+    ASYNC_DATABASE_URL,
+    SQLITE_JOURNAL_MODE,
+    SQLITE_SYNCHRONOUS,
+    SQLITE_MMAP_SIZE,
+    SQLITE_CACHE_SIZE,
+    SQLITE_TEMP_STORE,
+    SQLITE_BUSY_TIMEOUT_MS,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_READ_POOL_SIZE,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    DB_STATEMENT_TIMEOUT_MS,
 )
 
+DB_BACKEND = make_url(DATABASE_URL).get_backend_name()
+IS_SQLITE = DB_BACKEND == "sqlite"
+
+# backend -> async driver used when ASYNC_DATABASE_URL isn't set
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+_PRAGMA_WORD = re.compile(r"^[A-Za-z]+$")
+_PRAGMA_INT = re.compile(r"^-?\d+$")
+
+
+def _sqlite_pragmas(read_only: bool = False) -> list[str]:
+    """
+    PRAGMA statements for the configured storage profile.
+    Values come from env (app/config.py); empty values are skipped and
+    anything that isn't a plain word/integer is rejected.
+    """
+    settings = [
+        ("journal_mode", SQLITE_JOURNAL_MODE, _PRAGMA_WORD),
+        ("synchronous", SQLITE_SYNCHRONOUS, _PRAGMA_WORD),
+        ("mmap_size", SQLITE_MMAP_SIZE, _PRAGMA_INT),
+        ("cache_size", SQLITE_CACHE_SIZE, _PRAGMA_INT),
+        ("temp_store", SQLITE_TEMP_STORE, _PRAGMA_WORD),
+        ("busy_timeout", SQLITE_BUSY_TIMEOUT_MS, _PRAGMA_INT),
+    ]
+
+    pragmas = []
+    for name, value, pattern in settings:
+        value = (value or "").strip()
+        if not value:
+            continue
+        if not pattern.match(value):
+            raise ValueError(f"Invalid SQLite {name} setting: {value!r}")
+        pragmas.append(f"PRAGMA {name}={value}")
+
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+
+    return pragmas
+
+
+def _server_options(read_only: bool = False) -> str:
+    """libpq `options` for PostgreSQL sessions (read-only + statement timeout)."""
+    opts = []
+    if read_only:
+        opts.append("-c default_transaction_read_only=on")
+    if DB_STATEMENT_TIMEOUT_MS > 0:
+        opts.append(f"-c statement_timeout={int(DB_STATEMENT_TIMEOUT_MS)}")
+    return " ".join(opts)
+
+
+def _apply_sqlite_pragmas(engine, read_only: bool) -> None:
+    pragmas = _sqlite_pragmas(read_only=read_only)
+
+    @event.listens_for(engine, "connect")
+    def _apply_sqlite_profile(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        try:
+            for stmt in pragmas:
+                cur.execute(stmt)
+        finally:
+            cur.close()
+
+
+def _make_engine(read_only: bool = False):
+    pool_size = DB_READ_POOL_SIZE if read_only else DB_POOL_SIZE
+
+    if not IS_SQLITE:
+        # Server database (PostgreSQL): plain QueuePool, LIFO so idle
+        # connections past pool_size age out, pre-ping/recycle for restarts.
+        connect_args = {}
+        options = _server_options(read_only=read_only) if DB_BACKEND == "postgresql" else ""
+        if options:
+            connect_args["options"] = options
+
+        return create_engine(
+            DATABASE_URL,
+            connect_args=connect_args,
+            pool_size=pool_size,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=DB_POOL_PRE_PING,
+            pool_use_lifo=True,
+            future=True,
+        )
+
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        pool_size=pool_size,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        future=True,
+    )
+    _apply_sqlite_pragmas(engine, read_only)
+    return engine
+
+
+def async_database_url() -> str:
+    if ASYNC_DATABASE_URL:
+        return ASYNC_DATABASE_URL
+
+    url = make_url(DATABASE_URL)
+    driver = _ASYNC_DRIVERS.get(DB_BACKEND)
+    if driver is None:
+        raise RuntimeError(f"No async driver for {DB_BACKEND!r}; set ASYNC_DATABASE_URL")
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def _make_async_engine(read_only: bool = False) -> AsyncEngine:
+    """Async twin of _make_engine (same pool sizes, pragmas / session settings)."""
+    url = async_database_url()
+    pool_size = DB_READ_POOL_SIZE if read_only else DB_POOL_SIZE
+
+    if make_url(url).get_backend_name() != "sqlite":
+        server_settings = {}
+        if read_only:
+            server_settings["default_transaction_read_only"] = "on"
+        if DB_STATEMENT_TIMEOUT_MS > 0:
+            server_settings["statement_timeout"] = str(int(DB_STATEMENT_TIMEOUT_MS))
+
+        return create_async_engine(
+            url,
+            connect_args={"server_settings": server_settings} if server_settings else {},
+            pool_size=pool_size,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=DB_POOL_PRE_PING,
+            pool_use_lifo=True,
+        )
+
+    engine = create_async_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        pool_size=pool_size,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+    )
+    _apply_sqlite_pragmas(engine.sync_engine, read_only)
+    return engine
+
+
+engine = _make_engine()
+
+# Read-only connections for GET routes that never tick or write (SQLite
+# query_only / PostgreSQL default_transaction_read_only); with WAL or MVCC
+# they read a consistent snapshot without waiting on the ticking writer.
+read_engine = _make_engine(read_only=True)
+
 SessionLocal = sessionmaker(
     bind=engine,
     autoflush=False,
@@ -21,6 +187,35 @@ SessionLocal = sessionmaker(
     future=True,
 )
 
+ReadSessionLocal = sessionmaker(
+    bind=read_engine,
+    autoflush=False,
+    autocommit=False,
+    future=True,
+)
+
+# Async engines are created on first use so the sync-only paths (ticker,
+# alembic, scripts) don't need the async drivers installed.
+_ASYNC_SESSIONMAKERS: Dict[bool, async_sessionmaker] = {}
+
+
+def _async_sessionmaker(read_only: bool = False) -> async_sessionmaker:
+    maker = _ASYNC_SESSIONMAKERS.get(read_only)
+    if maker is None:
+        maker = async_sessionmaker(
+            bind=_make_async_engine(read_only=read_only),
+            autoflush=False,
+            expire_on_commit=False,
+        )
+        _ASYNC_SESSIONMAKERS[read_only] = maker
+    return maker
+
+
+async def dispose_async_engines() -> None:
+    for maker in list(_ASYNC_SESSIONMAKERS.values()):
+        await maker.kw["bind"].dispose()
+    _ASYNC_SESSIONMAKERS.clear()
+
 class Base(DeclarativeBase):
     """Base class for all SQLAlchemy models."""
     pass
@@ -31,3 +226,25 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+def get_read_db() -> Generator[Session, None, None]:
+    """Read-only session for GET routes that don't tick."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    AsyncSession for `async def` routes. Sync game code (tick, governor
+    bonuses) runs through `await db.run_sync(fn)`, which hands fn the
+    underlying Session.
+    """
+    async with _async_sessionmaker()() as db:
+        yield db
+
+async def get_async_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Read-only AsyncSession for async GET routes that don't tick."""
+    async with _async_sessionmaker(read_only=True)() as db:
+        yield db
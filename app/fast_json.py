@@ -0,0 +1,47 @@
+# app/fast_json.py
+"""
+Opt-in fast JSON responses (FAST_JSON=1, needs orjson).
+
+- the app's default_response_class becomes ORJSONResponse
+- hot routes return fast_json(payload): a ready-built ORJSONResponse, so
+  FastAPI skips the jsonable_encoder walk over the whole payload
+- json_time(dt) leaves datetimes for orjson to encode natively (same
+  ISO-8601 text as datetime.isoformat()) instead of formatting each field
+
+With FAST_JSON=0 (or orjson missing) every helper falls back to the plain
+dict / isoformat() path, so responses are byte-for-byte what they were.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Optional, Type, Union
+
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+
+from app.config import FAST_JSON
+
+try:
+    import orjson  # noqa: F401
+except ImportError:  # optional dependency
+    orjson = None
+
+FAST_JSON_ENABLED = FAST_JSON and orjson is not None
+
+
+def default_response_class() -> Type[JSONResponse]:
+    return ORJSONResponse if FAST_JSON_ENABLED else JSONResponse
+
+
+def fast_json(content: Any, status_code: int = 200) -> Union[Response, Any]:
+    """Pre-rendered response for large dict payloads (plain content when disabled)."""
+    if not FAST_JSON_ENABLED:
+        return content
+    return ORJSONResponse(content, status_code=status_code)
+
+
+def json_time(value: Optional[datetime]) -> Union[datetime, str, None]:
+    if value is None:
+        return None
+    if FAST_JSON_ENABLED:
+        return value
+    return value.isoformat()
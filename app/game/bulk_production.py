@@ -0,0 +1,188 @@
+# app/game/bulk_production.py
+from __future__ import annotations
+
+import calendar
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import bindparam, func, text
+from sqlalchemy.orm import Session
+
+from app.models.city import City
+
+# ----------------------------
+# Bulk production (set-based)
+# ----------------------------
+#
+# Same semantics as tick.apply_city_tick, but for every city at once:
+#   minutes      = floor((until - last_tick_at) / 60s)
+#   resource     = MIN(max_resource, resource + rate * minutes)
+#   last_tick_at = last_tick_at + minutes  (whole minutes only, keeps the remainder)
+#
+# Rates and caps come from the stored City columns, so they must be kept in sync
+# with building levels (see tick.refresh_city_stats).
+#
+# SQLite stores DateTime as 'YYYY-MM-DD HH:MM:SS.ffffff'. Elapsed time is computed
+# in integer microseconds (epoch seconds via strftime('%s') + the fraction digits)
+# so the floor matches Python's timedelta math exactly. The fraction is stripped
+# before any SQLite date function, which would otherwise round it to milliseconds.
+#
+# PostgreSQL stores a real timestamp; EXTRACT(EPOCH ...) of the interval is exact
+# (numeric, microseconds) and whole minutes are added back as an interval.
+#
+# Cities with full_at set (every resource at its cap) are left out entirely; the
+# UPDATE sets full_at on the rows it leaves capped, exactly like
+# resources.mark_full() does for the ORM paths.
+
+_LAST_US_SQL = (
+    "(CAST(strftime('%s', substr(last_tick_at, 1, 19)) AS INTEGER) * 1000000"
+    " + CAST(substr(last_tick_at || '.000000', 21, 6) AS INTEGER))"
+)
+
+_MINUTES_SQL = f"((:until_us - {_LAST_US_SQL}) / 60000000)"
+
+_ELAPSED_SQL = f"""
+    SELECT id, {_MINUTES_SQL} AS minutes
+    FROM cities
+    WHERE last_tick_at IS NOT NULL AND full_at IS NULL {{scope}}
+"""
+
+# every resource reaches its cap within e.minutes
+_CAPPED_SQL = (
+    "food + food_rate * e.minutes >= max_food"
+    " AND wood + wood_rate * e.minutes >= max_wood"
+    " AND stone + stone_rate * e.minutes >= max_stone"
+    " AND iron + iron_rate * e.minutes >= max_iron"
+)
+
+_NEXT_TICK_SQL = (
+    "strftime('%Y-%m-%d %H:%M:%S', substr(cities.last_tick_at, 1, 19), '+' || e.minutes || ' minutes')"
+    " || substr(cities.last_tick_at, 20)"
+)
+
+_UPDATE_SQL = f"""
+    UPDATE cities SET
+        food  = MIN(max_food,  food  + food_rate  * e.minutes),
+        wood  = MIN(max_wood,  wood  + wood_rate  * e.minutes),
+        stone = MIN(max_stone, stone + stone_rate * e.minutes),
+        iron  = MIN(max_iron,  iron  + iron_rate  * e.minutes),
+        last_tick_at = {_NEXT_TICK_SQL},
+        full_at = CASE WHEN {_CAPPED_SQL} THEN {_NEXT_TICK_SQL} END
+    FROM ({{elapsed}}) AS e
+    WHERE cities.id = e.id AND e.minutes > 0
+"""
+
+_PG_MINUTES_SQL = (
+    "(CAST(EXTRACT(EPOCH FROM (CAST(:until AS timestamp) - last_tick_at)) * 1000000 AS BIGINT)"
+    " / 60000000)"
+)
+
+_PG_ELAPSED_SQL = f"""
+    SELECT id, {_PG_MINUTES_SQL} AS minutes
+    FROM cities
+    WHERE last_tick_at IS NOT NULL AND full_at IS NULL {{scope}}
+"""
+
+_PG_NEXT_TICK_SQL = "cities.last_tick_at + e.minutes * INTERVAL '1 minute'"
+
+_PG_UPDATE_SQL = f"""
+    UPDATE cities SET
+        food  = LEAST(max_food,  food  + food_rate  * e.minutes),
+        wood  = LEAST(max_wood,  wood  + wood_rate  * e.minutes),
+        stone = LEAST(max_stone, stone + stone_rate * e.minutes),
+        iron  = LEAST(max_iron,  iron  + iron_rate  * e.minutes),
+        last_tick_at = {_PG_NEXT_TICK_SQL},
+        full_at = CASE WHEN {_CAPPED_SQL} THEN {_PG_NEXT_TICK_SQL} END
+    FROM ({{elapsed}}) AS e
+    WHERE cities.id = e.id AND e.minutes > 0
+"""
+
+_TOTALS_SQL = """
+    SELECT COUNT(*) AS cities, COALESCE(SUM(e.minutes), 0) AS minutes
+    FROM ({elapsed}) AS e
+    WHERE e.minutes > 0
+"""
+
+
+# dialect -> (elapsed subquery, UPDATE template)
+_DIALECT_SQL = {
+    "sqlite": (_ELAPSED_SQL, _UPDATE_SQL),
+    "postgresql": (_PG_ELAPSED_SQL, _PG_UPDATE_SQL),
+}
+
+
+def _dialect(db: Session) -> str:
+    return db.get_bind().dialect.name
+
+
+def bulk_production_supported(db: Session) -> bool:
+    return _dialect(db) in _DIALECT_SQL
+
+
+def _epoch_us(at: datetime) -> int:
+    return calendar.timegm(at.timetuple()) * 1_000_000 + at.microsecond
+
+
+def _statement(db: Session, template: Optional[str], city_ids: Optional[Iterable[int]]):
+    elapsed, update_sql = _DIALECT_SQL[_dialect(db)]
+    scope = "AND id IN :city_ids" if city_ids is not None else ""
+    stmt = text((template or update_sql).format(elapsed=elapsed.format(scope=scope)))
+    if city_ids is not None:
+        stmt = stmt.bindparams(bindparam("city_ids", expanding=True))
+    return stmt
+
+
+def _params(until: datetime, city_ids: Optional[Iterable[int]]) -> Dict[str, object]:
+    params: Dict[str, object] = {"until_us": _epoch_us(until), "until": until}
+    if city_ids is not None:
+        params["city_ids"] = sorted(int(c) for c in city_ids)
+    return params
+
+
+def earliest_last_tick(db: Session, city_ids: Optional[Iterable[int]] = None) -> Optional[datetime]:
+    q = db.query(func.min(City.last_tick_at))
+    if city_ids is not None:
+        q = q.filter(City.id.in_(city_ids))
+    return q.scalar()
+
+
+def count_cities(db: Session, city_ids: Optional[Iterable[int]] = None) -> int:
+    q = db.query(func.count(City.id))
+    if city_ids is not None:
+        q = q.filter(City.id.in_(city_ids))
+    return int(q.scalar() or 0)
+
+
+def production_totals(
+    db: Session,
+    until: datetime,
+    city_ids: Optional[Iterable[int]] = None,
+) -> Dict[str, int]:
+    """
+    How many cities would gain minutes (and how many minutes in total) if
+    production were applied up to `until`. Used for tick stats only.
+    """
+    row = db.execute(_statement(db, _TOTALS_SQL, city_ids), _params(until, city_ids)).one()
+    return {"cities": int(row.cities or 0), "minutes": int(row.minutes or 0)}
+
+
+def apply_production_bulk(
+    db: Session,
+    until: datetime,
+    city_ids: Optional[Iterable[int]] = None,
+) -> int:
+    """
+    Advance production for all (or the given) cities up to `until` in one UPDATE.
+    Returns the number of cities updated.
+    """
+    # Pending ORM changes (spends, loot, new caps) must hit the table first...
+    db.flush()
+
+    result = db.execute(_statement(db, None, city_ids), _params(until, city_ids))
+
+    # ...and loaded City objects must not keep serving stale resource values.
+    for obj in list(db.identity_map.values()):
+        if isinstance(obj, City):
+            db.expire(obj)
+
+    return int(result.rowcount or 0)
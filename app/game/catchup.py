@@ -0,0 +1,98 @@
+# app/game/catchup.py
+"""
+Admin catch-up after downtime, to run before traffic is reopened:
+
+    python -m app.game.catchup                        # up to now
+    python -m app.game.catchup --until 2026-05-01T18:00:00
+    python -m app.game.catchup --slice-minutes 30 --slice-events 200
+
+Advances the world from the world clock (app/game/world_clock.py) in
+committed slices (tick.catch_up_world) and prints one JSON line per slice,
+then the totals. Interrupting it is safe: a rerun resumes from the last
+committed slice.
+
+Holds the world tick lease (renewed every slice), so tick-on-read and the
+ticker skip instead of racing it when TICK_LEASE_ENABLED=1. If the lease is
+lost anyway it stops after the committed slice; rerun to resume.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+from datetime import datetime
+from typing import Dict, Optional
+
+from app.config import TICK_LEASE_ENABLED, TICK_SLICE_EVENTS, TICK_SLICE_MINUTES
+from app.database import SessionLocal
+from app.game.tick import catch_up_world
+from app.game.tick_lease import release_lease, try_acquire_lease
+from app.game.world_clock import world_clock
+
+log = logging.getLogger("evony.catchup")
+
+
+def run_catch_up(
+    until: Optional[datetime] = None,
+    *,
+    slice_minutes: int = TICK_SLICE_MINUTES,
+    slice_events: int = TICK_SLICE_EVENTS,
+    echo: bool = False,
+) -> Dict[str, object]:
+    until = until or datetime.utcnow()
+    db = SessionLocal()
+    try:
+        if TICK_LEASE_ENABLED and not try_acquire_lease(db, datetime.utcnow()):
+            return {"skipped": True, "reason": "world tick lease is held elsewhere"}
+
+        started_from = world_clock(db)
+
+        def on_slice(stats: Dict[str, object]) -> bool:
+            if echo:
+                print(json.dumps(stats), flush=True)
+            # lease lost (e.g. a slice outran TICK_LEASE_TTL_SECONDS): stop
+            return not TICK_LEASE_ENABLED or try_acquire_lease(db, datetime.utcnow())
+
+        try:
+            stats = catch_up_world(
+                db,
+                until,
+                slice_minutes=slice_minutes,
+                slice_events=slice_events,
+                on_slice=on_slice,
+            )
+        finally:
+            if TICK_LEASE_ENABLED:
+                release_lease(db, datetime.utcnow())
+
+        stats["from"] = started_from.isoformat() if started_from else None
+        return stats
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Catch the world up in committed slices")
+    parser.add_argument("--until", type=datetime.fromisoformat, default=None, help="ISO time (default: now, UTC)")
+    parser.add_argument("--slice-minutes", type=int, default=TICK_SLICE_MINUTES)
+    parser.add_argument("--slice-events", type=int, default=TICK_SLICE_EVENTS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    stats = run_catch_up(
+        args.until,
+        slice_minutes=args.slice_minutes,
+        slice_events=args.slice_events,
+        echo=True,
+    )
+    print(json.dumps({"total": stats}), flush=True)
+    if stats.get("skipped"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
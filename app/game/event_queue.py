@@ -0,0 +1,62 @@
+# app/game/event_queue.py
+from __future__ import annotations
+
+import heapq
+from datetime import datetime
+from typing import List, Optional, Set, Tuple
+
+# (at, kind, ref_id)
+Event = Tuple[datetime, str, int]
+
+
+class TickEventQueue:
+    """
+    In-memory min-heap of pending events for one tick window.
+
+    The tick loads every pending event due by hard_stop once (world_events),
+    then pops event times in order together with the kinds due, so each
+    step only runs the stages that have work. Stages push follow-up events
+    (e.g. a raid's returns_at after it arrives) instead of the loop
+    re-querying the DB.
+    """
+
+    def __init__(self, hard_stop: datetime) -> None:
+        self.hard_stop = hard_stop
+        self._heap: List[Event] = []
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, at: Optional[datetime], kind: str, ref_id: int) -> None:
+        # Anything past the window is picked up by the next tick's load.
+        if at is None or at > self.hard_stop:
+            return
+        heapq.heappush(self._heap, (at, str(kind), int(ref_id)))
+
+    def pop_next(self, after: datetime) -> Tuple[Optional[datetime], Set[str]]:
+        """
+        Next event time strictly after `after` (None: jump to hard_stop) and
+        the kinds due by then. Events at or before `after` are overdue; their
+        kinds are returned with the next step, whose stage queries resolve
+        everything <= event_time.
+        """
+        heap = self._heap
+        kinds: Set[str] = set()
+
+        while heap and heap[0][0] <= after:
+            kinds.add(heapq.heappop(heap)[1])
+
+        if not heap:
+            return None, kinds
+
+        at = heap[0][0]
+        kinds |= self.pop_due(at)
+        return at, kinds
+
+    def pop_due(self, at: datetime) -> Set[str]:
+        """Pop every event due by `at`; returns their kinds."""
+        heap = self._heap
+        kinds: Set[str] = set()
+        while heap and heap[0][0] <= at:
+            kinds.add(heapq.heappop(heap)[1])
+        return kinds
@@ -1,19 +1,134 @@
 # app/game/governor.py
+from __future__ import annotations
 
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.config import GOVERNOR_CACHE_TTL_SECONDS
 from app.models.hero import Hero
 from app.game.hero_specialties import calculate_hero_bonuses
 
-def get_city_governor_bonus(db, city_id):
-    governor = (
-        db.query(Hero)
-        .filter(
-            Hero.city_id == city_id,
-            Hero.status == "governor"
-        )
-        .first()
-    )
 
+@dataclass(frozen=True)
+class GovernorSnapshot:
+    """Detached copy of the governor fields routes read (id/name) plus what bonuses depend on."""
+    id: int
+    city_id: int
+    name: str
+    level: int
+    specialty: str
+    status: str
+
+
+# city_id -> (valid_until, governor snapshot or None, bonuses), monotonic clock.
+# Bonuses only depend on the governor's level/specialty/status. Changes made in
+# this process drop entries right away (invalidate_governor_cache: hero XP
+# level-ups, governor assign/remove, admin hero endpoints); changes made by
+# another worker or the ticker show up once the entry's
+# GOVERNOR_CACHE_TTL_SECONDS run out. 0 disables the cache.
+_GOVERNOR_CACHE: Dict[int, Tuple[float, Optional[GovernorSnapshot], dict]] = {}
+
+# set by a world preload: until then, no entry means "not cached" rather than
+# "no governor"
+_GOVERNOR_CACHE_COMPLETE_UNTIL = 0.0
+
+
+def _entry_for(governor: Optional[Hero]) -> Tuple[Optional[GovernorSnapshot], dict]:
     if not governor:
         return None, {}
 
-    return governor, calculate_hero_bonuses(governor)
+    snapshot = GovernorSnapshot(
+        id=int(governor.id),
+        city_id=int(governor.city_id),
+        name=governor.name,
+        level=int(governor.level or 1),
+        specialty=governor.specialty,
+        status=governor.status,
+    )
+    return snapshot, calculate_hero_bonuses(governor)
+
+
+def get_city_governor_bonus(db, city_id):
+    city_id = int(city_id)
+    now = time.monotonic()
+
+    cached = _GOVERNOR_CACHE.get(city_id)
+    if cached is not None and cached[0] <= now:
+        cached = None
+
+    if cached is None and _GOVERNOR_CACHE_COMPLETE_UNTIL > now:
+        # preloaded world: no entry means no governor
+        return None, {}
+
+    if cached is None:
+        governor = (
+            db.query(Hero)
+            .filter(
+                Hero.city_id == city_id,
+                Hero.status == "governor"
+            )
+            .first()
+        )
+        cached = (now + GOVERNOR_CACHE_TTL_SECONDS, *_entry_for(governor))
+        if GOVERNOR_CACHE_TTL_SECONDS > 0:
+            _GOVERNOR_CACHE[city_id] = cached
+
+    _, governor, bonuses = cached
+    return governor, dict(bonuses)
+
+
+def invalidate_governor_cache(city_id: Optional[int] = None) -> None:
+    global _GOVERNOR_CACHE_COMPLETE_UNTIL
+
+    if city_id is None:
+        _GOVERNOR_CACHE.clear()
+    else:
+        _GOVERNOR_CACHE.pop(int(city_id), None)
+
+    # A dropped entry must be re-read, not treated as "no governor"
+    _GOVERNOR_CACHE_COMPLETE_UNTIL = 0.0
+
+
+def governor_cache_complete() -> bool:
+    return _GOVERNOR_CACHE_COMPLETE_UNTIL > time.monotonic()
+
+
+def preload_governor_bonuses(db, city_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Fill the cache with one Hero query. With city_ids=None every governor in the
+    world is loaded and cities without one are known to have none (for the
+    same TTL). Returns the number of governors loaded.
+    """
+    global _GOVERNOR_CACHE_COMPLETE_UNTIL
+
+    if GOVERNOR_CACHE_TTL_SECONDS <= 0:
+        return 0
+
+    q = db.query(Hero).filter(Hero.status == "governor")
+    ids = None
+    if city_ids is not None:
+        ids = {int(c) for c in city_ids}
+        if not ids:
+            return 0
+        q = q.filter(Hero.city_id.in_(ids))
+
+    found: Dict[int, Hero] = {}
+    for hero in q.order_by(Hero.id).all():
+        found.setdefault(int(hero.city_id), hero)
+
+    valid_until = time.monotonic() + GOVERNOR_CACHE_TTL_SECONDS
+
+    if ids is None:
+        _GOVERNOR_CACHE.clear()
+    else:
+        for cid in ids - set(found):
+            _GOVERNOR_CACHE[cid] = (valid_until, None, {})
+
+    for cid, hero in found.items():
+        _GOVERNOR_CACHE[cid] = (valid_until, *_entry_for(hero))
+
+    if ids is None:
+        _GOVERNOR_CACHE_COMPLETE_UNTIL = valid_until
+
+    return len(found)
@@ -1,3 +1,6 @@
+from app.game.governor import invalidate_governor_cache
+
+
 def xp_required_for_level(level: int) -> int:
     level = max(1, int(level or 1))
     return 100 + ((level - 1) * 50)
@@ -36,6 +39,8 @@ def add_hero_xp(hero, amount: int) -> dict:
 
     if leveled_up:
         result["new_level"] = int(hero.level)
+        # governor bonuses scale with level
+        invalidate_governor_cache(hero.city_id)
 
     return result
 
@@ -1,9 +1,16 @@
-# app/game/mailbox.py
 from __future__ import annotations
 
 import json
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import event, insert
 from sqlalchemy.orm import Session
 from app.models.mail_message import MailMessage
+from app.push import push_event
+
+# Session.info key for mail queued by queue_mail() and not yet inserted
+_OUTBOX_KEY = "mail_outbox"
 
 
 def send_mail(
@@ -14,15 +21,68 @@ def send_mail(
     subject: str,
     body: str,
     payload: dict | None = None,
+    payload_json: str | None = None,
+    flush: bool = True,
 ) -> MailMessage:
+    if payload_json is None and payload is not None:
+        payload_json = json.dumps(payload)
+
     msg = MailMessage(
         user_id=int(user_id),
         kind=str(kind),
         subject=str(subject),
         body=str(body),
-        payload_json=(json.dumps(payload) if payload is not None else None),
+        payload_json=payload_json,
         is_read=0,
     )
     db.add(msg)
-    db.flush()
+    push_event(db, "mail", user_id=user_id, kind=msg.kind, subject=msg.subject)
+    if flush:
+        db.flush()
     return msg
+
+
+def queue_mail(
+    db: Session,
+    *,
+    user_id: int,
+    kind: str,
+    subject: str,
+    body: str,
+    payload_json: str | None = None,
+) -> None:
+    """
+    Buffer a message on the session instead of adding an ORM object.
+    The tick writes the whole outbox with one executemany (flush_mail_outbox);
+    anything still queued is written right before the session commits.
+    """
+    db.info.setdefault(_OUTBOX_KEY, []).append(
+        {
+            "user_id": int(user_id),
+            "kind": str(kind),
+            "subject": str(subject),
+            "body": str(body),
+            "payload_json": payload_json,
+            "is_read": 0,
+            "created_at": datetime.utcnow(),
+        }
+    )
+    push_event(db, "mail", user_id=user_id, kind=str(kind), subject=str(subject))
+
+
+def flush_mail_outbox(db: Session) -> int:
+    """Insert every queued message in one executemany. Returns the row count."""
+    rows: List[dict] = db.info.pop(_OUTBOX_KEY, None) or []
+    if rows:
+        db.execute(insert(MailMessage), rows)
+    return len(rows)
+
+
+@event.listens_for(Session, "before_commit")
+def _flush_outbox_before_commit(session: Session) -> None:
+    flush_mail_outbox(session)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_outbox_after_rollback(session: Session, _previous_transaction) -> None:
+    session.info.pop(_OUTBOX_KEY, None)
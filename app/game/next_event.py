@@ -0,0 +1,144 @@
+# app/game/next_event.py
+"""
+cities.next_event_at: the earliest pending event that involves a city.
+
+Pending events (what the tick stages resolve):
+  raids            enroute   -> arrives_at  (attacker and target)
+                   returning -> returns_at  (attacker)
+  upgrades                   -> completes_at
+  training_queue   training  -> finishes_at
+  research_queue   researching -> finishes_at
+
+The column is kept at or before the true next event, never after it:
+- every flush that schedules one of those rows lowers the cities'
+  next_event_at to the row's due time (lower_next_event_at, called from the
+  world_events flush listener in app/game/world_events.py);
+- cancels, claims and deletes leave it early, which only costs one tick;
+- the tick recomputes it exactly for the cities it advanced
+  (sync_next_event_at).
+
+So "next_event_at IS NULL OR next_event_at > now" safely means nothing is
+due for that city: the tick can skip its event stages and reads can skip
+ticking (production is derivable from the stored columns).
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import bindparam, func, or_, select, union_all, update
+from sqlalchemy.orm import Session
+
+from app.models.city import City
+from app.models.raid import Raid
+from app.models.research_queue import ResearchQueue
+from app.models.training_queue import TrainingQueue
+from app.models.upgrade import Upgrade
+
+_cities = City.__table__
+
+_LOWER_NEXT_EVENT = (
+    update(_cities)
+    .where(_cities.c.id == bindparam("b_city_id"))
+    .where(or_(_cities.c.next_event_at.is_(None), _cities.c.next_event_at > bindparam("b_at")))
+    .values(next_event_at=bindparam("b_at"))
+)
+
+_SET_NEXT_EVENT = (
+    update(_cities)
+    .where(_cities.c.id == bindparam("b_city_id"))
+    .values(next_event_at=bindparam("b_at"))
+)
+
+
+def lower_next_event_at(conn, earliest: Dict[int, datetime]) -> None:
+    """Pull each city's next_event_at down to at most the given time."""
+    conn.execute(
+        _LOWER_NEXT_EVENT,
+        [{"b_city_id": int(cid), "b_at": at} for cid, at in earliest.items()],
+    )
+
+
+def _due_by_city(city_ids: Optional[Iterable[int]]):
+    """SELECT city_id, MIN(due) over every pending event (optionally scoped)."""
+    ids = sorted(int(c) for c in city_ids) if city_ids is not None else None
+
+    def scoped(stmt, column):
+        return stmt.where(column.in_(ids)) if ids is not None else stmt
+
+    pending = union_all(
+        scoped(
+            select(Raid.attacker_city_id.label("city_id"), Raid.arrives_at.label("at"))
+            .where(Raid.status == "enroute"),
+            Raid.attacker_city_id,
+        ),
+        scoped(
+            select(Raid.target_city_id, Raid.arrives_at).where(Raid.status == "enroute"),
+            Raid.target_city_id,
+        ),
+        scoped(
+            select(Raid.attacker_city_id, Raid.returns_at)
+            .where(Raid.status == "returning", Raid.returns_at.is_not(None)),
+            Raid.attacker_city_id,
+        ),
+        scoped(select(Upgrade.city_id, Upgrade.completes_at), Upgrade.city_id),
+        scoped(
+            select(TrainingQueue.city_id, TrainingQueue.finishes_at)
+            .where(TrainingQueue.status == "training"),
+            TrainingQueue.city_id,
+        ),
+        scoped(
+            select(ResearchQueue.city_id, ResearchQueue.finishes_at)
+            .where(ResearchQueue.status == "researching"),
+            ResearchQueue.city_id,
+        ),
+    ).subquery()
+
+    return select(pending.c.city_id, func.min(pending.c.at)).group_by(pending.c.city_id)
+
+
+def sync_next_event_at(db: Session, city_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute next_event_at exactly for the given cities (all when None) and
+    write the rows that changed. Returns the number of rows written.
+    """
+    if city_ids is not None:
+        city_ids = {int(c) for c in city_ids}
+        if not city_ids:
+            return 0
+
+    due = {int(cid): at for cid, at in db.execute(_due_by_city(city_ids)).all()}
+
+    q = select(City.id, City.next_event_at)
+    if city_ids is not None:
+        q = q.where(City.id.in_(sorted(city_ids)))
+    else:
+        # rows still NULL only change if they show up in `due`
+        q = q.where(City.next_event_at.is_not(None))
+    current = {int(cid): at for cid, at in db.execute(q).all()}
+
+    changes = [
+        {"b_city_id": cid, "b_at": at}
+        for cid, at in due.items()
+        if current.get(cid) != at
+    ]
+    changes += [
+        {"b_city_id": cid, "b_at": None}
+        for cid, at in current.items()
+        if at is not None and cid not in due
+    ]
+
+    if changes:
+        db.execute(_SET_NEXT_EVENT, changes)
+    return len(changes)
+
+
+def has_due_events(db: Session, now: datetime, city_ids: Optional[Iterable[int]] = None) -> bool:
+    """Whether any of the given cities (any city when None) has an event due by `now`."""
+    q = select(City.id).where(City.next_event_at <= now)
+    if city_ids is not None:
+        ids = sorted(int(c) for c in city_ids)
+        if not ids:
+            return False
+        q = q.where(City.id.in_(ids))
+    return db.execute(q.limit(1)).first() is not None
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import json
 from datetime import datetime
+from typing import Sequence, Tuple
 from sqlalchemy.orm import Session
 
 from app.models.raid import Raid
@@ -10,7 +11,7 @@ from app.models.city import City
 from app.models.raid_troop import RaidTroop
 from app.models.raid_defender_troop import RaidDefenderTroop
 from app.models.troop_type import TroopType
-from app.game.mailbox import send_mail
+from app.game.mailbox import queue_mail, send_mail
 
 
 def _round2(x: float) -> float:
@@ -41,7 +42,6 @@ def send_raid_result_mail(db: Session, *, raid_id: int, now: datetime) -> None:
     if not attacker_city or not defender_city:
         return
 
-    # --- Attacker totals (sent/lost) + reconstructed power ---
     atk_lines = (
         db.query(RaidTroop, TroopType)
         .join(TroopType, TroopType.id == RaidTroop.troop_type_id)
@@ -49,6 +49,69 @@ def send_raid_result_mail(db: Session, *, raid_id: int, now: datetime) -> None:
         .all()
     )
 
+    def_lines = (
+        db.query(RaidDefenderTroop, TroopType)
+        .join(TroopType, TroopType.id == RaidDefenderTroop.troop_type_id)
+        .filter(RaidDefenderTroop.raid_id == raid.id)
+        .all()
+    )
+
+    subject, body, payload = build_raid_result_mail(
+        raid, attacker_city, defender_city, atk_lines, def_lines
+    )
+    deliver_raid_result_mail(db, attacker_city, defender_city, subject, body, payload)
+
+
+def deliver_raid_result_mail(
+    db: Session,
+    attacker_city: City,
+    defender_city: City,
+    subject: str,
+    body: str,
+    payload: dict,
+    *,
+    buffered: bool = False,
+) -> None:
+    """
+    Send to both owners. The payload is serialized once and shared.
+    buffered=True queues the rows on the session outbox (the tick inserts
+    them in one batch) instead of adding and flushing two ORM objects.
+    """
+    payload_json = json.dumps(payload)
+
+    for owner_id in (attacker_city.owner_id, defender_city.owner_id):
+        if buffered:
+            queue_mail(
+                db,
+                user_id=int(owner_id),
+                kind="raid_report",
+                subject=subject,
+                body=body,
+                payload_json=payload_json,
+            )
+        else:
+            send_mail(
+                db,
+                user_id=int(owner_id),
+                kind="raid_report",
+                subject=subject,
+                body=body,
+                payload_json=payload_json,
+            )
+
+
+def build_raid_result_mail(
+    raid: Raid,
+    attacker_city: City,
+    defender_city: City,
+    atk_lines: Sequence[Tuple[RaidTroop, TroopType]],
+    def_lines: Sequence[Tuple[RaidDefenderTroop, TroopType]],
+) -> Tuple[str, str, dict]:
+    """
+    Pure: (subject, body, payload) for a resolved raid from already-loaded rows.
+    atk_lines / def_lines are (row, troop_type) pairs, like the joined queries above.
+    """
+    # --- Attacker totals (sent/lost) + reconstructed power ---
     atk_sent = 0
     atk_lost = 0
     atk_power_start = 0.0
@@ -64,13 +127,6 @@ def send_raid_result_mail(db: Session, *, raid_id: int, now: datetime) -> None:
         atk_power_lost += lost * unit
 
     # --- Defender snapshot totals (start/lost) + reconstructed power ---
-    def_lines = (
-        db.query(RaidDefenderTroop, TroopType)
-        .join(TroopType, TroopType.id == RaidDefenderTroop.troop_type_id)
-        .filter(RaidDefenderTroop.raid_id == raid.id)
-        .all()
-    )
-
     def_start = 0
     def_lost = 0
     def_power_start = 0.0
@@ -142,20 +198,4 @@ def send_raid_result_mail(db: Session, *, raid_id: int, now: datetime) -> None:
         },
     }
 
-    # send to both owners
-    send_mail(
-        db,
-        user_id=int(attacker_city.owner_id),
-        kind="raid_report",
-        subject=subject,
-        body=body,
-        payload=payload,
-    )
-    send_mail(
-        db,
-        user_id=int(defender_city.owner_id),
-        kind="raid_report",
-        subject=subject,
-        body=body,
-        payload=payload,
-    )
+    return subject, body, payload
@@ -0,0 +1,156 @@
+# app/game/resources.py
+"""
+Lazy resource materialization (LAZY_RESOURCES=1).
+
+A City row already stores everything production needs: the amount
+(food/wood/stone/iron), the per-minute rate (*_rate), the cap (max_*) and
+the time those amounts were valid at (last_tick_at). In lazy mode the tick
+no longer writes production for every city on every step; current values
+are derived from those columns:
+
+    minutes = floor((at - last_tick_at) / 60s)
+    amount  = MIN(cap, amount + rate * minutes)
+    last_tick_at += minutes   (whole minutes only, the remainder carries)
+
+which is exactly what tick.apply_city_tick / bulk production apply, so the
+result is the same whichever mode (or mix of modes) advanced a city.
+
+- resources_at():    read-only view, nothing is written
+- materialize_city(): apply the formula to the ORM row (persisted by the
+                      caller's commit)
+- settle_city():     materialize_city() before anything spends, loots,
+                     credits or changes a city's rates/caps, so the change
+                     applies to current values. Eager mode usually ticked
+                     the row up to date already (a no-op), but capped cities
+                     and reads that skipped the tick (cities.next_event_at)
+                     leave rows behind there too
+
+Storage-capped cities (full_at):
+once production leaves all four amounts at their caps, City.full_at records
+when, and every production path (ORM tick, bulk UPDATE, lazy) skips the row
+from then on; its last_tick_at stays where it was. Any change to an amount
+or a cap clears full_at (attribute listeners below), and writers settle
+first, so the skipped minutes are applied (as a no-op on amounts) before
+the change and production resumes from there. A city un-capped during a
+tick is remembered on its Session (pop_uncapped) so the ORM tick loop can
+pick it up again at the next event step.
+
+Like TICK_BULK_PRODUCTION this uses the stored rate/cap columns, which
+refresh_city_stats() keeps in sync with building levels.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.config import LAZY_RESOURCES
+from app.models.city import City
+
+RESOURCES = ("food", "wood", "stone", "iron")
+
+# Session.info key for cities whose full_at was cleared in this transaction
+_UNCAPPED_KEY = "cities_uncapped"
+
+
+def elapsed_minutes(last_tick_at: Optional[datetime], at: datetime) -> int:
+    if last_tick_at is None:
+        return 0
+    return max(0, int((at - last_tick_at).total_seconds() // 60))
+
+
+def project(
+    amounts: Dict[str, int],
+    rates: Dict[str, int],
+    caps: Dict[str, int],
+    minutes: int,
+) -> Dict[str, int]:
+    """amounts advanced by `minutes` of production (unchanged when minutes <= 0)."""
+    if minutes <= 0:
+        return {r: int(amounts[r]) for r in RESOURCES}
+    return {
+        r: min(int(caps[r]), int(amounts[r]) + int(rates[r]) * minutes)
+        for r in RESOURCES
+    }
+
+
+def _stored(city: City):
+    return (
+        {r: getattr(city, r) for r in RESOURCES},
+        {r: getattr(city, f"{r}_rate") for r in RESOURCES},
+        {r: getattr(city, f"max_{r}") for r in RESOURCES},
+    )
+
+
+def resources_at(city: City, at: datetime, *, ticked: bool = True) -> Dict[str, int]:
+    """
+    Current amounts for a read. Eager mode returns the stored columns, which
+    the tick just brought up to date; lazy mode, or a read that skipped the
+    tick (ticked=False), projects them to `at`.
+    """
+    amounts, rates, caps = _stored(city)
+    if ticked and not LAZY_RESOURCES:
+        return {r: int(v) for r, v in amounts.items()}
+    return project(amounts, rates, caps, elapsed_minutes(city.last_tick_at, at))
+
+
+def materialize_city(city: City, at: datetime) -> int:
+    """Write production up to `at` onto the row. Returns the minutes applied."""
+    minutes = elapsed_minutes(city.last_tick_at, at)
+    if minutes <= 0:
+        return 0
+
+    for r, value in project(*_stored(city), minutes).items():
+        setattr(city, r, value)
+
+    city.last_tick_at = city.last_tick_at + timedelta(minutes=minutes)
+    mark_full(city)
+    return minutes
+
+
+def is_full(city: City) -> bool:
+    return all(getattr(city, r) >= getattr(city, f"max_{r}") for r in RESOURCES)
+
+
+def mark_full(city: City) -> None:
+    """After production: remember when the city ran out of room for everything."""
+    if city.full_at is None and is_full(city):
+        city.full_at = city.last_tick_at
+
+
+def settle_city(city: Optional[City], at: datetime) -> int:
+    """Materialize before a spend / loot / credit / cap change."""
+    if city is None:
+        return 0
+    return materialize_city(city, at)
+
+
+def pop_uncapped(db: Session) -> List[City]:
+    """Cities un-capped on this session since the last call (or commit)."""
+    return db.info.pop(_UNCAPPED_KEY, None) or []
+
+
+def _clear_full_on_change(target: City, value, oldvalue, _initiator) -> None:
+    if target.full_at is None or value == oldvalue:
+        return
+    target.full_at = None
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_UNCAPPED_KEY, []).append(target)
+
+
+for _r in RESOURCES:
+    event.listen(getattr(City, _r), "set", _clear_full_on_change)
+    event.listen(getattr(City, f"max_{_r}"), "set", _clear_full_on_change)
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_uncapped_after_commit(session: Session) -> None:
+    session.info.pop(_UNCAPPED_KEY, None)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_uncapped_after_rollback(session: Session, _previous_transaction) -> None:
+    session.info.pop(_UNCAPPED_KEY, None)
@@ -1,16 +1,48 @@
 # app/game/tick.py
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional
 import math
 import json
 
 from sqlalchemy.orm import Session
-from sqlalchemy import update
-
-from app.game.raid_mail import send_raid_result_mail
-from app.game.governor import get_city_governor_bonus
+from sqlalchemy import update, or_
+
+from app.config import (
+    TICK_BULK_PRODUCTION,
+    GOVERNOR_PRELOAD_ON_TICK,
+    LAZY_RESOURCES,
+    TICK_LEASE_ENABLED,
+    TICK_SLICE_EVENTS,
+    TICK_SLICE_MINUTES,
+)
+from app.game.bulk_production import (
+    apply_production_bulk,
+    bulk_production_supported,
+    count_cities,
+    earliest_last_tick,
+    production_totals,
+)
+from app.game.mailbox import flush_mail_outbox
+from app.game.raid_mail import build_raid_result_mail, deliver_raid_result_mail
+from app.game.resources import mark_full, pop_uncapped, settle_city
+from app.game.event_queue import TickEventQueue
+from app.game.next_event import has_due_events, sync_next_event_at
+from app.game.world_events import (
+    RAID_ARRIVAL,
+    RAID_RETURN,
+    RESEARCH,
+    TRAINING,
+    UPGRADE,
+    load_due_events,
+    nth_due_after,
+)
+from app.game.world_clock import advance_world_clock, world_clock
+from app.game.tick_lease import release_lease, try_acquire_lease
+from app.game.governor import governor_cache_complete, preload_governor_bonuses
+from app.game.hero_specialties import calculate_hero_bonuses
 from app.models.building import Building
 from app.models.city import City
 from app.models.raid import Raid
@@ -24,15 +56,13 @@ from app.models.research import Research
 from app.models.research_queue import ResearchQueue
 from app.models.hero import Hero
 from app.game.hero_progression import add_hero_xp
+from app.push import push_event
 
 # ----------------------------
 # Helpers: Rates + Storage
 # ----------------------------
 
-def _recalc_rates_for_city(db: Session, city_id: int) -> Dict[str, int]:
-    buildings = db.query(Building).filter(Building.city_id == city_id).all()
-    levels = {b.type: b.level for b in buildings}
-
+def _rates_from_levels(levels: Dict[str, int]) -> Dict[str, int]:
     farm_lvl = levels.get("farm", 1)
     saw_lvl = levels.get("sawmill", 1)
     quarry_lvl = levels.get("quarry", 1)
@@ -62,10 +92,7 @@ def _recalc_rates_for_city(db: Session, city_id: int) -> Dict[str, int]:
         "iron_rate": max(0, int(iron_rate)),
     }
 
-def _recalc_storage_for_city(db: Session, city_id: int) -> Dict[str, int]:
-    buildings = db.query(Building).filter(Building.city_id == city_id).all()
-    levels = {b.type: b.level for b in buildings}
-
+def _storage_from_levels(levels: Dict[str, int]) -> Dict[str, int]:
     wh_lvl = levels.get("warehouse", 1)
 
     max_food = 5000 + wh_lvl * 2000
@@ -93,23 +120,43 @@ def _recalc_storage_for_city(db: Session, city_id: int) -> Dict[str, int]:
     }
 
 
-# ----------------------------
-# Tick: City production
-# ----------------------------
+# Derived stats only change when a building level changes, so they live on the
+# City row (rates, max_*, protected_*): refresh_city_stats() recomputes them
+# from Building rows at those points (upgrade completion, admin building set,
+# registration) and the tick paths read the stored columns. No per-process
+# copy, so every worker and the ticker see the same committed values.
+def _city_derived_stats(db: Session, city_id: int) -> Dict[str, Dict[str, int]]:
+    buildings = db.query(Building).filter(Building.city_id == city_id).all()
+    levels = {b.type: b.level for b in buildings}
+    return {
+        "rates": _rates_from_levels(levels),
+        "storage": _storage_from_levels(levels),
+    }
 
-def apply_city_tick(city: City, now: datetime, db: Session) -> int:
-    last = city.last_tick_at or now
-    minutes = int((now - last).total_seconds() // 60)
-    if minutes <= 0:
-        return 0
 
-    rates = _recalc_rates_for_city(db, city.id)
+def _recalc_rates_for_city(db: Session, city_id: int) -> Dict[str, int]:
+    return dict(_city_derived_stats(db, city_id)["rates"])
+
+
+def _recalc_storage_for_city(db: Session, city_id: int) -> Dict[str, int]:
+    return dict(_city_derived_stats(db, city_id)["storage"])
+
+
+def refresh_city_stats(db: Session, city: City) -> None:
+    """
+    Copy building-derived rates, caps and protection onto the City row.
+    Bulk production reads these columns directly, so anything that changes
+    building levels should call this.
+    """
+    stats = _city_derived_stats(db, city.id)
+
+    rates = stats["rates"]
     city.food_rate = rates["food_rate"]
     city.wood_rate = rates["wood_rate"]
     city.stone_rate = rates["stone_rate"]
     city.iron_rate = rates["iron_rate"]
 
-    storage = _recalc_storage_for_city(db, city.id)
+    storage = stats["storage"]
     city.max_food = storage["max_food"]
     city.max_wood = storage["max_wood"]
     city.max_stone = storage["max_stone"]
@@ -119,6 +166,18 @@ def apply_city_tick(city: City, now: datetime, db: Session) -> int:
     city.protected_stone = storage["protected_stone"]
     city.protected_iron = storage["protected_iron"]
 
+
+# ----------------------------
+# Tick: City production
+# ----------------------------
+
+def apply_city_tick(city: City, now: datetime, db: Session) -> int:
+    last = city.last_tick_at or now
+    minutes = int((now - last).total_seconds() // 60)
+    if minutes <= 0:
+        return 0
+
+    # rates / caps are the stored columns (refresh_city_stats keeps them current)
     city.food += city.food_rate * minutes
     city.wood += city.wood_rate * minutes
     city.stone += city.stone_rate * minutes
@@ -130,10 +189,11 @@ def apply_city_tick(city: City, now: datetime, db: Session) -> int:
     city.iron = min(city.iron, city.max_iron)
 
     city.last_tick_at = last + timedelta(minutes=minutes)
+    mark_full(city)
     return minutes
 
 
-def _award_raid_xp(db: Session, raid: Raid) -> dict | None:
+def _raid_xp(raid: Raid) -> int:
     xp = 10
 
     loot_total = (
@@ -146,7 +206,7 @@ def _award_raid_xp(db: Session, raid: Raid) -> dict | None:
     if loot_total > 0:
         xp += 5
 
-    return _award_governor_xp(db, int(raid.attacker_city_id), xp)
+    return xp
 
 def _award_governor_xp(db: Session, city_id: int, amount: int) -> dict | None:
     hero = (
@@ -210,52 +270,114 @@ def _proportional_take(loot: Dict[str, int], capacity: int) -> Dict[str, int]:
 
     return taken
 
-def _return_troops_from_raid(db: Session, raid: Raid) -> None:
+# ----------------------------
+# Raids: batch prefetch
+# ----------------------------
+
+# Keep IN (...) lists well under SQLite's bound-parameter limit
+_IN_CHUNK = 500
+
+
+def _chunked(ids: Iterable[int], size: int = _IN_CHUNK):
+    ids = sorted({int(i) for i in ids})
+    for i in range(0, len(ids), size):
+        yield ids[i:i + size]
+
+
+@dataclass
+class _RaidBatch:
     """
-    When a raid resolves, return (count_sent - count_lost) to attacker city_troops.
+    Everything a batch of due raids touches, loaded with a handful of IN-queries
+    so the per-raid work runs on in-memory rows. Rows are the session's identity
+    objects, so mutations made while resolving one raid are seen by the next.
+    """
+    cities: Dict[int, City] = field(default_factory=dict)
+    raid_lines: Dict[int, List[RaidTroop]] = field(default_factory=dict)
+    snapshots: Dict[int, List[RaidDefenderTroop]] = field(default_factory=dict)
+    city_troops: Dict[int, List[CityTroop]] = field(default_factory=dict)
+    troop_types: Dict[int, TroopType] = field(default_factory=dict)
+    governors: Dict[int, Hero] = field(default_factory=dict)
 
-    Idempotency guard:
-    - After returning, set count_sent = count_lost (so returning becomes 0 on re-run).
-      This prevents double returns if the server crashes mid-tick.
+
+def _load_raid_batch(db: Session, raids: List[Raid], *, troop_city_ids: Iterable[int]) -> _RaidBatch:
     """
-    lines = (
-        db.query(RaidTroop)
-        .filter(RaidTroop.raid_id == raid.id)
-        .all()
-    )
-    if not lines:
-        return
+    Prefetch for `raids`: both cities, raid troop lines, defender snapshots,
+    governors of both cities, city_troops of `troop_city_ids` and the troop
+    types any of those rows reference.
+    """
+    batch = _RaidBatch()
 
-    for rt in lines:
-        sent = max(0, int(getattr(rt, "count_sent", 0) or 0))
-        lost = max(0, int(getattr(rt, "count_lost", 0) or 0))
-        returning = max(0, sent - lost)
-        if returning > 0:
-            row = (
-                db.query(CityTroop)
-                .filter(
-                    CityTroop.city_id == raid.attacker_city_id,
-                    CityTroop.troop_type_id == rt.troop_type_id,
-                )
-                .first()
-            )
-            if not row:
-                row = CityTroop(
-                    city_id=raid.attacker_city_id,
-                    troop_type_id=rt.troop_type_id,
-                    count=0,
-                )
-                db.add(row)
-                db.flush()
+    raid_ids = [int(r.id) for r in raids]
+    city_ids = {int(r.attacker_city_id) for r in raids} | {int(r.target_city_id) for r in raids}
 
-            row.count = int(row.count) + int(returning)
+    for chunk in _chunked(city_ids):
+        for c in db.query(City).filter(City.id.in_(chunk)).all():
+            batch.cities[int(c.id)] = c
+
+        heroes = (
+            db.query(Hero)
+            .filter(Hero.city_id.in_(chunk), Hero.status == "governor")
+            .order_by(Hero.id)
+            .all()
+        )
+        for h in heroes:
+            batch.governors.setdefault(int(h.city_id), h)
+
+    for chunk in _chunked(raid_ids):
+        for rt in db.query(RaidTroop).filter(RaidTroop.raid_id.in_(chunk)).order_by(RaidTroop.id).all():
+            batch.raid_lines.setdefault(int(rt.raid_id), []).append(rt)
+
+        snaps = (
+            db.query(RaidDefenderTroop)
+            .filter(RaidDefenderTroop.raid_id.in_(chunk))
+            .order_by(RaidDefenderTroop.id)
+            .all()
+        )
+        for snap in snaps:
+            batch.snapshots.setdefault(int(snap.raid_id), []).append(snap)
+
+    for chunk in _chunked(troop_city_ids):
+        for ct in db.query(CityTroop).filter(CityTroop.city_id.in_(chunk)).order_by(CityTroop.id).all():
+            batch.city_troops.setdefault(int(ct.city_id), []).append(ct)
+
+    type_ids = set()
+    for lines in batch.raid_lines.values():
+        type_ids.update(int(rt.troop_type_id) for rt in lines)
+    for rows in batch.city_troops.values():
+        type_ids.update(int(ct.troop_type_id) for ct in rows)
+    for snaps in batch.snapshots.values():
+        type_ids.update(int(snap.troop_type_id) for snap in snaps)
+
+    for chunk in _chunked(type_ids):
+        for tt in db.query(TroopType).filter(TroopType.id.in_(chunk)).all():
+            batch.troop_types[int(tt.id)] = tt
+
+    return batch
+
+
+def _batch_governor_bonus(batch: _RaidBatch, city_id: int):
+    """Same shape as governor.get_city_governor_bonus, from the prefetched heroes."""
+    governor = batch.governors.get(int(city_id))
+    if not governor:
+        return None, {}
+    return governor, calculate_hero_bonuses(governor)
 
-        # ✅ consume the return so it can't happen twice
-        rt.count_sent = max(int(rt.count_sent), int(rt.count_lost))
 
 def _apply_casualties_at_arrival(db: Session, raid: Raid) -> None:
     """
-    Resolve combat at arrival time.
+    Resolve combat at arrival time for a single raid.
+
+    Loader wrapper around _apply_casualties_from_batch; the tick stage prefetches
+    a whole batch of raids instead (see _load_raid_batch).
+    """
+    batch = _load_raid_batch(db, [raid], troop_city_ids=[raid.target_city_id])
+    _apply_casualties_from_batch(db, raid, batch)
+    db.flush()
+
+
+def _apply_casualties_from_batch(db: Session, raid: Raid, batch: _RaidBatch) -> None:
+    """
+    Resolve combat at arrival time from prefetched rows (no queries).
 
     Uses:
       - attacker composition: raid_troops (count_sent)
@@ -267,34 +389,47 @@ def _apply_casualties_at_arrival(db: Session, raid: Raid) -> None:
       - subtracts defender losses from city_troops.count
       - snapshots defender start + lost into raid_defender_troops (deterministic reports)
     """
-    # Load attacker troop lines for this raid
-    atk_lines = (
-        db.query(RaidTroop)
-        .filter(RaidTroop.raid_id == raid.id)
-        .all()
-    )
+    atk_lines = batch.raid_lines.get(int(raid.id), [])
     if not atk_lines:
         return
 
     # ✅ Strong idempotency guard:
     # If we already snapshotted defender troops for this raid, do nothing.
-    already = (
-        db.query(RaidDefenderTroop)
-        .filter(RaidDefenderTroop.raid_id == raid.id)
-        .first()
-    )
-    if already:
+    if batch.snapshots.get(int(raid.id)):
         return
 
-    atk_type_ids = [int(rt.troop_type_id) for rt in atk_lines]
+    # ALL defender troops for the target city (same objects across the batch,
+    # so earlier raids' defender losses are already applied)
+    def_rows = batch.city_troops.get(int(raid.target_city_id), [])
 
-    # Load ALL defender troops for the target city
-    def_rows = (
-        db.query(CityTroop)
-        .filter(CityTroop.city_id == raid.target_city_id)
-        .all()
+    _, attacker_bonuses = _batch_governor_bonus(batch, int(raid.attacker_city_id))
+    _, defender_bonuses = _batch_governor_bonus(batch, int(raid.target_city_id))
+
+    batch.snapshots[int(raid.id)] = _resolve_combat(
+        db,
+        raid,
+        atk_lines,
+        def_rows,
+        batch.troop_types,
+        attacker_bonuses,
+        defender_bonuses,
     )
-    def_by_type_id = {int(ct.troop_type_id): ct for ct in def_rows}
+
+
+def _resolve_combat(
+    db: Session,
+    raid: Raid,
+    atk_lines: List[RaidTroop],
+    def_rows: List[CityTroop],
+    tt_by_id: Dict[int, TroopType],
+    attacker_bonuses: dict,
+    defender_bonuses: dict,
+) -> List[RaidDefenderTroop]:
+    """
+    Combat math on in-memory rows. Adds (does not flush) the defender snapshot
+    rows and returns them.
+    """
+    atk_type_ids = [int(rt.troop_type_id) for rt in atk_lines]
 
     # Union of troop types so power calc can see all relevant stats
     def_type_ids = [int(ct.troop_type_id) for ct in def_rows]
@@ -304,14 +439,7 @@ def _apply_casualties_at_arrival(db: Session, raid: Raid) -> None:
         # no types exist anywhere; nothing to do
         for rt in atk_lines:
             rt.count_lost = 0
-        return
-
-    types = (
-        db.query(TroopType)
-        .filter(TroopType.id.in_(all_type_ids))
-        .all()
-    )
-    tt_by_id = {int(tt.id): tt for tt in types}
+        return []
 
     # ✅ Snapshot defender troops at impact time
     # (even if empty — but we only have rows for types that exist in city_troops)
@@ -327,19 +455,6 @@ def _apply_casualties_at_arrival(db: Session, raid: Raid) -> None:
         db.add(snap)
         snap_by_type_id[tid] = snap
 
-    db.flush()  # allocate snapshot IDs (not required, but fine)
-
-    # Compute total power
-    attacker_governor, attacker_bonuses = get_city_governor_bonus(
-        db,
-        int(raid.attacker_city_id),
-    )
-
-    defender_governor, defender_bonuses = get_city_governor_bonus(
-        db,
-        int(raid.target_city_id),
-    )
-
     attack_bonus = float(attacker_bonuses.get("attack_bonus", 0) or 0)
     defense_bonus = float(defender_bonuses.get("defense_bonus", 0) or 0)
 
@@ -379,11 +494,11 @@ def _apply_casualties_at_arrival(db: Session, raid: Raid) -> None:
         for rt in atk_lines:
             rt.count_lost = 0
         # snapshots exist but will all be 0 lost; that's fine
-        return
+        return list(snap_by_type_id.values())
 
     # If no attackers, nothing to do (shouldn’t happen if raid exists)
     if atk_power <= 0:
-        return
+        return list(snap_by_type_id.values())
 
     # Loss rates (your same tunable approach)
     ratio = def_power / (atk_power + def_power)  # 0..1
@@ -418,113 +533,206 @@ def _apply_casualties_at_arrival(db: Session, raid: Raid) -> None:
         if snap:
             snap.count_lost = int(def_lost)
 
+    return list(snap_by_type_id.values())
+
 # ----------------------------
 # Raids: two-stage resolver
 # ----------------------------
 
-def _resolve_arrivals_to_returning_at(db: Session, event_time: datetime) -> int:
+def _resolve_arrivals_to_returning_at(
+    db: Session,
+    event_time: datetime,
+    city_ids: Optional[set[int]] = None,
+    events: Optional[TickEventQueue] = None,
+) -> int:
     """
     Stage 1:
     enroute + arrives_at <= event_time => compute loot, subtract target, set returning + returns_at
     (attacker NOT credited yet)
+    If an event queue is given, each raid's new returns_at is pushed onto it.
     """
+    # Claim the due raids like the training/research stages: on PostgreSQL
+    # raids another worker's tick is already resolving are locked and skipped
+    # (no double loot); the locked rows' current values win over anything this
+    # session loaded earlier. SQLite ignores FOR UPDATE (single writer).
     due = (
-        db.query(Raid)
-        .filter(Raid.status == "enroute", Raid.arrives_at <= event_time)
+        _scope_raids(
+            db.query(Raid).filter(Raid.status == "enroute", Raid.arrives_at <= event_time),
+            city_ids,
+        )
+        .with_for_update(skip_locked=True)
+        .populate_existing()
         .all()
     )
 
-    count = 0
+    if not due:
+        return 0
 
-    for r in due:
-        attacker = db.query(City).filter(City.id == r.attacker_city_id).first()
-        target = db.query(City).filter(City.id == r.target_city_id).first()
+    batch = _load_raid_batch(db, due, troop_city_ids={int(r.target_city_id) for r in due})
 
-        if not attacker or not target:
-            r.status = "resolved"
-            r.resolved_at = event_time
+    count = 0
+
+    for wave in _arrival_waves(due):
+        for r in wave:
+            _resolve_arrival(db, r, batch, event_time, events)
             count += 1
-            continue
 
-        # Update storage/protected on both
-        for c in (attacker, target):
-            s = _recalc_storage_for_city(db, c.id)
-            c.max_food = s["max_food"]
-            c.max_wood = s["max_wood"]
-            c.max_stone = s["max_stone"]
-            c.max_iron = s["max_iron"]
-            c.protected_food = s["protected_food"]
-            c.protected_wood = s["protected_wood"]
-            c.protected_stone = s["protected_stone"]
-            c.protected_iron = s["protected_iron"]
-
-        loot = _lootable(target)
-        taken = _proportional_take(loot, r.carry_capacity)
-
-        # Subtract from target (never below protected)
-        target.food -= taken["food"]
-        target.wood -= taken["wood"]
-        target.stone -= taken["stone"]
-        target.iron -= taken["iron"]
-
-        target.food = max(target.food, target.protected_food)
-        target.wood = max(target.wood, target.protected_wood)
-        target.stone = max(target.stone, target.protected_stone)
-        target.iron = max(target.iron, target.protected_iron)
-
-        # Save loot on raid row (but DO NOT credit attacker yet)
-        r.stolen_food = taken["food"]
-        r.stolen_wood = taken["wood"]
-        r.stolen_stone = taken["stone"]
-        r.stolen_iron = taken["iron"]
-
-        # Option B: resolve combat + record losses
-        _apply_casualties_at_arrival(db, r)
-
-        # --- PATCH (Stage 1 timing): respect outbound_seconds/return_seconds and only compute if missing ---
-        # outbound_seconds: if missing/0, derive from timestamps (legacy rows)
-        if getattr(r, "outbound_seconds", 0) <= 0:
-            if r.created_at and r.arrives_at:
-                r.outbound_seconds = max(
-                    1, int((r.arrives_at - r.created_at).total_seconds())
-                )
-            else:
-                r.outbound_seconds = 1
-
-        # return_seconds: if missing/0, default to outbound_seconds (legacy rows)
-        if getattr(r, "return_seconds", 0) <= 0:
-            r.return_seconds = max(1, int(r.outbound_seconds))
-
-        # returns_at: always re-anchor to arrives_at so timing is consistent
-        base = r.arrives_at or event_time
-        r.returns_at = base + timedelta(seconds=int(r.return_seconds))
-        # END PATCH
-        r.status = "returning"
-        r.resolved_at = None
-        count += 1
+    # One flush for the whole batch (defender snapshots, losses, loot)
+    db.flush()
 
     return count
 
 
-def _resolve_returns_to_resolved_at(db: Session, event_time: datetime) -> int:
+def _resolve_arrival(
+    db: Session,
+    r: Raid,
+    batch: _RaidBatch,
+    event_time: datetime,
+    events: Optional[TickEventQueue],
+) -> None:
+    """Loot, combat and return timing for one arrived raid (prefetched rows only)."""
+    attacker = batch.cities.get(int(r.attacker_city_id))
+    target = batch.cities.get(int(r.target_city_id))
+
+    if not attacker or not target:
+        r.status = "resolved"
+        r.resolved_at = event_time
+        return
+
+    # Storage/protected come from the stored columns (refresh_city_stats)
+    for c in (attacker, target):
+        settle_city(c, event_time)
+
+    loot = _lootable(target)
+    taken = _proportional_take(loot, r.carry_capacity)
+
+    # Subtract from target (never below protected)
+    target.food -= taken["food"]
+    target.wood -= taken["wood"]
+    target.stone -= taken["stone"]
+    target.iron -= taken["iron"]
+
+    target.food = max(target.food, target.protected_food)
+    target.wood = max(target.wood, target.protected_wood)
+    target.stone = max(target.stone, target.protected_stone)
+    target.iron = max(target.iron, target.protected_iron)
+
+    # Save loot on raid row (but DO NOT credit attacker yet)
+    r.stolen_food = taken["food"]
+    r.stolen_wood = taken["wood"]
+    r.stolen_stone = taken["stone"]
+    r.stolen_iron = taken["iron"]
+
+    # Option B: resolve combat + record losses
+    _apply_casualties_from_batch(db, r, batch)
+
+    # --- PATCH (Stage 1 timing): respect outbound_seconds/return_seconds and only compute if missing ---
+    # outbound_seconds: if missing/0, derive from timestamps (legacy rows)
+    if getattr(r, "outbound_seconds", 0) <= 0:
+        if r.created_at and r.arrives_at:
+            r.outbound_seconds = max(
+                1, int((r.arrives_at - r.created_at).total_seconds())
+            )
+        else:
+            r.outbound_seconds = 1
+
+    # return_seconds: if missing/0, default to outbound_seconds (legacy rows)
+    if getattr(r, "return_seconds", 0) <= 0:
+        r.return_seconds = max(1, int(r.outbound_seconds))
+
+    # returns_at: always re-anchor to arrives_at so timing is consistent
+    base = r.arrives_at or event_time
+    r.returns_at = base + timedelta(seconds=int(r.return_seconds))
+    # END PATCH
+    r.status = "returning"
+    r.resolved_at = None
+    _push_raid(db, r, event_time)
+
+    if events is not None:
+        events.push(r.returns_at, RAID_RETURN, r.id)
+
+
+def _push_raid(db: Session, raid: Raid, event_time: datetime) -> None:
+    """Raid status change for both sides (sent to the UI after commit)."""
+    for city_id in {int(raid.attacker_city_id), int(raid.target_city_id)}:
+        push_event(
+            db,
+            "raid",
+            city_id=city_id,
+            raid_id=int(raid.id),
+            status=raid.status,
+            attacker_city_id=int(raid.attacker_city_id),
+            target_city_id=int(raid.target_city_id),
+            returns_at=raid.returns_at,
+            at=event_time,
+        )
+
+
+def _arrival_waves(due: List[Raid]) -> List[List[Raid]]:
+    """
+    Group due raids by target city, each group in (arrives_at, id) order.
+
+    Raids on the same target must resolve one after another (each one's loot and
+    defender losses change what the next one finds). Raids on different targets
+    don't share any state at arrival, so groups are independent; they are
+    returned in target id order so a tick's outcome never depends on row order.
+    """
+    by_target: Dict[int, List[Raid]] = {}
+    for r in due:
+        by_target.setdefault(int(r.target_city_id), []).append(r)
+
+    waves = []
+    for target_id in sorted(by_target):
+        wave = by_target[target_id]
+        wave.sort(key=lambda r: (r.arrives_at, int(r.id)))
+        waves.append(wave)
+    return waves
+
+
+def _resolve_returns_to_resolved_at(
+    db: Session,
+    event_time: datetime,
+    city_ids: Optional[set[int]] = None,
+) -> int:
     """
     Stage 2:
     returning + returns_at <= event_time => credit attacker, set resolved
+
+    The whole due batch is prefetched (_load_raid_batch); troop and loot credits
+    land on the in-memory city_troops / city rows, so each touched row is written
+    once by the stage's single flush no matter how many marches came home.
     """
+    # Claimed the same way as arrivals (FOR UPDATE SKIP LOCKED on PostgreSQL)
     due = (
-        db.query(Raid)
-        .filter(
-            Raid.status == "returning",
-            Raid.returns_at.isnot(None),  # prevents NULL compares / weird rows
-            Raid.returns_at <= event_time,
+        _scope_raids(
+            db.query(Raid).filter(
+                Raid.status == "returning",
+                Raid.returns_at.isnot(None),  # prevents NULL compares / weird rows
+                Raid.returns_at <= event_time,
+            ),
+            city_ids,
         )
+        .order_by(Raid.returns_at, Raid.id)
+        .with_for_update(skip_locked=True)
+        .populate_existing()
         .all()
     )
 
+    if not due:
+        return 0
+
+    batch = _load_raid_batch(db, due, troop_city_ids={int(r.attacker_city_id) for r in due})
+
+    # (city_id, troop_type_id) -> CityTroop, including rows created below
+    troop_rows: Dict[tuple, CityTroop] = {}
+    for rows in batch.city_troops.values():
+        for ct in rows:
+            troop_rows.setdefault((int(ct.city_id), int(ct.troop_type_id)), ct)
+
     count = 0
 
     for r in due:
-        attacker = db.query(City).filter(City.id == r.attacker_city_id).first()
+        attacker = batch.cities.get(int(r.attacker_city_id))
 
         # Defensive: stolen_* should never be NULL/negative, but clamp just in case.
         stolen_food = max(0, int(getattr(r, "stolen_food", 0) or 0))
@@ -536,21 +744,10 @@ def _resolve_returns_to_resolved_at(db: Session, event_time: datetime) -> int:
         r.resolved_at = event_time
 
         # Return troops (Option B)
-        _return_troops_from_raid(db, r)
+        _return_troops_from_batch(db, r, batch, troop_rows)
 
         if attacker:
-            # Refresh storage so max_* (and protected_*) match current buildings.
-            s = _recalc_storage_for_city(db, attacker.id)
-            attacker.max_food = s["max_food"]
-            attacker.max_wood = s["max_wood"]
-            attacker.max_stone = s["max_stone"]
-            attacker.max_iron = s["max_iron"]
-
-            # Optional: keep protected_* in sync too
-            attacker.protected_food = s["protected_food"]
-            attacker.protected_wood = s["protected_wood"]
-            attacker.protected_stone = s["protected_stone"]
-            attacker.protected_iron = s["protected_iron"]
+            settle_city(attacker, event_time)
 
             # Credit loot, capped by max storage
             attacker.food = min(attacker.max_food, attacker.food + stolen_food)
@@ -558,19 +755,96 @@ def _resolve_returns_to_resolved_at(db: Session, event_time: datetime) -> int:
             attacker.stone = min(attacker.max_stone, attacker.stone + stolen_stone)
             attacker.iron = min(attacker.max_iron, attacker.iron + stolen_iron)
 
-        hero_progress = _award_raid_xp(db, r)
+        hero_progress = _award_raid_xp_from_batch(batch, r)
 
         if hero_progress:
             r.hero_progress_json = json.dumps(hero_progress)
 
-        # NEW: drop raid-result mail into both players' inboxes
-        # (Use r.id — your loop var is r)
-        send_raid_result_mail(db, raid_id=r.id, now=event_time)
+        _push_raid(db, r, event_time)
+
+        # Drop raid-result mail into both players' inboxes
+        _send_raid_result_mail_from_batch(db, r, batch)
 
         count += 1
 
+    # One flush for the whole batch (troops, loot, heroes); mail waits in the outbox
+    db.flush()
+
     return count
 
+
+def _return_troops_from_batch(
+    db: Session,
+    raid: Raid,
+    batch: _RaidBatch,
+    troop_rows: Dict[tuple, CityTroop],
+) -> None:
+    """
+    When a raid resolves, return (count_sent - count_lost) to attacker city_troops.
+
+    Works on prefetched rows; missing city_troops rows are created once and
+    reused by later raids of the same attacker in the batch.
+
+    Idempotency guard:
+    - After returning, set count_sent = count_lost (so returning becomes 0 on re-run).
+      This prevents double returns if the server crashes mid-tick.
+    """
+    for rt in batch.raid_lines.get(int(raid.id), []):
+        sent = max(0, int(getattr(rt, "count_sent", 0) or 0))
+        lost = max(0, int(getattr(rt, "count_lost", 0) or 0))
+        returning = max(0, sent - lost)
+        if returning > 0:
+            key = (int(raid.attacker_city_id), int(rt.troop_type_id))
+            row = troop_rows.get(key)
+            if not row:
+                row = CityTroop(
+                    city_id=raid.attacker_city_id,
+                    troop_type_id=rt.troop_type_id,
+                    count=0,
+                )
+                db.add(row)
+                troop_rows[key] = row
+
+            row.count = int(row.count) + int(returning)
+
+        # ✅ consume the return so it can't happen twice
+        rt.count_sent = max(int(rt.count_sent), int(rt.count_lost))
+
+
+def _award_raid_xp_from_batch(batch: _RaidBatch, raid: Raid) -> dict | None:
+    hero = batch.governors.get(int(raid.attacker_city_id))
+    if not hero:
+        return None
+
+    return add_hero_xp(hero, _raid_xp(raid))
+
+
+def _send_raid_result_mail_from_batch(db: Session, raid: Raid, batch: _RaidBatch) -> None:
+    """send_raid_result_mail from prefetched rows (mail goes to the session outbox)."""
+    attacker_city = batch.cities.get(int(raid.attacker_city_id))
+    defender_city = batch.cities.get(int(raid.target_city_id))
+    if not attacker_city or not defender_city:
+        return
+
+    tt_by_id = batch.troop_types
+    atk_lines = [
+        (rt, tt_by_id[int(rt.troop_type_id)])
+        for rt in batch.raid_lines.get(int(raid.id), [])
+        if int(rt.troop_type_id) in tt_by_id
+    ]
+    def_lines = [
+        (snap, tt_by_id[int(snap.troop_type_id)])
+        for snap in batch.snapshots.get(int(raid.id), [])
+        if int(snap.troop_type_id) in tt_by_id
+    ]
+
+    subject, body, payload = build_raid_result_mail(
+        raid, attacker_city, defender_city, atk_lines, def_lines
+    )
+    deliver_raid_result_mail(
+        db, attacker_city, defender_city, subject, body, payload, buffered=True
+    )
+
 # ----------------------------
 # Tiny wrappers (use "now")
 # ----------------------------
@@ -593,8 +867,15 @@ def _resolve_returns_to_resolved(db: Session, now: datetime) -> int:
 # Upgrades: event-time resolver
 # ----------------------------
 
-def _complete_due_upgrades_at(db: Session, event_time: datetime) -> int:
-    due = db.query(Upgrade).filter(Upgrade.completes_at <= event_time).all()
+def _complete_due_upgrades_at(
+    db: Session,
+    event_time: datetime,
+    city_ids: Optional[set[int]] = None,
+) -> int:
+    q = db.query(Upgrade).filter(Upgrade.completes_at <= event_time)
+    if city_ids is not None:
+        q = q.filter(Upgrade.city_id.in_(city_ids))
+    due = q.all()
     completed = 0
     touched_city_ids = set()
 
@@ -611,6 +892,15 @@ def _complete_due_upgrades_at(db: Session, event_time: datetime) -> int:
 
             _award_governor_xp(db, int(up.city_id), 5)
 
+            push_event(
+                db,
+                "upgrade",
+                city_id=up.city_id,
+                building_type=up.building_type,
+                level=int(up.to_level),
+                at=event_time,
+            )
+
         db.delete(up)
         completed += 1
 
@@ -630,22 +920,11 @@ def _complete_due_upgrades_at(db: Session, event_time: datetime) -> int:
             if keep:
                 city.townhall_level = keep.level
 
+            # Production so far accrued at the old rates/caps
+            settle_city(city, event_time)
+
             # Refresh storage + protection + rates immediately
-            rates = _recalc_rates_for_city(db, city_id)
-            city.food_rate = rates["food_rate"]
-            city.wood_rate = rates["wood_rate"]
-            city.stone_rate = rates["stone_rate"]
-            city.iron_rate = rates["iron_rate"]
-
-            storage = _recalc_storage_for_city(db, city_id)
-            city.max_food = storage["max_food"]
-            city.max_wood = storage["max_wood"]
-            city.max_stone = storage["max_stone"]
-            city.max_iron = storage["max_iron"]
-            city.protected_food = storage["protected_food"]
-            city.protected_wood = storage["protected_wood"]
-            city.protected_stone = storage["protected_stone"]
-            city.protected_iron = storage["protected_iron"]
+            refresh_city_stats(db, city)
 
             # Clamp (shouldn’t usually decrease, but safe)
             city.food = min(city.food, city.max_food)
@@ -656,76 +935,38 @@ def _complete_due_upgrades_at(db: Session, event_time: datetime) -> int:
     return completed
 
 
-def _next_event_time(db: Session, after: datetime, hard_stop: datetime) -> Optional[datetime]:
+def _load_event_queue(
+    db: Session,
+    hard_stop: datetime,
+    city_ids: Optional[set[int]] = None,
+) -> TickEventQueue:
     """
-    Find the next interesting time > after and <= hard_stop among:
-    - next raid arrival (enroute.arrives_at)
-    - next raid return  (returning.returns_at)
-    - next upgrade complete (upgrade.completes_at)
-    Returns None if none exist (meaning: jump to hard_stop).
+    Load every pending event due by hard_stop once, with one range scan over
+    world_events (raid arrivals and returns, upgrade, training and research
+    completions). Follow-ups scheduled during the tick are pushed by the
+    stages themselves.
     """
-    next_times = []
-
-    next_arrival = (
-        db.query(Raid)
-        .filter(Raid.status == "enroute", Raid.arrives_at > after, Raid.arrives_at <= hard_stop)
-        .order_by(Raid.arrives_at.asc())
-        .first()
-    )
-    if next_arrival:
-        next_times.append(next_arrival.arrives_at)
-
-    next_return = (
-        db.query(Raid)
-        .filter(Raid.status == "returning", Raid.returns_at > after, Raid.returns_at <= hard_stop)
-        .order_by(Raid.returns_at.asc())
-        .first()
-    )
-    if next_return and next_return.returns_at:
-        next_times.append(next_return.returns_at)
-
-    next_upgrade = (
-        db.query(Upgrade)
-        .filter(Upgrade.completes_at > after, Upgrade.completes_at <= hard_stop)
-        .order_by(Upgrade.completes_at.asc())
-        .first()
-    )
-    
-    next_training = (
-        db.query(TrainingQueue)
-        .filter(
-            TrainingQueue.status == "training",
-            TrainingQueue.finishes_at > after,
-            TrainingQueue.finishes_at <= hard_stop,
-        )
-        .order_by(TrainingQueue.finishes_at.asc())
-        .first()
-    )
-    if next_training:
-        next_times.append(next_training.finishes_at)
-
-    if next_upgrade:
-        next_times.append(next_upgrade.completes_at)
-
-    if not next_times:
-        return None
-
-    return min(next_times)
-
-def finalize_training_queue(db: Session, now: datetime) -> int:
+    events = TickEventQueue(hard_stop)
+    for at, kind, ref_id in load_due_events(db, hard_stop, city_ids):
+        events.push(at, kind, ref_id)
+    return events
+
+def finalize_training_queue(
+    db: Session,
+    now: datetime,
+    city_ids: Optional[set[int]] = None,
+) -> int:
     # grab candidate IDs first (cheap, deterministic ordering)
-    ids = [
-        r[0]
-        for r in (
-            db.query(TrainingQueue.id)
-            .filter(
-                TrainingQueue.status == "training",
-                TrainingQueue.finishes_at <= now,
-            )
-            .order_by(TrainingQueue.id.asc())
-            .all()
-        )
-    ]
+    q = db.query(TrainingQueue.id).filter(
+        TrainingQueue.status == "training",
+        TrainingQueue.finishes_at <= now,
+    )
+    if city_ids is not None:
+        q = q.filter(TrainingQueue.city_id.in_(city_ids))
+    # On PostgreSQL the candidates are row-locked and rows another ticker is
+    # already finalizing are skipped; SQLite ignores FOR UPDATE (single writer).
+    q = q.with_for_update(skip_locked=True)
+    ids = [r[0] for r in q.order_by(TrainingQueue.id.asc()).all()]
 
     finalized = 0
 
@@ -772,21 +1013,31 @@ def finalize_training_queue(db: Session, now: datetime) -> int:
         tq.status = "completed"
         finalized += 1
 
+        push_event(
+            db,
+            "training",
+            city_id=tq.city_id,
+            queue_id=int(tq.id),
+            troop_type_id=int(tq.troop_type_id),
+            count=int(tq.count),
+            at=now,
+        )
+
     return finalized
 
-def finalize_research_queue(db: Session, now: datetime) -> int:
-    ids = [
-        r[0]
-        for r in (
-            db.query(ResearchQueue.id)
-            .filter(
-                ResearchQueue.status == "researching",
-                ResearchQueue.finishes_at <= now,
-            )
-            .order_by(ResearchQueue.id.asc())
-            .all()
-        )
-    ]
+def finalize_research_queue(
+    db: Session,
+    now: datetime,
+    city_ids: Optional[set[int]] = None,
+) -> int:
+    q = db.query(ResearchQueue.id).filter(
+        ResearchQueue.status == "researching",
+        ResearchQueue.finishes_at <= now,
+    )
+    if city_ids is not None:
+        q = q.filter(ResearchQueue.city_id.in_(city_ids))
+    q = q.with_for_update(skip_locked=True)
+    ids = [r[0] for r in q.order_by(ResearchQueue.id.asc()).all()]
 
     finalized = 0
 
@@ -833,25 +1084,144 @@ def finalize_research_queue(db: Session, now: datetime) -> int:
         rq.status = "completed"
         finalized += 1
 
+        push_event(
+            db,
+            "research",
+            city_id=rq.city_id,
+            research_key=rq.research_key,
+            level=int(row.level),
+            at=now,
+        )
+
     return finalized
 
 # ----------------------------
-# Main tick runner
+# Scoped ticking
 # ----------------------------
 
-def tick_all_cities(db: Session, now: datetime) -> Dict[str, object]:
-    cities = db.query(City).all()
+# Above this many cities a scoped tick is no cheaper than a world tick.
+SCOPED_TICK_MAX_CITIES = 500
 
-    # Start from the earliest last_tick_at we have (so event-time stepping is monotonic)
-    start = now
-    for c in cities:
-        if c.last_tick_at and c.last_tick_at < start:
-            start = c.last_tick_at
+ACTIVE_RAID_STATUSES = ("enroute", "returning")
+
+
+def _scope_raids(q, city_ids: Optional[set[int]]):
+    if city_ids is None:
+        return q
+    return q.filter(
+        or_(Raid.attacker_city_id.in_(city_ids), Raid.target_city_id.in_(city_ids))
+    )
+
+
+def _tick_scope_for(db: Session, city_ids) -> set[int]:
+    """
+    Expand the requested cities to everything their events can touch:
+    follow active raids (both directions) until no new counterparty shows up.
+
+    Upgrades, training and research only ever touch their own city, so raids
+    are the only edges. Ticking the whole component in event order gives the
+    same result as a world tick for those cities.
+    """
+    scope = {int(c) for c in city_ids}
+    frontier = set(scope)
+
+    while frontier and len(scope) <= SCOPED_TICK_MAX_CITIES:
+        rows = (
+            db.query(Raid.attacker_city_id, Raid.target_city_id)
+            .filter(
+                Raid.status.in_(ACTIVE_RAID_STATUSES),
+                or_(Raid.attacker_city_id.in_(frontier), Raid.target_city_id.in_(frontier)),
+            )
+            .all()
+        )
+
+        frontier = set()
+        for attacker_id, target_id in rows:
+            for cid in (int(attacker_id), int(target_id)):
+                if cid not in scope:
+                    scope.add(cid)
+                    frontier.add(cid)
+
+    return scope
 
-    current_time = start
+
+def _lock_scope(db: Session, city_ids: set[int]) -> None:
+    """
+    Lock a scoped tick's city rows (SELECT ... FOR UPDATE, id order) before
+    anything is read from them, and reload them. A concurrent tick of the
+    same cities waits here and then starts from what this one committed,
+    instead of both writing back absolute amounts. No-op on SQLite, which
+    serializes writers itself.
+    """
+    (
+        db.query(City)
+        .filter(City.id.in_(sorted(city_ids)))
+        .order_by(City.id)
+        .with_for_update()
+        .populate_existing()
+        .all()
+    )
+
+
+# ----------------------------
+# Main tick runner
+# ----------------------------
+
+def _run_tick(db: Session, now: datetime, city_ids: Optional[set[int]]) -> Dict[str, object]:
+    """
+    Event-ordered tick loop. city_ids=None ticks the whole world; otherwise only
+    those cities (and only events that belong to them) are advanced.
+    """
+    lazy = LAZY_RESOURCES
+    bulk = TICK_BULK_PRODUCTION and not lazy and bulk_production_supported(db)
+
+    if city_ids is not None:
+        _lock_scope(db, city_ids)
 
     total_minutes = 0
     ticked_city_ids: set[int] = set()
+
+    if lazy:
+        # No production writes: events settle the cities they touch
+        # (app/game/resources.py), everything else is derived on read.
+        cities = []  # so the per-city production loop below is empty
+        cities_total = count_cities(db, city_ids)
+        cities_ticked = 0
+        start = earliest_last_tick(db, city_ids) or now
+        if start > now:
+            start = now
+    elif bulk:
+        # Production is one UPDATE per step over the stored rate/cap columns;
+        # no City rows are loaded. Stepping is path-independent (whole minutes
+        # carried forward), so the totals can be taken once up front.
+        cities = []
+        cities_total = count_cities(db, city_ids)
+        start = earliest_last_tick(db, city_ids) or now
+        if start > now:
+            start = now
+        totals = production_totals(db, now, city_ids)
+        total_minutes = totals["minutes"]
+        cities_ticked = totals["cities"]
+    else:
+        # Storage-capped cities (full_at set) are not loaded; events that
+        # un-cap one hand it back through pop_uncapped() below.
+        # Locked in id order like a scoped tick's, so a scoped tick of these
+        # cities can't write absolute amounts underneath this one.
+        q = db.query(City).filter(City.full_at.is_(None))
+        if city_ids is not None:
+            q = q.filter(City.id.in_(city_ids))
+        cities = q.order_by(City.id).with_for_update().populate_existing().all()
+        cities_total = count_cities(db, city_ids)
+
+        # Start from the earliest last_tick_at we have (so event-time stepping is monotonic)
+        start = earliest_last_tick(db, city_ids) or now
+        if start > now:
+            start = now
+
+    producing = {c.id for c in cities}
+
+    current_time = start
+
     upgrades_completed = 0
 
     raids_arrived = 0
@@ -859,36 +1229,86 @@ def tick_all_cities(db: Session, now: datetime) -> Dict[str, object]:
     training_finalized = 0
     research_finalized = 0
 
+    # Nothing in scope due by `now` (cities.next_event_at): production only,
+    # the event stages and their queries are skipped.
+    events_due = has_due_events(db, now, city_ids)
+    if events_due:
+        events = _load_event_queue(db, now, city_ids)
+    else:
+        events = TickEventQueue(now)
+
     while True:
-        nxt = _next_event_time(db, current_time, now)
+        nxt, kinds = events.pop_next(current_time)
         event_time = nxt if nxt is not None else now
 
-        # Apply city production up to this event_time
-        for c in cities:
-            m = apply_city_tick(c, event_time, db)
-            if m > 0:
-                total_minutes += m
-                ticked_city_ids.add(c.id)
-
-        # Resolve upgrades/raids at this event_time
-        upgrades_completed += _complete_due_upgrades_at(db, event_time)
-
-        raids_arrived += _resolve_arrivals_to_returning_at(db, event_time)
-        raids_returned += _resolve_returns_to_resolved_at(db, event_time)
-        
-        training_finalized += finalize_training_queue(db, event_time)
-        research_finalized += finalize_research_queue(db, event_time)
+        # Apply city production up to this event_time (lazy: nothing to do)
+        if bulk:
+            apply_production_bulk(db, event_time, city_ids)
+        else:
+            if not lazy:
+                for c in pop_uncapped(db):
+                    if c.id not in producing and (city_ids is None or c.id in city_ids):
+                        producing.add(c.id)
+                        cities.append(c)
+
+            for c in cities:
+                if c.full_at is not None:
+                    continue
+                m = apply_city_tick(c, event_time, db)
+                if m > 0:
+                    total_minutes += m
+                    ticked_city_ids.add(c.id)
+
+        # Resolve what is due at this event_time; stages without events are skipped
+        if UPGRADE in kinds:
+            upgrades_completed += _complete_due_upgrades_at(db, event_time, city_ids)
+
+        if RAID_ARRIVAL in kinds:
+            raids_arrived += _resolve_arrivals_to_returning_at(db, event_time, city_ids, events)
+            # returns the arrivals just scheduled at or before this time
+            kinds |= events.pop_due(event_time)
+
+        if RAID_RETURN in kinds:
+            raids_returned += _resolve_returns_to_resolved_at(db, event_time, city_ids)
+
+        if TRAINING in kinds:
+            training_finalized += finalize_training_queue(db, event_time, city_ids)
+        if RESEARCH in kinds:
+            research_finalized += finalize_research_queue(db, event_time, city_ids)
+
+        # Make this step's changes visible to the next step's stage queries;
+        # the session does not autoflush.
+        db.flush()
 
         current_time = event_time
 
         if event_time >= now:
             break
 
+    # The stages only ever lower next_event_at; set it exactly again.
+    if events_due:
+        sync_next_event_at(db, city_ids)
+
+    # Every raid report queued this tick, in one executemany.
+    flush_mail_outbox(db)
+
+    # Catch-up checkpoint, committed together with the tick it records
+    if city_ids is None:
+        advance_world_clock(db, now)
+
     db.commit()
 
+    # Warm the governor bonus cache (used by routes) with one query, from
+    # committed state, whenever a world tick finds it incomplete.
+    if city_ids is None and GOVERNOR_PRELOAD_ON_TICK and not governor_cache_complete():
+        preload_governor_bonuses(db)
+
+    if not (bulk or lazy):
+        cities_ticked = len(ticked_city_ids)
+
     return {
-        "cities_total": len(cities),
-        "cities_ticked": len(ticked_city_ids),  # unique cities that had minutes applied
+        "cities_total": cities_total,
+        "cities_ticked": cities_ticked,  # unique cities that had minutes applied
         "minutes_applied_total": total_minutes,
         "upgrades_completed": upgrades_completed,
         "raids_arrived": raids_arrived,
@@ -897,3 +1317,149 @@ def tick_all_cities(db: Session, now: datetime) -> Dict[str, object]:
         "research_finalized": research_finalized,
         "at": now.isoformat(),
     }
+
+
+_SLICE_TOTALS = (
+    "minutes_applied_total",
+    "upgrades_completed",
+    "raids_arrived",
+    "raids_returned",
+    "training_finalized",
+    "research_finalized",
+)
+
+
+def _next_slice_end(
+    db: Session,
+    clock: datetime,
+    now: datetime,
+    slice_minutes: int,
+    slice_events: int,
+) -> datetime:
+    """
+    End of the catch-up slice after `clock`: at most `slice_events` pending
+    events and `slice_minutes` of simulated time, counted from the first event
+    due after the clock (production alone is one step however long the
+    stretch, so idle time is skipped in a single slice). 0 = no bound.
+    """
+    first = nth_due_after(db, clock, now)
+    if first is None:
+        return now
+
+    end = now
+    if slice_minutes > 0:
+        end = min(end, first + timedelta(minutes=slice_minutes))
+    if slice_events > 0:
+        nth = nth_due_after(db, clock, end, slice_events)
+        if nth is not None:
+            end = nth
+    return end
+
+
+def catch_up_world(
+    db: Session,
+    now: datetime,
+    *,
+    slice_minutes: int = TICK_SLICE_MINUTES,
+    slice_events: int = TICK_SLICE_EVENTS,
+    on_slice=None,
+) -> Dict[str, object]:
+    """
+    Bring the world up to `now` from the world clock in slices, each one an
+    ordinary world tick with its own commit. A crash loses at most the slice
+    in progress; running again resumes from the last committed slice.
+    on_slice(stats) is called after every slice; returning False stops the
+    catch-up there (stats["stopped"]), e.g. once the tick lease is lost.
+    """
+    clock = world_clock(db) or earliest_last_tick(db, None) or now
+
+    totals = {key: 0 for key in _SLICE_TOTALS}
+    slices = 0
+    stopped = False
+    while True:
+        end = _next_slice_end(db, clock, now, int(slice_minutes), int(slice_events))
+        stats = _run_tick(db, end, None)
+        slices += 1
+        for key in _SLICE_TOTALS:
+            totals[key] += int(stats[key])
+
+        clock = end
+        if end >= now:
+            if on_slice is not None:
+                on_slice(stats)
+            break
+        if on_slice is not None and on_slice(stats) is False:
+            stopped = True
+            break
+
+    stats.update(totals)
+    stats["slices"] = slices
+    stats["stopped"] = stopped
+    return stats
+
+
+def tick_all_cities(db: Session, now: datetime, *, catch_up: bool = True, on_slice=None) -> Dict[str, object]:
+    """
+    World tick. After downtime (world clock more than TICK_SLICE_MINUTES
+    behind) and with catch_up, it runs as a sliced catch-up instead of one
+    long transaction (on_slice as in catch_up_world).
+    Takes no lease: the ticker and request paths go through tick_world_leased.
+    """
+    if catch_up and TICK_SLICE_MINUTES > 0:
+        clock = world_clock(db)
+        if clock is not None and now - clock > timedelta(minutes=TICK_SLICE_MINUTES):
+            return catch_up_world(db, now, on_slice=on_slice)
+    return _run_tick(db, now, None)
+
+
+def _renew_lease(db: Session, _stats) -> bool:
+    # after each catch-up slice; False (lease lost) stops the catch-up
+    return try_acquire_lease(db, datetime.utcnow())
+
+
+def tick_world_leased(
+    db: Session,
+    now: datetime,
+    hold_until: datetime,
+    *,
+    catch_up: bool = False,
+) -> Optional[Dict[str, object]]:
+    """
+    World tick under the world tick lease (TICK_LEASE_ENABLED), kept until
+    `hold_until` afterwards; the ticker, tick-on-read and POST /game/tick all
+    come through here, so no two world ticks overlap. Returns None, ticking
+    nothing, when another process holds the lease.
+
+    Only the ticker passes catch_up: a request never runs a sliced catch-up.
+    Each slice renews the lease, and a catch-up that lost it stops after the
+    slice it committed.
+    """
+    if TICK_LEASE_ENABLED and not try_acquire_lease(db, now):
+        return None
+    try:
+        on_slice = (lambda stats: _renew_lease(db, stats)) if TICK_LEASE_ENABLED else None
+        return tick_all_cities(db, now, catch_up=catch_up, on_slice=on_slice)
+    finally:
+        if TICK_LEASE_ENABLED:
+            release_lease(db, hold_until)
+
+
+def tick_cities(db: Session, now: datetime, city_ids) -> Optional[Dict[str, object]]:
+    """
+    Scoped tick: bring only the given cities (plus their raid counterparties)
+    up to `now`. Returns None, ticking nothing, when the scope grows past
+    SCOPED_TICK_MAX_CITIES: the caller runs a world tick instead, under the
+    tick lease (routes/tick_util.tick_world_now).
+    """
+    ids = {int(c) for c in city_ids}
+    if not has_due_events(db, now, ids):
+        # Nothing due for these cities, so no raid pulls in a counterparty.
+        scope = ids
+    else:
+        scope = _tick_scope_for(db, ids)
+    if len(scope) > SCOPED_TICK_MAX_CITIES:
+        return None
+
+    result = _run_tick(db, now, scope)
+    result["scope"] = sorted(scope)
+    return result
@@ -0,0 +1,124 @@
+# app/game/tick_lease.py
+"""
+Cross-process tick lease.
+
+With `uvicorn --workers N` (or a separate ticker process) every process has its
+own throttle globals, so without coordination each one ticks the world. The
+lease is a row in `tick_leases`:
+
+- claim:   conditional UPDATE (free, expired, or already ours) -> rowcount 1 wins
+- hold:    expires_at = now + TICK_LEASE_TTL_SECONDS while the tick runs
+           (crash guard: a dead holder's lease simply expires)
+- release: expires_at = end of the throttle window, so the other workers keep
+           skipping until the window is over
+
+Claims run on their own short connection and commit immediately, independent
+of the caller's session.
+"""
+from __future__ import annotations
+
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import TICK_LEASE_TTL_SECONDS
+from app.models.tick_lease import TickLease
+
+WORLD_LEASE = "world"
+
+HOLDER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# Per-process counters (exposed by GET /game/tick/lease)
+LEASE_METRICS: Dict[str, object] = {
+    "attempts": 0,
+    "acquired": 0,
+    "skipped": 0,
+    "errors": 0,
+    "last_acquired_at": None,
+}
+
+
+def _engine(db: Session):
+    return db.get_bind().engine
+
+
+def try_acquire_lease(db: Session, now: datetime, name: str = WORLD_LEASE) -> bool:
+    """True if this process now holds the lease (and should tick)."""
+    LEASE_METRICS["attempts"] += 1
+    expires = now + timedelta(seconds=TICK_LEASE_TTL_SECONDS)
+
+    try:
+        with _engine(db).begin() as conn:
+            res = conn.execute(
+                update(TickLease)
+                .where(
+                    TickLease.name == name,
+                    or_(
+                        TickLease.holder.is_(None),
+                        TickLease.expires_at.is_(None),
+                        TickLease.expires_at <= now,
+                        TickLease.holder == HOLDER_ID,
+                    ),
+                )
+                .values(holder=HOLDER_ID, acquired_at=now, expires_at=expires)
+            )
+            acquired = res.rowcount == 1
+
+            if not acquired:
+                exists = conn.execute(select(TickLease.name).where(TickLease.name == name)).first()
+                if exists is None:
+                    conn.execute(
+                        insert(TickLease).values(
+                            name=name, holder=HOLDER_ID, acquired_at=now, expires_at=expires
+                        )
+                    )
+                    acquired = True
+    except IntegrityError:
+        # Another process inserted the row first; it holds the lease.
+        acquired = False
+    except Exception:
+        LEASE_METRICS["errors"] += 1
+        raise
+
+    if acquired:
+        LEASE_METRICS["acquired"] += 1
+        LEASE_METRICS["last_acquired_at"] = now.isoformat()
+    else:
+        LEASE_METRICS["skipped"] += 1
+    return acquired
+
+
+def release_lease(db: Session, hold_until: datetime, name: str = WORLD_LEASE) -> None:
+    """
+    Keep the lease until `hold_until` (end of the throttle window) and then let
+    anyone claim it. Only touches the row if we still hold it.
+    """
+    try:
+        with _engine(db).begin() as conn:
+            conn.execute(
+                update(TickLease)
+                .where(TickLease.name == name, TickLease.holder == HOLDER_ID)
+                .values(expires_at=hold_until)
+            )
+    except Exception:
+        LEASE_METRICS["errors"] += 1
+        raise
+
+
+def lease_status(db: Session, name: str = WORLD_LEASE) -> Dict[str, object]:
+    row: Optional[TickLease] = db.query(TickLease).filter(TickLease.name == name).first()
+    return {
+        "name": name,
+        "holder": row.holder if row else None,
+        "acquired_at": row.acquired_at.isoformat() if row and row.acquired_at else None,
+        "expires_at": row.expires_at.isoformat() if row and row.expires_at else None,
+        "this_process": HOLDER_ID,
+        "held_by_this_process": bool(row and row.holder == HOLDER_ID),
+        "metrics": dict(LEASE_METRICS),
+    }
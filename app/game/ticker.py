@@ -0,0 +1,121 @@
+# app/game/ticker.py
+"""
+Background world ticker.
+
+Advances the world on its own schedule instead of inside read requests:
+wakes at the next due event (upgrade, raid arrival/return, training, research)
+or after TICKER_MAX_SLEEP_SECONDS for plain production, whichever is first.
+
+Runs either inside the API process (started from the FastAPI lifespan when
+TICKER_ENABLED=1 and TICKER_IN_APP=1) or standalone:
+
+    TICKER_ENABLED=1 python -m app.game.ticker
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import TICKER_MAX_SLEEP_SECONDS, TICKER_MIN_SLEEP_SECONDS
+from app.database import SessionLocal
+from app.game.tick import tick_world_leased
+from app.models.city import City
+
+log = logging.getLogger("evony.ticker")
+
+
+def next_due_at(db: Session) -> Optional[datetime]:
+    """
+    Earliest pending event time across all event sources (None if nothing is
+    pending), from the cities.next_event_at index. That column may run early
+    (never late), which at worst wakes the ticker for an empty tick.
+    """
+    return db.query(func.min(City.next_event_at)).scalar()
+
+
+def run_once(now: Optional[datetime] = None) -> Dict[str, object]:
+    """Tick the whole world once with a dedicated session."""
+    now = now or datetime.utcnow()
+    db = SessionLocal()
+    try:
+        stats = tick_world_leased(
+            db, now, now + timedelta(seconds=TICKER_MIN_SLEEP_SECONDS), catch_up=True
+        )
+        if stats is None:
+            # Another ticker process holds the world this window.
+            stats = {"skipped": True, "at": now.isoformat()}
+        nxt = next_due_at(db)
+        stats["next_due_at"] = nxt.isoformat() if nxt else None
+        return stats
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def sleep_seconds(stats: Dict[str, object], now: Optional[datetime] = None) -> float:
+    """How long to wait before the next tick, clamped to [min, max] sleep."""
+    now = now or datetime.utcnow()
+    wait = float(TICKER_MAX_SLEEP_SECONDS)
+
+    nxt = stats.get("next_due_at")
+    if nxt:
+        until = (datetime.fromisoformat(str(nxt)) - now).total_seconds()
+        wait = min(wait, until)
+
+    return max(float(TICKER_MIN_SLEEP_SECONDS), wait)
+
+
+async def run_ticker(stop: asyncio.Event) -> None:
+    """Asyncio loop for the FastAPI lifespan. The tick itself runs in a worker thread."""
+    log.info("ticker started")
+    while not stop.is_set():
+        try:
+            stats = await asyncio.to_thread(run_once)
+            wait = sleep_seconds(stats)
+        except Exception:
+            log.exception("ticker: tick failed")
+            wait = float(TICKER_MAX_SLEEP_SECONDS)
+
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=wait)
+        except asyncio.TimeoutError:
+            pass
+    log.info("ticker stopped")
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    log.info("ticker started (standalone)")
+    try:
+        while True:
+            try:
+                stats = run_once()
+                log.info(
+                    "tick: cities=%s upgrades=%s arrived=%s returned=%s trained=%s researched=%s next=%s",
+                    stats.get("cities_ticked"),
+                    stats.get("upgrades_completed"),
+                    stats.get("raids_arrived"),
+                    stats.get("raids_returned"),
+                    stats.get("training_finalized"),
+                    stats.get("research_finalized"),
+                    stats.get("next_due_at"),
+                )
+                wait = sleep_seconds(stats)
+            except Exception:
+                log.exception("ticker: tick failed")
+                wait = float(TICKER_MAX_SLEEP_SECONDS)
+            time.sleep(wait)
+    except KeyboardInterrupt:
+        log.info("ticker stopped")
+
+
+if __name__ == "__main__":
+    main()
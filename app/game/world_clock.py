@@ -0,0 +1,34 @@
+# app/game/world_clock.py
+"""
+World clock: the time the last committed world tick brought the world to.
+
+Every world tick advances it inside its own transaction (tick._run_tick), so
+after a crash it always names committed state; catch-up resumes from there.
+Scoped ticks don't move it.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.world_clock import WorldClock
+
+WORLD_CLOCK = "world"
+
+
+def world_clock(db: Session, name: str = WORLD_CLOCK) -> Optional[datetime]:
+    return db.execute(select(WorldClock.ticked_to).where(WorldClock.name == name)).scalar()
+
+
+def advance_world_clock(db: Session, at: datetime, name: str = WORLD_CLOCK) -> None:
+    """Move the clock forward to `at` in the caller's transaction (never back)."""
+    res = db.execute(
+        update(WorldClock)
+        .where(WorldClock.name == name, WorldClock.ticked_to < at)
+        .values(ticked_to=at, updated_at=datetime.utcnow())
+    )
+    if res.rowcount == 0 and world_clock(db, name) is None:
+        db.execute(insert(WorldClock).values(name=name, ticked_to=at, updated_at=datetime.utcnow()))
@@ -0,0 +1,182 @@
+# app/game/world_events.py
+"""
+world_events: one row per scheduled piece of work, so finding due work is a
+single range scan over (status, due_at) instead of polling four tables.
+
+  kind           ref_id              city_id    due_at
+  raid_arrival   raids.id            attacker   arrives_at   (enroute)
+  raid_return    raids.id            attacker   returns_at   (returning)
+  upgrade        upgrades.id         city       completes_at (row exists)
+  training       training_queue.id   city       finishes_at  (training)
+  research       research_queue.id   city       finishes_at  (researching)
+
+Rows follow their source rows: an after_flush listener looks at every source
+row inserted, changed (status / due columns) or deleted in the flush and
+- (re)writes its events as pending while the work is scheduled,
+- marks them done once the row has moved on (resolved, completed, deleted).
+The same pass lowers cities.next_event_at (app/game/next_event.py).
+
+Writers that change a source row with a Core UPDATE instead of the ORM
+object must call retire_event() themselves (training cancel does).
+
+Scoped ticks filter on city_id; keying raids by their attacker is enough
+because a scoped tick always covers both sides of an active raid
+(tick._tick_scope_for). Done rows are pruned by app/maintenance.py.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, bindparam, delete, event, insert, inspect, select, update
+from sqlalchemy.orm import Session
+
+from app.game.next_event import lower_next_event_at
+from app.models.raid import Raid
+from app.models.research_queue import ResearchQueue
+from app.models.training_queue import TrainingQueue
+from app.models.upgrade import Upgrade
+from app.models.world_event import WorldEvent
+
+RAID_ARRIVAL = "raid_arrival"
+RAID_RETURN = "raid_return"
+UPGRADE = "upgrade"
+TRAINING = "training"
+RESEARCH = "research"
+
+KINDS = (UPGRADE, RAID_ARRIVAL, RAID_RETURN, TRAINING, RESEARCH)
+
+# source columns whose change can move or end an event
+_WATCHED = {
+    Raid: ("status", "arrives_at", "returns_at"),
+    Upgrade: ("completes_at",),
+    TrainingQueue: ("status", "finishes_at"),
+    ResearchQueue: ("status", "finishes_at"),
+}
+
+_events = WorldEvent.__table__
+
+_same_event = and_(_events.c.kind == bindparam("b_kind"), _events.c.ref_id == bindparam("b_ref_id"))
+
+_DELETE_EVENT = delete(_events).where(_same_event)
+
+_RETIRE_EVENT = (
+    update(_events)
+    .where(_same_event)
+    .where(_events.c.status == "pending")
+    .values(status="done")
+)
+
+# (kind, ref_id, city_id, due_at); due_at None = no longer pending
+SourceEvent = Tuple[str, int, int, Optional[datetime]]
+
+
+def _source_events(obj) -> List[SourceEvent]:
+    if isinstance(obj, Raid):
+        arrives = obj.arrives_at if obj.status == "enroute" else None
+        returns = obj.returns_at if obj.status == "returning" else None
+        return [
+            (RAID_ARRIVAL, obj.id, obj.attacker_city_id, arrives),
+            (RAID_RETURN, obj.id, obj.attacker_city_id, returns),
+        ]
+    if isinstance(obj, Upgrade):
+        return [(UPGRADE, obj.id, obj.city_id, obj.completes_at)]
+    if isinstance(obj, TrainingQueue):
+        due = obj.finishes_at if obj.status == "training" else None
+        return [(TRAINING, obj.id, obj.city_id, due)]
+    if isinstance(obj, ResearchQueue):
+        due = obj.finishes_at if obj.status == "researching" else None
+        return [(RESEARCH, obj.id, obj.city_id, due)]
+    return []
+
+
+def _watched_change(obj) -> bool:
+    attrs = inspect(obj).attrs
+    return any(attrs[name].history.has_changes() for name in _WATCHED[type(obj)])
+
+
+@event.listens_for(Session, "after_flush")
+def _write_world_events(session: Session, _flush_context) -> None:
+    # new / dirty / deleted still describe this flush in after_flush
+    changed = [(obj, False) for obj in session.new if type(obj) in _WATCHED]
+    changed += [
+        (obj, False)
+        for obj in session.dirty
+        if type(obj) in _WATCHED and _watched_change(obj)
+    ]
+    changed += [(obj, True) for obj in session.deleted if type(obj) in _WATCHED]
+    if not changed:
+        return
+
+    pending: List[dict] = []
+    done: List[dict] = []
+    earliest: Dict[int, datetime] = {}
+
+    def lower(city_id, at: datetime) -> None:
+        if city_id is not None and (city_id not in earliest or at < earliest[city_id]):
+            earliest[int(city_id)] = at
+
+    for obj, deleted in changed:
+        for kind, ref_id, city_id, due_at in _source_events(obj):
+            key = {"b_kind": kind, "b_ref_id": int(ref_id)}
+            if deleted or due_at is None:
+                done.append(key)
+                continue
+
+            pending.append({**key, "due_at": due_at, "city_id": int(city_id)})
+            lower(city_id, due_at)
+            if kind == RAID_ARRIVAL:
+                lower(obj.target_city_id, due_at)
+
+    conn = session.connection()
+    if done:
+        conn.execute(_RETIRE_EVENT, done)
+    if pending:
+        # replace rather than upsert: a reused id (SQLite) may have left a row behind
+        conn.execute(_DELETE_EVENT, [{"b_kind": p["b_kind"], "b_ref_id": p["b_ref_id"]} for p in pending])
+        conn.execute(
+            insert(_events),
+            [
+                {
+                    "due_at": p["due_at"],
+                    "kind": p["b_kind"],
+                    "ref_id": p["b_ref_id"],
+                    "city_id": p["city_id"],
+                    "status": "pending",
+                }
+                for p in pending
+            ],
+        )
+    if earliest:
+        lower_next_event_at(conn, earliest)
+
+
+def retire_event(db: Session, kind: str, ref_id: int) -> None:
+    """Mark an event done after a Core UPDATE moved its source row on."""
+    db.execute(_RETIRE_EVENT, [{"b_kind": str(kind), "b_ref_id": int(ref_id)}])
+
+
+def load_due_events(
+    db: Session,
+    until: datetime,
+    city_ids: Optional[Iterable[int]] = None,
+) -> List[Tuple[datetime, str, int]]:
+    """Every pending (due_at, kind, ref_id) due by `until`, overdue ones included."""
+    q = select(WorldEvent.due_at, WorldEvent.kind, WorldEvent.ref_id).where(
+        WorldEvent.status == "pending",
+        WorldEvent.due_at <= until,
+    )
+    if city_ids is not None:
+        q = q.where(WorldEvent.city_id.in_(sorted(int(c) for c in city_ids)))
+    return [tuple(r) for r in db.execute(q.order_by(WorldEvent.due_at)).all()]
+
+
+def nth_due_after(db: Session, after: datetime, until: datetime, n: int = 1) -> Optional[datetime]:
+    """due_at of the n-th pending event in (after, until], or None if there are fewer."""
+    return db.execute(
+        select(WorldEvent.due_at)
+        .where(WorldEvent.status == "pending", WorldEvent.due_at > after, WorldEvent.due_at <= until)
+        .order_by(WorldEvent.due_at)
+        .offset(max(0, int(n) - 1))
+        .limit(1)
+    ).scalar()
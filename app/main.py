@@ -1,10 +1,19 @@
 # app/main.py
 from __future__ import annotations
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from sqlalchemy import text
 
-from app.database import engine
+from app.config import TICKER_ENABLED, TICKER_IN_APP, SESSION_PRUNE_ENABLED, PUSH_ENABLED
+from app.database import engine, dispose_async_engines
+from app.fast_json import default_response_class
+from app.game.ticker import run_ticker
+from app.maintenance import run_maintenance
+from app.passwords import shutdown_password_pool
+from app.push import run_push_relay
 from app.routes.auth import router as auth_router
 from app.routes.game import router as game_router
 from app.routes.buildings import router as buildings_router
@@ -15,10 +24,37 @@ from app.routes import research
 from app.routes import training
 from app.routes import admin
 from app.routes import heroes
+from app.routes import events
 from fastapi.security import HTTPBearer
 from fastapi.staticfiles import StaticFiles
 
-app = FastAPI(title="Evony-like Server", version="0.2.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    stop = asyncio.Event()
+    tasks = []
+    if TICKER_ENABLED and TICKER_IN_APP:
+        tasks.append(asyncio.create_task(run_ticker(stop)))
+    if SESSION_PRUNE_ENABLED:
+        tasks.append(asyncio.create_task(run_maintenance(stop)))
+    if PUSH_ENABLED:
+        tasks.append(asyncio.create_task(run_push_relay(stop)))
+    try:
+        yield
+    finally:
+        stop.set()
+        for task in tasks:
+            await task
+        await dispose_async_engines()
+        shutdown_password_pool()
+
+
+app = FastAPI(
+    title="Evony-like Server",
+    version="0.2.0",
+    lifespan=lifespan,
+    default_response_class=default_response_class(),
+)
 
 app.include_router(auth_router)
 app.include_router(game_router)
@@ -30,6 +66,8 @@ app.include_router(research.router)
 app.include_router(training.router)
 app.include_router(admin.router)
 app.include_router(heroes.router)
+if PUSH_ENABLED:
+    app.include_router(events.router)
 app.mount("/ui", StaticFiles(directory="app/static", html=True), name="ui")
 
 
@@ -0,0 +1,258 @@
+# app/maintenance.py
+"""
+Periodic housekeeping.
+
+prune_sessions() keeps the `sessions` table (and its unique token index) small:
+
+- expired rows are deleted oldest-first in chunks of SESSION_PRUNE_CHUNK,
+  one short transaction per chunk so request writers aren't blocked
+- users over SESSION_MAX_PER_USER live sessions lose the oldest ones
+- every deleted token is dropped from this process's token cache, and so is
+  everything cached for a capped user; other workers' caches expire within
+  AUTH_CACHE_TTL_SECONDS
+- signed-token revocations (revoked_tokens) go once the token has expired
+
+prune_world_events() deletes world_events rows that are done (resolved,
+completed, cancelled work; see app/game/world_events.py), in the same
+chunks, so the tick's (status, due_at) range scan stays over live rows.
+
+prune_push_events() deletes push_events rows older than
+PUSH_RETENTION_SECONDS; every worker's relay has read them by then.
+
+Runs inside the API process (lifespan task, SESSION_PRUNE_ENABLED=1, every
+SESSION_PRUNE_INTERVAL_SECONDS) or from the command line:
+
+    python -m app.maintenance            # one pass, prints the report
+    python -m app.maintenance --loop     # keep running on the interval
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.config import (
+    PUSH_RETENTION_SECONDS,
+    SESSION_PRUNE_CHUNK,
+    SESSION_MAX_PER_USER,
+    SESSION_PRUNE_INTERVAL_SECONDS,
+)
+from app.database import SessionLocal
+from app.models.push_event import PushEvent
+from app.models.revoked_token import RevokedToken
+from app.models.session import SessionToken
+from app.models.world_event import WorldEvent
+from app.session_cache import forget_token, forget_user
+
+log = logging.getLogger("evony.maintenance")
+
+
+def _delete_in_chunks(db: Session, model, condition, chunk_size: int) -> Dict[str, int]:
+    """Delete `model` rows matching `condition` oldest id first, one transaction per chunk."""
+    chunk_size = max(1, int(chunk_size))
+    deleted = 0
+    chunks = 0
+
+    while True:
+        ids = [
+            int(r[0])
+            for r in db.execute(
+                select(model.id).where(condition).order_by(model.id).limit(chunk_size)
+            ).all()
+        ]
+        if not ids:
+            break
+
+        db.execute(delete(model).where(model.id.in_(ids)))
+        db.commit()
+        deleted += len(ids)
+        chunks += 1
+
+        if len(ids) < chunk_size:
+            break
+
+    return {"deleted": deleted, "chunks": chunks}
+
+
+def _delete_sessions(db: Session, rows: Sequence) -> int:
+    """Delete (id, token) rows, commit, then evict their tokens."""
+    if not rows:
+        return 0
+
+    ids = [int(r[0]) for r in rows]
+    db.execute(delete(SessionToken).where(SessionToken.id.in_(ids)))
+    db.commit()
+
+    for r in rows:
+        forget_token(r[1])
+    return len(ids)
+
+
+def _prune_expired(db: Session, now: datetime, chunk_size: int) -> Dict[str, int]:
+    deleted = 0
+    chunks = 0
+
+    # deleted rows drop out of the next chunk, so no cursor is needed
+    while True:
+        rows = db.execute(
+            select(SessionToken.id, SessionToken.token)
+            .where(SessionToken.expires_at <= now)
+            .order_by(SessionToken.expires_at, SessionToken.id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            break
+
+        deleted += _delete_sessions(db, rows)
+        chunks += 1
+
+        if len(rows) < chunk_size:
+            break
+
+    return {"deleted": deleted, "chunks": chunks}
+
+
+def _prune_over_cap(db: Session, max_per_user: int, chunk_size: int) -> Dict[str, int]:
+    """Keep each user's newest `max_per_user` sessions (expired ones are already gone)."""
+    users: List[int] = [
+        int(uid)
+        for (uid,) in db.execute(
+            select(SessionToken.user_id)
+            .group_by(SessionToken.user_id)
+            .having(func.count(SessionToken.id) > max_per_user)
+        ).all()
+    ]
+
+    deleted = 0
+    chunks = 0
+    for uid in users:
+        while True:
+            rows = db.execute(
+                select(SessionToken.id, SessionToken.token)
+                .where(SessionToken.user_id == uid)
+                .order_by(SessionToken.created_at.desc(), SessionToken.id.desc())
+                .offset(max_per_user)
+                .limit(chunk_size)
+            ).all()
+            if not rows:
+                break
+
+            deleted += _delete_sessions(db, rows)
+            chunks += 1
+
+            if len(rows) < chunk_size:
+                break
+
+        forget_user(uid)
+
+    return {"deleted": deleted, "chunks": chunks, "users": len(users)}
+
+
+def prune_sessions(
+    db: Session,
+    now: Optional[datetime] = None,
+    *,
+    chunk_size: int = SESSION_PRUNE_CHUNK,
+    max_per_user: int = SESSION_MAX_PER_USER,
+) -> Dict[str, object]:
+    """Delete expired sessions and revocations, then enforce the per-user cap. Returns a report."""
+    now = now or datetime.utcnow()
+    chunk_size = max(1, int(chunk_size))
+    started = time.perf_counter()
+
+    expired = _prune_expired(db, now, chunk_size)
+
+    over_cap = {"deleted": 0, "chunks": 0, "users": 0}
+    if max_per_user > 0:
+        over_cap = _prune_over_cap(db, int(max_per_user), chunk_size)
+
+    revoked = _delete_in_chunks(db, RevokedToken, RevokedToken.expires_at <= now, chunk_size)
+
+    remaining = int(db.execute(select(func.count(SessionToken.id))).scalar() or 0)
+
+    return {
+        "at": now.isoformat(),
+        "expired_deleted": expired["deleted"],
+        "over_cap_deleted": over_cap["deleted"],
+        "over_cap_users": over_cap["users"],
+        "revocations_deleted": revoked["deleted"],
+        "chunks": expired["chunks"] + over_cap["chunks"] + revoked["chunks"],
+        "sessions_remaining": remaining,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def prune_world_events(db: Session, *, chunk_size: int = SESSION_PRUNE_CHUNK) -> Dict[str, int]:
+    """Delete done world_events rows, one transaction per chunk."""
+    done = _delete_in_chunks(db, WorldEvent, WorldEvent.status == "done", chunk_size)
+    return {"world_events_deleted": done["deleted"], "world_events_chunks": done["chunks"]}
+
+
+def prune_push_events(
+    db: Session,
+    now: Optional[datetime] = None,
+    *,
+    chunk_size: int = SESSION_PRUNE_CHUNK,
+) -> Dict[str, int]:
+    """Delete push_events rows older than PUSH_RETENTION_SECONDS, one transaction per chunk."""
+    cutoff = (now or datetime.utcnow()) - timedelta(seconds=PUSH_RETENTION_SECONDS)
+    old = _delete_in_chunks(db, PushEvent, PushEvent.created_at < cutoff, chunk_size)
+    return {"push_events_deleted": old["deleted"], "push_events_chunks": old["chunks"]}
+
+
+def run_once() -> Dict[str, object]:
+    db = SessionLocal()
+    try:
+        report = prune_sessions(db)
+        report.update(prune_world_events(db))
+        report.update(prune_push_events(db))
+        return report
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def run_maintenance(stop: asyncio.Event) -> None:
+    """Asyncio loop for the FastAPI lifespan; each pass runs in a worker thread."""
+    log.info("maintenance started")
+    while not stop.is_set():
+        try:
+            report = await asyncio.to_thread(run_once)
+            log.info("maintenance pass: %s", report)
+        except Exception:
+            log.exception("maintenance: prune failed")
+
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=float(SESSION_PRUNE_INTERVAL_SECONDS))
+        except asyncio.TimeoutError:
+            pass
+    log.info("maintenance stopped")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prune expired / excess sessions, done world events and old push events")
+    parser.add_argument("--loop", action="store_true", help="repeat every SESSION_PRUNE_INTERVAL_SECONDS")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    try:
+        while True:
+            print(json.dumps(run_once()), flush=True)
+            if not args.loop:
+                break
+            time.sleep(float(SESSION_PRUNE_INTERVAL_SECONDS))
+    except KeyboardInterrupt:
+        log.info("maintenance stopped")
+
+
+if __name__ == "__main__":
+    main()
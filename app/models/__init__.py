@@ -15,3 +15,12 @@ from app.models.hero_assignment import HeroAssignment
 # Research
 from app.models.research import Research
 from app.models.research_queue import ResearchQueue
+
+# Tick coordination
+from app.models.tick_lease import TickLease
+from app.models.world_event import WorldEvent
+from app.models.world_clock import WorldClock
+from app.models.push_event import PushEvent
+
+# Auth
+from app.models.revoked_token import RevokedToken
@@ -54,6 +54,14 @@ class City(Base):
     # Tick system (naive UTC)
     last_tick_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=True)
 
+    # All four stored amounts have sat at their caps since this time; production
+    # skips these rows (NULL = still producing). See app/game/resources.py.
+    full_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, index=True)
+
+    # Earliest pending raid/upgrade/training/research event for this city (never
+    # later than the real one; NULL = nothing pending). See app/game/next_event.py.
+    next_event_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, index=True)
+
     # Production rates (per minute). We'll tie these to buildings later.
     food_rate: Mapped[int] = mapped_column(Integer, default=30, nullable=False)
     wood_rate: Mapped[int] = mapped_column(Integer, default=30, nullable=False)
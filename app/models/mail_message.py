@@ -2,12 +2,17 @@
 from __future__ import annotations
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, Text, DateTime
+from sqlalchemy import Column, Index, Integer, Text, DateTime
 from app.database import Base
 
 
 class MailMessage(Base):
     __tablename__ = "mail_messages"
+    __table_args__ = (
+        # Inbox / unread queries: user_id = ? [AND is_read = 0] [AND kind = ?] ORDER BY id DESC
+        Index("ix_mail_messages_user_read", "user_id", "is_read", "id"),
+        Index("ix_mail_messages_user_kind", "user_id", "kind", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, index=True, nullable=False)
@@ -17,6 +22,6 @@ class MailMessage(Base):
     body = Column(Text, nullable=False)
     payload_json = Column(Text, nullable=True) # optional JSON string
 
-    is_read = Column(Integer, nullable=False, default=0)  # 0/1 for sqlite
+    is_read = Column(Integer, nullable=False, default=0)  # 0/1 (portable across sqlite/postgres)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     read_at = Column(DateTime, nullable=True)
@@ -0,0 +1,24 @@
+# app/models/push_event.py
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class PushEvent(Base):
+    """
+    Outbox for UI push events: written in the transaction that produced them
+    and tailed by every API worker with an open socket (app/push.py).
+    """
+    __tablename__ = "push_events"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True, nullable=False)
+
+    # the event as sent to the socket (JSON, carries city_id or user_id)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)
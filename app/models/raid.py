@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, Column
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, Column
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
@@ -11,6 +11,11 @@ from app.database import Base
 
 class Raid(Base):
     __tablename__ = "raids"
+    __table_args__ = (
+        # Tick stages: due arrivals / returns (status = ? AND <time> <= ?)
+        Index("ix_raids_status_arrives_at", "status", "arrives_at"),
+        Index("ix_raids_status_returns_at", "status", "returns_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Integer, String, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -13,6 +13,7 @@ class ResearchQueue(Base):
     __tablename__ = "research_queue"
     __table_args__ = (
         UniqueConstraint("city_id", name="uq_research_queue_one_per_city"),
+        Index("ix_research_queue_status_finishes_at", "status", "finishes_at"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
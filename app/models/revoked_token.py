@@ -0,0 +1,25 @@
+# app/models/revoked_token.py
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class RevokedToken(Base):
+    """
+    A signed token logged out before its expiry (signed tokens have no
+    sessions row to delete). Checked on a token cache miss; pruned by
+    app/maintenance.py once the token would have expired anyway.
+    """
+    __tablename__ = "revoked_tokens"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    # sha256 hex of the token, so the table never holds a usable credential
+    token_hash: Mapped[str] = mapped_column(String(64), unique=True, index=True, nullable=False)
+
+    expires_at: Mapped[datetime] = mapped_column(DateTime, index=True, nullable=False)
@@ -0,0 +1,25 @@
+# app/models/tick_lease.py
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class TickLease(Base):
+    """
+    Shared lease so only one process (uvicorn worker / ticker) ticks the world
+    per window. One row per lease name; claimed with a conditional UPDATE.
+    """
+    __tablename__ = "tick_leases"
+
+    name: Mapped[str] = mapped_column(String(40), primary_key=True)
+
+    # "<hostname>:<pid>:<random>" of the current holder (NULL = free)
+    holder: Mapped[str | None] = mapped_column(String(120), nullable=True)
+
+    acquired_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    expires_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from sqlalchemy import Integer, String, DateTime, ForeignKey
+from sqlalchemy import Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
@@ -10,6 +10,9 @@ from app.database import Base
 
 class TrainingQueue(Base):
     __tablename__ = "training_queue"
+    __table_args__ = (
+        Index("ix_training_queue_status_finishes_at", "status", "finishes_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     city_id: Mapped[int] = mapped_column(Integer, ForeignKey("cities.id"), index=True, nullable=False)
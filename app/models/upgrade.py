@@ -26,4 +26,4 @@ class Upgrade(Base):
     to_level: Mapped[int] = mapped_column(Integer, nullable=False)
 
     started_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
-    completes_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    completes_at: Mapped[datetime] = mapped_column(DateTime, index=True, nullable=False)
@@ -0,0 +1,22 @@
+# app/models/world_clock.py
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class WorldClock(Base):
+    """
+    Checkpoint of how far the world tick has advanced. One row per clock
+    name, written in the same transaction as the tick it records.
+    """
+    __tablename__ = "world_clock"
+
+    name: Mapped[str] = mapped_column(String(40), primary_key=True)
+
+    ticked_to: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    updated_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
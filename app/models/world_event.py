@@ -0,0 +1,34 @@
+# app/models/world_event.py
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class WorldEvent(Base):
+    """
+    One scheduled piece of game work (raid arrival / return, upgrade,
+    training, research). Written from the source rows by
+    app/game/world_events.py; the tick reads pending rows by due_at.
+    """
+    __tablename__ = "world_events"
+    __table_args__ = (
+        UniqueConstraint("kind", "ref_id", name="uq_world_events_kind_ref"),
+        Index("ix_world_events_status_due_at", "status", "due_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    due_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    kind: Mapped[str] = mapped_column(String(16), nullable=False)
+    ref_id: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # owning city (a raid's attacker), for scoped ticks
+    city_id: Mapped[int] = mapped_column(ForeignKey("cities.id"), index=True, nullable=False)
+
+    # pending | done
+    status: Mapped[str] = mapped_column(String(16), default="pending", nullable=False)
@@ -0,0 +1,127 @@
+# app/passwords.py
+"""
+Password hashing off the event loop and the request threadpool.
+
+pbkdf2 is pure CPU, so hashing/verifying runs on a small dedicated
+ProcessPoolExecutor (PASSWORD_HASH_WORKERS processes; 0 = a worker thread).
+Admission is bounded twice: PASSWORD_MAX_PER_IP concurrent hashes per client
+address and PASSWORD_MAX_PENDING overall; anything beyond that gets a 429
+instead of queueing behind a login storm.
+
+PASSWORD_PBKDF2_ROUNDS tunes the work factor. Hashes below it are
+re-hashed on the next successful login (see verify_password).
+"""
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.config import (
+    PASSWORD_PBKDF2_ROUNDS,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_MAX_PER_IP,
+    PASSWORD_MAX_PENDING,
+)
+
+
+def _make_context() -> CryptContext:
+    # Pi-friendly hashing (no native deps)
+    settings = {}
+    if PASSWORD_PBKDF2_ROUNDS > 0:
+        settings["pbkdf2_sha256__default_rounds"] = PASSWORD_PBKDF2_ROUNDS
+        # older hashes with fewer rounds report needs_update -> rehash on login
+        settings["pbkdf2_sha256__min_rounds"] = PASSWORD_PBKDF2_ROUNDS
+    return CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto", **settings)
+
+
+pwd_context = _make_context()
+
+
+# ----------------------------
+# Worker functions (run in the pool; module-level so they pickle)
+# ----------------------------
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_and_update(password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(password, password_hash)
+
+
+# ----------------------------
+# Pool + admission
+# ----------------------------
+
+_POOL: Optional[Executor] = None
+_PENDING = 0
+_PER_IP: Dict[str, int] = {}
+
+
+def _pool() -> Optional[Executor]:
+    global _POOL
+    if PASSWORD_HASH_WORKERS <= 0:
+        return None
+    if _POOL is None:
+        # spawn: don't fork the server process (threads, open DB connections)
+        _POOL = ProcessPoolExecutor(
+            max_workers=PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _POOL
+
+
+def shutdown_password_pool() -> None:
+    global _POOL
+    if _POOL is not None:
+        _POOL.shutdown(wait=False, cancel_futures=True)
+        _POOL = None
+
+
+@asynccontextmanager
+async def _admit(client_ip: str) -> AsyncIterator[None]:
+    # Only touched from the event loop, so plain counters are enough.
+    global _PENDING
+
+    if _PENDING >= PASSWORD_MAX_PENDING or _PER_IP.get(client_ip, 0) >= PASSWORD_MAX_PER_IP:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many concurrent login attempts, retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+    _PENDING += 1
+    _PER_IP[client_ip] = _PER_IP.get(client_ip, 0) + 1
+    try:
+        yield
+    finally:
+        _PENDING -= 1
+        left = _PER_IP.get(client_ip, 1) - 1
+        if left > 0:
+            _PER_IP[client_ip] = left
+        else:
+            _PER_IP.pop(client_ip, None)
+
+
+async def _run(fn, *args):
+    pool = _pool()
+    if pool is None:
+        return await asyncio.to_thread(fn, *args)
+    return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+
+
+async def hash_password(password: str, client_ip: str) -> str:
+    async with _admit(client_ip):
+        return await _run(_hash, password)
+
+
+async def verify_password(password: str, password_hash: str, client_ip: str) -> Tuple[bool, Optional[str]]:
+    """(ok, new_hash): new_hash is set when the stored hash should be replaced."""
+    async with _admit(client_ip):
+        return await _run(_verify_and_update, password, password_hash)
@@ -0,0 +1,340 @@
+# app/push.py
+"""
+Server push for the UI (GET /ws, see app/routes/events.py).
+
+Game code records events on the Session it is writing with
+push_event(db, event_type, city_id=... | user_id=..., **data). They are
+inserted into push_events in the same transaction when that session commits
+(a rollback drops them), so an event exists iff the change it describes does,
+whichever process ticked.
+
+Every API worker runs a relay (run_push_relay, lifespan task): while the
+worker has an open socket it reads new push_events rows every
+PUSH_RELAY_INTERVAL_SECONDS and hands them to its HUB, which routes city
+events to the sockets of the city's owner and user events (mail) to that
+user's sockets. The same pass sends a "resources" snapshot for each watched
+city whose totals changed since the last one.
+
+Events recorded by the tick:
+  raid       status transitions (arrived -> returning, returned -> resolved)
+  upgrade    building upgrade completed
+  training   training batch completed
+  research   research level completed
+  mail       new message (app/game/mailbox.py)
+
+Slow clients whose queue fills (PUSH_QUEUE_SIZE) get a single "resync"
+message instead of the dropped events. Old rows are deleted by
+app/maintenance.py (PUSH_RETENTION_SECONDS).
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.config import (
+    LAZY_RESOURCES,
+    PUSH_ENABLED,
+    PUSH_QUEUE_SIZE,
+    PUSH_RELAY_INTERVAL_SECONDS,
+)
+from app.database import ReadSessionLocal
+from app.game.resources import elapsed_minutes, project
+from app.models.city import City
+from app.models.push_event import PushEvent
+
+log = logging.getLogger("evony.push")
+
+_INFO_KEY = "push_events"
+
+
+class Subscriber:
+    """One open socket: its queue lives on the event loop that serves it."""
+
+    def __init__(self, user_id: int, city_ids: Iterable[int], loop: asyncio.AbstractEventLoop):
+        self.user_id = int(user_id)
+        self.city_ids = {int(c) for c in city_ids}
+        self.loop = loop
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=max(1, PUSH_QUEUE_SIZE))
+        self.overflowed = False
+
+    def _offer(self, message: str) -> None:
+        # runs on self.loop
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def next_message(self) -> str:
+        if self.overflowed and self.queue.empty():
+            self.overflowed = False
+            return json.dumps({"type": "resync"})
+        return await self.queue.get()
+
+
+def _discard(index: Dict[int, Set[Subscriber]], key: int, sub: Subscriber) -> None:
+    subs = index.get(key)
+    if subs is not None:
+        subs.discard(sub)
+        if not subs:
+            del index[key]
+
+
+class PushHub:
+    """Thread-safe fan-out: ticks publish from worker threads, sockets read on the loop."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_user: Dict[int, Set[Subscriber]] = {}
+        self._by_city: Dict[int, Set[Subscriber]] = {}
+
+    def active(self) -> bool:
+        return bool(self._by_user)
+
+    def watched_city_ids(self) -> Set[int]:
+        with self._lock:
+            return set(self._by_city)
+
+    def subscribe(self, sub: Subscriber) -> None:
+        with self._lock:
+            self._by_user.setdefault(sub.user_id, set()).add(sub)
+            for cid in sub.city_ids:
+                self._by_city.setdefault(cid, set()).add(sub)
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        with self._lock:
+            _discard(self._by_user, sub.user_id, sub)
+            for cid in sub.city_ids:
+                _discard(self._by_city, cid, sub)
+
+    def publish(self, events: List[dict]) -> int:
+        """Queue each event for its recipients; returns the number of deliveries."""
+        sent = 0
+        with self._lock:
+            for ev in events:
+                if ev.get("user_id") is not None:
+                    targets = self._by_user.get(int(ev["user_id"]), ())
+                else:
+                    targets = self._by_city.get(int(ev["city_id"]), ())
+
+                if not targets:
+                    continue
+
+                message = json.dumps(ev)
+                for sub in targets:
+                    try:
+                        sub.loop.call_soon_threadsafe(sub._offer, message)
+                        sent += 1
+                    except RuntimeError:
+                        # loop already closed (shutdown); the socket is gone anyway
+                        pass
+        return sent
+
+
+HUB = PushHub()
+
+
+def push_event(
+    db: Session,
+    event_type: str,
+    *,
+    city_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    **data,
+) -> None:
+    """Record an event to publish when `db` commits (city_id or user_id picks the recipients)."""
+    if not PUSH_ENABLED:
+        return
+
+    ev = {"type": str(event_type)}
+    if user_id is not None:
+        ev["user_id"] = int(user_id)
+    else:
+        ev["city_id"] = int(city_id)
+
+    for key, value in data.items():
+        ev[key] = value.isoformat() if isinstance(value, datetime) else value
+
+    db.info.setdefault(_INFO_KEY, []).append(ev)
+
+
+def city_resource_events(db: Session, city_ids: Iterable[int], at: datetime) -> List[dict]:
+    """
+    A "resources" event per city, read from committed rows and, with
+    LAZY_RESOURCES, projected to `at`. One query.
+    """
+    ids = sorted({int(c) for c in city_ids})
+    if not ids:
+        return []
+
+    rows = db.execute(
+        select(
+            City.id, City.food, City.wood, City.stone, City.iron,
+            City.max_food, City.max_wood, City.max_stone, City.max_iron,
+            City.food_rate, City.wood_rate, City.stone_rate, City.iron_rate,
+            City.last_tick_at,
+        ).where(City.id.in_(ids))
+    ).all()
+
+    events = []
+    for r in rows:
+        amounts = {"food": r.food, "wood": r.wood, "stone": r.stone, "iron": r.iron}
+        caps = {"food": r.max_food, "wood": r.max_wood, "stone": r.max_stone, "iron": r.max_iron}
+        if LAZY_RESOURCES:
+            amounts = project(
+                amounts,
+                {"food": r.food_rate, "wood": r.wood_rate, "stone": r.stone_rate, "iron": r.iron_rate},
+                caps,
+                elapsed_minutes(r.last_tick_at, at),
+            )
+
+        events.append({
+            "type": "resources",
+            "city_id": int(r.id),
+            "resources": amounts,
+            "caps": caps,
+            "base_rates_per_min": {
+                "food_rate": r.food_rate,
+                "wood_rate": r.wood_rate,
+                "stone_rate": r.stone_rate,
+                "iron_rate": r.iron_rate,
+            },
+            "at": at.isoformat(),
+        })
+    return events
+
+
+# Ids are handed out before commit, so on PostgreSQL a row can become visible
+# after a higher id was already relayed; re-reading this many ids behind the
+# newest one (and skipping those already sent) catches it.
+_RELAY_LOOKBACK = 500
+_RELAY_BATCH = 1000
+
+
+class PushRelay:
+    """Tails push_events into this process's HUB; one per worker."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.last_id: Optional[int] = None
+        self.sent_ids: Set[int] = set()
+        self.sent_resources: Dict[int, Tuple] = {}
+
+    def prime(self) -> None:
+        """Start from the newest row if idle; a socket calls this before its hello."""
+        with self._lock:
+            if self.last_id is None:
+                db = ReadSessionLocal()
+                try:
+                    self.last_id = int(db.execute(select(func.max(PushEvent.id))).scalar() or 0)
+                finally:
+                    db.close()
+
+    def _new_events(self, db: Session) -> List[dict]:
+        floor = self.last_id - _RELAY_LOOKBACK
+        rows = db.execute(
+            select(PushEvent.id, PushEvent.payload)
+            .where(PushEvent.id > floor)
+            .order_by(PushEvent.id)
+            .limit(_RELAY_BATCH)
+        ).all()
+
+        events = []
+        for row_id, payload in rows:
+            if row_id in self.sent_ids:
+                continue
+            self.sent_ids.add(row_id)
+            events.append(json.loads(payload))
+            self.last_id = max(self.last_id, int(row_id))
+
+        floor = self.last_id - _RELAY_LOOKBACK
+        self.sent_ids = {i for i in self.sent_ids if i > floor}
+        return events
+
+    def _changed_resources(self, db: Session, at: datetime) -> List[dict]:
+        watched = HUB.watched_city_ids()
+        for cid in set(self.sent_resources) - watched:
+            del self.sent_resources[cid]
+
+        changed = []
+        for ev in city_resource_events(db, watched, at):
+            key = (
+                tuple(sorted(ev["resources"].items())),
+                tuple(sorted(ev["caps"].items())),
+                tuple(sorted(ev["base_rates_per_min"].items())),
+            )
+            if self.sent_resources.get(ev["city_id"]) != key:
+                self.sent_resources[ev["city_id"]] = key
+                changed.append(ev)
+        return changed
+
+    def poll(self, at: Optional[datetime] = None) -> int:
+        """One pass; returns the number of deliveries."""
+        with self._lock:
+            if not HUB.active():
+                # nobody listening: the next socket's prime() starts afresh
+                self.last_id = None
+                self.sent_ids.clear()
+                self.sent_resources.clear()
+                return 0
+            if self.last_id is None:
+                return 0
+
+            db = ReadSessionLocal()
+            try:
+                events = self._new_events(db)
+                events += self._changed_resources(db, at or datetime.utcnow())
+            finally:
+                db.close()
+        return HUB.publish(events) if events else 0
+
+
+RELAY = PushRelay()
+RELAY_RUNNING = False
+
+
+def relay_running() -> bool:
+    """True while this process's relay task runs (its sockets hear every worker's ticks)."""
+    return RELAY_RUNNING
+
+
+async def run_push_relay(stop: asyncio.Event) -> None:
+    """Asyncio loop for the FastAPI lifespan; each pass runs in a worker thread."""
+    global RELAY_RUNNING
+    RELAY_RUNNING = True
+    try:
+        while not stop.is_set():
+            try:
+                await asyncio.to_thread(RELAY.poll)
+            except Exception:
+                log.exception("push relay: poll failed")
+
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=float(PUSH_RELAY_INTERVAL_SECONDS))
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        RELAY_RUNNING = False
+
+
+@event.listens_for(Session, "before_commit")
+def _write_outbox(session: Session) -> None:
+    events = session.info.pop(_INFO_KEY, None)
+    if events:
+        session.execute(
+            insert(PushEvent),
+            [{"created_at": datetime.utcnow(), "payload": json.dumps(ev)} for ev in events],
+        )
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_after_rollback(session: Session, _previous_transaction) -> None:
+    session.info.pop(_INFO_KEY, None)
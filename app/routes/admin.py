@@ -24,6 +24,8 @@ from app.game.hero_specialties import (
 )
 from app.game.research_rules import RESEARCH
 from app.game.hero_progression import level_progress
+from app.game.governor import invalidate_governor_cache
+from app.game.resources import settle_city
 
 from app.routes.research import ResearchSetRequest
 from app.routes.cities import TroopsSetPayload
@@ -35,7 +37,7 @@ from app.routes.training import (
     _sum_cost,
     _check_affordable,
 )
-from app.routes.tick_util import tick_world_now
+from app.routes.tick_util import tick_cities_now
 
 router = APIRouter(
     prefix="/admin",
@@ -159,9 +161,10 @@ def train_troops(
     current_user=Depends(get_current_user),
     x_admin_key: str | None = Header(default=None, alias="X-Admin-Key"),
 ) -> dict:
-    tick_world_now(db)
+    now = tick_cities_now(db, [city_id])
 
     city = _get_city_or_404(db, city_id, current_user, x_admin_key)
+    settle_city(city, now)
 
     troops = [t.model_dump() for t in payload.troops]
     if not isinstance(troops, list) or not troops:
@@ -369,6 +372,7 @@ def admin_set_hero(
     db.add(hero)
     db.commit()
     db.refresh(hero)
+    invalidate_governor_cache(hero.city_id)
 
     return {
         "ok": True,
@@ -421,6 +425,7 @@ def admin_update_hero(
 
     db.commit()
     db.refresh(hero)
+    invalidate_governor_cache(hero.city_id)
 
     return {"ok": True, "hero": _hero_to_dict(hero)}
 
@@ -443,6 +448,7 @@ def admin_rename_hero(
     hero.name = payload.name.strip()
     db.commit()
     db.refresh(hero)
+    invalidate_governor_cache(hero.city_id)
 
     return {"ok": True, "hero": _hero_to_dict(hero)}
 
@@ -465,6 +471,7 @@ def admin_delete_hero(
 
     db.delete(hero)
     db.commit()
+    invalidate_governor_cache(deleted["city_id"])
 
     return {
         "ok": True,
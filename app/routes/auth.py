@@ -6,24 +6,37 @@ import secrets
 from datetime import datetime, timedelta
 
 from fastapi.responses import PlainTextResponse
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Header
 from pydantic import BaseModel, Field
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models.building import Building
 from app.models.user import User
 from app.models.city import City
+from app.models.revoked_token import RevokedToken
 from app.models.session import SessionToken
+from app.game.tick import refresh_city_stats
+from app.passwords import hash_password, verify_password
+from app.session_cache import (
+    AuthUser,
+    cached_user,
+    remember_user,
+    forget_token,
+    is_signed_token,
+    issue_signed_token,
+    signed_tokens_enabled,
+    token_hash,
+    verify_signed_token,
+)
 
 bearer_scheme = HTTPBearer()
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-# Pi-friendly hashing (no native deps)
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
-
 SESSION_HOURS = 24
 
 
@@ -73,34 +86,116 @@ def _extract_bearer(authorization: str | None) -> str | None:
     return value
 
 
+def _user_without_lookup(token: str, now: datetime) -> AuthUser | None:
+    """
+    Cache hit -> AuthUser; None means "look it up" (the session row, or for a
+    signed token its revocation). Bad signed tokens are rejected here without
+    touching the database.
+    """
+    if is_signed_token(token):
+        user = verify_signed_token(token, now) if signed_tokens_enabled() else None
+        if user is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+        if user.expires_at <= now:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
+
+    return cached_user(token, now)
+
+
+def _revoked_query(token: str):
+    return select(RevokedToken.id).where(RevokedToken.token_hash == token_hash(token))
+
+
+def _signed_user(token: str, revoked, now: datetime) -> AuthUser:
+    """A signed token already checked by _user_without_lookup, once its revocation is known."""
+    if revoked is not None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    user = verify_signed_token(token, now)
+    remember_user(token, user, now)
+    return user
+
+
+def _remember(token: str, sess: SessionToken, user: User, now: datetime) -> AuthUser:
+    auth_user = AuthUser(id=int(user.id), username=user.username, expires_at=sess.expires_at)
+    remember_user(token, auth_user, now)
+    return auth_user
+
+
 def get_current_user(
     creds: HTTPAuthorizationCredentials = Depends(bearer_scheme),
     db: Session = Depends(get_db),
-) -> User:
+) -> AuthUser:
     token = creds.credentials  # this replaces your header parsing
+    now = _now_utc_naive()
+
+    cached = _user_without_lookup(token, now)
+    if cached is not None:
+        return cached
+
+    if is_signed_token(token):
+        return _signed_user(token, db.execute(_revoked_query(token)).first(), now)
 
     sess = db.query(SessionToken).filter(SessionToken.token == token).first()
     if not sess:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    if sess.expires_at <= _now_utc_naive():
+    if sess.expires_at <= now:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
 
     user = db.query(User).filter(User.id == sess.user_id).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid session user")
 
-    return user
+    return _remember(token, sess, user, now)
 
-@router.post("/register", response_model=RegisterResponse, status_code=status.HTTP_201_CREATED)
-def register(payload: RegisterRequest, db: Session = Depends(get_db)) -> RegisterResponse:
+
+async def get_current_user_async(
+    creds: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> AuthUser:
+    """get_current_user for async routes (same checks, AsyncSession)."""
+    return await user_for_token(db, creds.credentials)
+
+
+async def user_for_token(db: AsyncSession, token: str) -> AuthUser:
+    """Resolve a raw token (the /ws query parameter has no Authorization header)."""
+    now = _now_utc_naive()
+
+    cached = _user_without_lookup(token, now)
+    if cached is not None:
+        return cached
+
+    if is_signed_token(token):
+        return _signed_user(token, (await db.execute(_revoked_query(token))).first(), now)
+
+    sess = (
+        await db.execute(select(SessionToken).where(SessionToken.token == token))
+    ).scalars().first()
+    if not sess:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+    if sess.expires_at <= now:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
+
+    user = await db.get(User, sess.user_id)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid session user")
+
+    return _remember(token, sess, user, now)
+
+def _client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+def _create_account(db: Session, payload: RegisterRequest, password_hash: str) -> RegisterResponse:
+    # re-checked here: another register may have taken the name while hashing
     existing = db.query(User).filter(User.username == payload.username).first()
     if existing:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Username already exists")
 
     user = User(
         username=payload.username,
-        password_hash=pwd_context.hash(payload.password),
+        password_hash=password_hash,
     )
     db.add(user)
     db.flush()
@@ -130,6 +225,10 @@ def register(payload: RegisterRequest, db: Session = Depends(get_db)) -> Registe
 
     for t in starter_types:
         db.add(Building(city_id=city.id, type=t, level=1))
+    db.flush()
+
+    # Column defaults don't match the level-1 building curves
+    refresh_city_stats(db, city)
 
     db.commit()
     db.refresh(user)
@@ -143,15 +242,51 @@ def register(payload: RegisterRequest, db: Session = Depends(get_db)) -> Registe
     )
 
 
+@router.post("/register", response_model=RegisterResponse, status_code=status.HTTP_201_CREATED)
+async def register(
+    payload: RegisterRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+) -> RegisterResponse:
+    existing = (await db.execute(select(User.id).where(User.username == payload.username))).first()
+    if existing:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Username already exists")
+
+    # CPU-bound: runs on the password pool, not the event loop/threadpool
+    password_hash = await hash_password(payload.password, _client_ip(request))
+
+    return await db.run_sync(_create_account, payload, password_hash)
+
+
 @router.post("/login", response_model=LoginResponse)
-def login(payload: LoginRequest, db: Session = Depends(get_db)) -> LoginResponse:
-    user = db.query(User).filter(User.username == payload.username).first()
-    if not user or not pwd_context.verify(payload.password, user.password_hash):
+async def login(
+    payload: LoginRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+) -> LoginResponse:
+    user = (await db.execute(select(User).where(User.username == payload.username))).scalars().first()
+    if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid username or password")
 
-    token = secrets.token_hex(32)
+    ok, new_hash = await verify_password(payload.password, user.password_hash, _client_ip(request))
+    if not ok:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid username or password")
+
+    if new_hash:
+        # stored hash is below the configured work factor: upgrade it now
+        user.password_hash = new_hash
+
     expires_at = _now_utc_naive() + timedelta(hours=SESSION_HOURS)
 
+    if signed_tokens_enabled():
+        # Stateless: nothing to store, get_current_user verifies the HMAC.
+        token = issue_signed_token(int(user.id), user.username, expires_at)
+        if new_hash:
+            await db.commit()
+        return LoginResponse(token=token, expires_at=expires_at)
+
+    token = secrets.token_hex(32)
+
     sess = SessionToken(
         user_id=user.id,
         token=token,
@@ -160,10 +295,47 @@ def login(payload: LoginRequest, db: Session = Depends(get_db)) -> LoginResponse
 
     )
     db.add(sess)
-    db.commit()
+    await db.commit()
 
     return LoginResponse(token=token, expires_at=expires_at)
 
+
+@router.post("/logout")
+def logout(
+    creds: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: Session = Depends(get_db),
+) -> dict:
+    """
+    Ends the session for the bearer token: deletes its session row, or for a
+    signed token records it in revoked_tokens, and drops it from this
+    process's token cache. Other workers notice within AUTH_CACHE_TTL_SECONDS.
+    """
+    token = creds.credentials
+    now = _now_utc_naive()
+
+    deleted = (
+        db.query(SessionToken)
+        .filter(SessionToken.token == token)
+        .delete(synchronize_session=False)
+    )
+
+    revoked = False
+    signed = verify_signed_token(token, now) if signed_tokens_enabled() else None
+    if signed is not None and signed.expires_at > now:
+        revoked = True
+        if db.execute(_revoked_query(token)).first() is None:
+            db.add(RevokedToken(token_hash=token_hash(token), expires_at=signed.expires_at))
+
+    try:
+        db.commit()
+    except IntegrityError:
+        # a concurrent logout of the same token recorded it first
+        db.rollback()
+
+    forget_token(token)
+
+    return {"ok": True, "revoked": bool(deleted) or revoked}
+
 @router.get("/token", response_class=PlainTextResponse)
 def token_for_copy(db: Session = Depends(get_db)):
 
@@ -11,13 +11,15 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
 from app.constants import MAX_LEVEL
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.city import City
 from app.models.building import Building
 from app.models.upgrade import Upgrade
 from app.routes.auth import get_current_user
 
 from app.game.governor import get_city_governor_bonus
+from app.game.tick import refresh_city_stats
+from app.game.resources import resources_at, settle_city
 from app.game.building_rules import (
     normalize_building_type,
     display_building_type,
@@ -73,7 +75,7 @@ class BuildingSetRequest(BaseModel):
 @router.get("/{city_id}/buildings")
 def list_buildings(
     city_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user),
     x_admin_key: str | None = Header(default=None, alias="X-Admin-Key"),
 ) -> dict:
@@ -108,11 +110,13 @@ def list_buildings(
 def preview_upgrade(
     city_id: int,
     building_type: str = Query(default="townhall", min_length=2, max_length=32),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user),
     x_admin_key: str | None = Header(default=None, alias="X-Admin-Key"),
 ) -> dict:
     city = _get_city_or_404(db, city_id, current_user, x_admin_key)
+    # current amounts for the checks, projected without touching the row
+    have = resources_at(city, datetime.utcnow(), ticked=False)
 
     requested = building_type
     canonical = normalize_building_type(requested)
@@ -180,14 +184,14 @@ def preview_upgrade(
 
     # Resource sufficiency breakdown
     insufficient = {}
-    if city.food < cost["food"]:
-        insufficient["food"] = {"need": cost["food"], "have": city.food}
-    if city.wood < cost["wood"]:
-        insufficient["wood"] = {"need": cost["wood"], "have": city.wood}
-    if city.stone < cost["stone"]:
-        insufficient["stone"] = {"need": cost["stone"], "have": city.stone}
-    if city.iron < cost["iron"]:
-        insufficient["iron"] = {"need": cost["iron"], "have": city.iron}
+    if have["food"] < cost["food"]:
+        insufficient["food"] = {"need": cost["food"], "have": have["food"]}
+    if have["wood"] < cost["wood"]:
+        insufficient["wood"] = {"need": cost["wood"], "have": have["wood"]}
+    if have["stone"] < cost["stone"]:
+        insufficient["stone"] = {"need": cost["stone"], "have": have["stone"]}
+    if have["iron"] < cost["iron"]:
+        insufficient["iron"] = {"need": cost["iron"], "have": have["iron"]}
 
     return {
         "allowed": len(insufficient) == 0,
@@ -211,11 +215,12 @@ def preview_upgrade(
 def upgrade_recommendations(
     city_id: int,
     limit: int = 5,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user),
     x_admin_key: str | None = Header(default=None, alias="X-Admin-Key"),
 ) -> dict:
     city = _get_city_or_404(db, city_id, current_user, x_admin_key)
+    have = resources_at(city, datetime.utcnow(), ticked=False)
 
     existing = db.query(Upgrade).filter(Upgrade.city_id == city_id).first()
     if existing:
@@ -252,10 +257,10 @@ def upgrade_recommendations(
         seconds = upgrade_time_seconds(b.type, to_level)
 
         affordable = not (
-            city.food < cost["food"]
-            or city.wood < cost["wood"]
-            or city.stone < cost["stone"]
-            or city.iron < cost["iron"]
+            have["food"] < cost["food"]
+            or have["wood"] < cost["wood"]
+            or have["stone"] < cost["stone"]
+            or have["iron"] < cost["iron"]
         )
 
         item = {
@@ -354,7 +359,16 @@ def admin_set_building_level(
             detail="Building not found"
         )
 
+    # Production so far accrued at the old rates/caps
+    settle_city(city, datetime.utcnow())
+
     building.level = payload.level
+    db.flush()
+
+    # Keep stored rates/caps in sync with the new level (bulk production reads them)
+    refresh_city_stats(db, city)
+    if canonical == "townhall":
+        city.townhall_level = building.level
 
     db.commit()
 
@@ -438,7 +452,8 @@ def start_upgrade(
 
     cost = upgrade_cost(b.type, to_level)
 
-    # Check resources
+    # Check resources (LAZY_RESOURCES: at their current values)
+    settle_city(city, datetime.utcnow())
     if (
         city.food < cost["food"]
         or city.wood < cost["wood"]
@@ -8,21 +8,23 @@ from datetime import datetime, timedelta
 from typing import Optional, Any
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Body, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import update
+from sqlalchemy import select, update
 from pydantic import BaseModel, Field
 
 from app.config import ADMIN_KEY
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models.city import City
-from app.routes.auth import get_current_user
-from app.routes.tick_util import tick_world_now
+from app.routes.auth import get_current_user, get_current_user_async
+from app.routes.tick_util import tick_cities_now, tick_city_if_due
 from app.models.city_troop import CityTroop
 from app.models.troop_type import TroopType
 from app.models.building import Building
 from app.models.training_queue import TrainingQueue
 from app.game.governor import get_city_governor_bonus
 from app.game.tick import _recalc_storage_for_city
+from app.game.resources import resources_at
 
 router = APIRouter(prefix="/cities", tags=["cities"])
 
@@ -157,24 +159,25 @@ def _get_city_production_bonus(db: Session, city_id: int) -> dict:
     }
 
 @router.get("/{city_id}", response_model=CityResponse)
-def get_city(
+async def get_city(
     city_id: int,
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user_async),
     x_admin_key: str | None = Header(default=None, alias="X-Admin-Key"),
 ) -> dict:
-    # Tick world before serving read response (throttled)
-    tick_world_now(db)
+    # Tick before serving the read (throttled) unless nothing is due for this
+    # city; the tick is sync game code, run on the underlying Session.
+    now, ticked = await db.run_sync(lambda s: tick_city_if_due(s, city_id))
 
-    q = db.query(City).filter(City.id == city_id)
+    stmt = select(City).where(City.id == city_id)
     if not _is_admin(x_admin_key):
-        q = q.filter(City.owner_id == current_user.id)
+        stmt = stmt.where(City.owner_id == current_user.id)
 
-    city = q.first()
+    city = (await db.execute(stmt)).scalars().first()
     if not city:
         raise HTTPException(status_code=404, detail="City not found")
 
-    gov = _get_governor_production_bonus(db, int(city.id))
+    gov = await db.run_sync(lambda s: _get_city_production_bonus(s, int(city.id)))
     production_bonus = int(gov["bonus"])
     mult = (100 + production_bonus) / 100.0
 
@@ -183,16 +186,14 @@ def get_city(
     stone_rate = int(city.stone_rate * mult)
     iron_rate = int(city.iron_rate * mult)
 
+    # LAZY_RESOURCES (or no tick): derived from the stored amounts/rates, nothing is written
+    res = resources_at(city, now, ticked=ticked)
+
     return {
         "city_id": city.id,
         "name": city.name,
         "townhall_level": city.townhall_level,
-        "resources": {
-            "food": city.food,
-            "wood": city.wood,
-            "stone": city.stone,
-            "iron": city.iron,
-        },
+        "resources": res,
         "rates_per_min": {
             "food_rate": food_rate,
             "wood_rate": wood_rate,
@@ -212,10 +213,10 @@ def get_city(
             "iron": city.protected_iron,
         },
         "lootable": {
-            "food": max(0, city.food - city.protected_food),
-            "wood": max(0, city.wood - city.protected_wood),
-            "stone": max(0, city.stone - city.protected_stone),
-            "iron": max(0, city.iron - city.protected_iron),
+            "food": max(0, res["food"] - city.protected_food),
+            "wood": max(0, res["wood"] - city.protected_wood),
+            "stone": max(0, res["stone"] - city.protected_stone),
+            "iron": max(0, res["iron"] - city.protected_iron),
         },
 	"governor_bonus": {
     	"hero_id": gov["governor"].id if gov["governor"] else None,
@@ -233,7 +234,7 @@ def get_city_troops(
     x_admin_key: str | None = Header(default=None, alias="X-Admin-Key"),
 ) -> dict:
     # Tick world before serving read response (throttled)
-    tick_world_now(db)
+    tick_cities_now(db, [city_id])
 
     # City access control (same pattern as get_city)
     q = db.query(City).filter(City.id == city_id)
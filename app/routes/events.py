@@ -0,0 +1,87 @@
+# app/routes/events.py
+from __future__ import annotations
+
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import TICKER_ENABLED
+from app.database import get_async_read_db
+from app.models.city import City
+from app.push import HUB, RELAY, Subscriber, relay_running
+from app.routes.auth import user_for_token
+
+router = APIRouter(tags=["events"])
+
+
+async def _pump(websocket: WebSocket, sub: Subscriber) -> None:
+    while True:
+        await websocket.send_text(await sub.next_message())
+
+
+async def _drain(websocket: WebSocket) -> None:
+    # Client messages are ignored; receiving is how a disconnect shows up.
+    while True:
+        await websocket.receive_text()
+
+
+@router.websocket("/ws")
+async def world_updates(
+    websocket: WebSocket,
+    token: str = Query(...),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> None:
+    """
+    Push channel for the UI: tick events for the caller's cities plus new mail,
+    as JSON text frames (see app/push.py). The first frame is
+    {"type": "hello", ...}; a {"type": "resync"} frame means events were
+    dropped and the client should refetch.
+
+    hello's "live" is true when this worker relays every process's events and
+    a ticker advances the world; otherwise the client should keep polling.
+    """
+    try:
+        user = await user_for_token(db, token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    city_ids = (
+        await db.execute(select(City.id).where(City.owner_id == user.id).order_by(City.id))
+    ).scalars().all()
+    # don't hold a pooled connection for the life of the socket
+    await db.close()
+
+    await websocket.accept()
+
+    sub = Subscriber(user.id, city_ids, asyncio.get_running_loop())
+    HUB.subscribe(sub)
+    # events committed from here on reach this socket; hello refetches the rest
+    await asyncio.to_thread(RELAY.prime)
+    tasks = [
+        asyncio.create_task(_pump(websocket, sub)),
+        asyncio.create_task(_drain(websocket)),
+    ]
+    try:
+        await websocket.send_text(
+            json.dumps({
+                "type": "hello",
+                "user_id": user.id,
+                "city_ids": list(city_ids),
+                "live": bool(TICKER_ENABLED and relay_running()),
+            })
+        )
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            exc = task.exception()
+            if exc is not None and not isinstance(exc, WebSocketDisconnect):
+                raise exc
+    except WebSocketDisconnect:
+        pass
+    finally:
+        HUB.unsubscribe(sub)
+        for task in tasks:
+            task.cancel()
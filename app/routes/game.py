@@ -9,7 +9,8 @@ from sqlalchemy.orm import Session
 
 from app.config import ADMIN_KEY
 from app.database import get_db
-from app.game.tick import tick_all_cities
+from app.game.tick import tick_world_leased
+from app.game.tick_lease import lease_status
 from app.routes.auth import get_current_user
 
 router = APIRouter(prefix="/game", tags=["game"])
@@ -32,4 +33,28 @@ def run_tick(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
     now = datetime.utcnow()  # naive UTC (matches our DB)
-    return tick_all_cities(db, now)
+
+    # Same lease as tick-on-read and the ticker: never two world ticks at once
+    stats = tick_world_leased(db, now, now)
+    if stats is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"error": "World tick in progress elsewhere", "lease": lease_status(db)},
+        )
+    return stats
+
+
+@router.get("/tick/lease")
+def tick_lease_status(
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+    x_admin_key: str | None = Header(default=None),
+) -> dict:
+    """
+    Who holds the world tick lease, plus this worker's lease counters
+    (attempts / acquired / skipped / errors).
+    """
+    if x_admin_key != ADMIN_KEY:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+
+    return lease_status(db)
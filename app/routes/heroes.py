@@ -4,12 +4,13 @@ from fastapi import APIRouter, Depends, Header, HTTPException
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.hero import Hero
 from app.routes.auth import get_current_user
 from app.routes.buildings import _get_city_or_404
 from app.game.hero_specialties import calculate_hero_bonuses
 from app.game.hero_progression import level_progress
+from app.game.governor import invalidate_governor_cache
 
 router = APIRouter(
     prefix="/cities",
@@ -43,7 +44,7 @@ class HeroCreateRequest(BaseModel):
 @router.get("/{city_id}/heroes")
 def list_heroes(
     city_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user),
     x_admin_key: str | None = Header(default=None, alias="X-Admin-Key"),
 ) -> dict:
@@ -125,6 +126,7 @@ def assign_governor(
     hero.status = "governor"
 
     db.commit()
+    invalidate_governor_cache(city.id)
     db.refresh(hero)
 
     return {
@@ -140,7 +142,7 @@ def assign_governor(
 @router.get("/{city_id}/governor")
 def get_governor(
     city_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user),
     x_admin_key: str | None = Header(default=None, alias="X-Admin-Key"),
 ) -> dict:
@@ -181,6 +183,7 @@ def remove_governor(
     if hero:
         hero.status = "idle"
         db.commit()
+        invalidate_governor_cache(city.id)
 
     return {"ok": True}
 
@@ -6,12 +6,15 @@ from datetime import datetime
 from typing import Any, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Header, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.config import ADMIN_KEY
-from app.database import get_db
+from app.database import get_db, get_read_db, get_async_read_db
+from app.fast_json import fast_json, json_time
 from app.models.mail_message import MailMessage
-from app.routes.auth import get_current_user
+from app.routes.auth import get_current_user, get_current_user_async
 
 router = APIRouter(prefix="/mail", tags=["mail"])
 
@@ -51,8 +54,8 @@ def _to_dict(m: MailMessage) -> dict:
         "body": m.body,
         "payload": _safe_json_loads(getattr(m, "payload_json", None)),
         "is_read": bool(int(getattr(m, "is_read", 0) or 0)),
-        "created_at": m.created_at.isoformat() if m.created_at else None,
-        "read_at": m.read_at.isoformat() if m.read_at else None,
+        "created_at": json_time(m.created_at),
+        "read_at": json_time(m.read_at),
     }
     return _augment_from_payload(d)
 
@@ -76,9 +79,9 @@ def _resolve_target_user_id(
     return int(requested_user_id)
 
 @router.get("/inbox")
-def inbox(
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+async def inbox(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user=Depends(get_current_user_async),
     x_admin_key: str | None = Header(default=None, alias="X-Admin-Key"),
     limit: int = Query(50, ge=1, le=500),
     unread_only: bool = Query(False),
@@ -101,31 +104,31 @@ def inbox(
         x_admin_key=x_admin_key,
     )
 
-    q = db.query(MailMessage).filter(MailMessage.user_id == int(target_user_id))
+    stmt = select(MailMessage).where(MailMessage.user_id == int(target_user_id))
 
     if unread_only:
-        q = q.filter(MailMessage.is_read == 0)
+        stmt = stmt.where(MailMessage.is_read == 0)
 
     if kind:
-        q = q.filter(MailMessage.kind == kind)
+        stmt = stmt.where(MailMessage.kind == kind)
 
     if before_id is not None:
-        q = q.filter(MailMessage.id < int(before_id))
+        stmt = stmt.where(MailMessage.id < int(before_id))
 
-    msgs = q.order_by(MailMessage.id.desc()).limit(limit).all()
+    msgs = (await db.execute(stmt.order_by(MailMessage.id.desc()).limit(limit))).scalars().all()
 
-    return {
+    return fast_json({
         "messages": [_to_dict(m) for m in msgs],
         "count": len(msgs),
         "next_before_id": (int(msgs[-1].id) if msgs else None),
         "user_id": int(target_user_id),
-    }
+    })
 
 
 @router.get("/unread_count")
-def unread_count(
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+async def unread_count(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user=Depends(get_current_user_async),
     x_admin_key: str | None = Header(default=None, alias="X-Admin-Key"),
     kind: Optional[str] = Query(None),
     user_id: Optional[int] = Query(
@@ -144,25 +147,24 @@ def unread_count(
         x_admin_key=x_admin_key,
     )
 
-    q = (
-        db.query(MailMessage)
-        .filter(MailMessage.user_id == int(target_user_id))
-        .filter(MailMessage.is_read == 0)
+    stmt = (
+        select(func.count(MailMessage.id))
+        .where(MailMessage.user_id == int(target_user_id))
+        .where(MailMessage.is_read == 0)
     )
 
     if kind:
-        q = q.filter(MailMessage.kind == kind)
+        stmt = stmt.where(MailMessage.kind == kind)
 
-    # count() is fine for sqlite here
     return {
         "user_id": int(target_user_id),
         "kind": kind,
-        "unread": int(q.count()),
+        "unread": int((await db.execute(stmt)).scalar() or 0),
     }
 
 @router.get("/summary")
 def summary(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user),
     x_admin_key: str | None = Header(default=None, alias="X-Admin-Key"),
     user_id: Optional[int] = Query(None, ge=1, description="Admin only: view another user's mail summary"),
@@ -195,7 +197,7 @@ def summary(
 
 @router.get("/latest")
 def latest(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user),
     kind: Optional[str] = Query(None),
 ) -> dict:
@@ -212,7 +214,7 @@ def latest(
 @router.get("/{message_id}")
 def read_message(
     message_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user),
     x_admin_key: str | None = Header(default=None, alias="X-Admin-Key"),
 ) -> dict:
@@ -11,11 +11,13 @@ from typing import Any, Optional, List
 from fastapi import APIRouter, Depends, HTTPException, Header
 from fastapi.responses import HTMLResponse
 from pydantic import BaseModel, Field
-from sqlalchemy import case, func
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.config import ADMIN_KEY
-from app.database import get_db
+from app.database import get_db, get_read_db, get_async_db
+from app.fast_json import fast_json, json_time
 from app.models.city import City
 from app.models.raid import Raid
 from app.models.building import Building
@@ -23,10 +25,11 @@ from app.models.troop_type import TroopType
 from app.models.city_troop import CityTroop
 from app.models.raid_troop import RaidTroop
 from app.models.raid_defender_troop import RaidDefenderTroop
-from app.routes.auth import get_current_user
-from app.routes.tick_util import tick_world_now
+from app.routes.auth import get_current_user, get_current_user_async
+from app.routes.tick_util import tick_world_now, tick_cities_now
 from app.game.tick import _recalc_storage_for_city, _lootable, _proportional_take
 from app.game.governor import get_city_governor_bonus
+from app.game.resources import settle_city
 
 router = APIRouter(prefix="/raids", tags=["raids"])
 
@@ -175,6 +178,7 @@ def _advance_to_returning_and_steal(db: Session, raid: Raid, now: datetime) -> N
 
     # Update storage/protected on both
     for c in (attacker, target):
+        settle_city(c, now)
         s = _recalc_storage_for_city(db, c.id)
         c.max_food = s["max_food"]
         c.max_wood = s["max_wood"]
@@ -223,6 +227,15 @@ def _advance_to_returning_and_steal(db: Session, raid: Raid, now: datetime) -> N
 def _now_utc() -> datetime:
     return datetime.utcnow()
 
+def _tick_for_raid(db: Session, raid_id: int) -> datetime:
+    # Scoped tick: only the two cities this raid touches (plus their counterparties)
+    row = (
+        db.query(Raid.attacker_city_id, Raid.target_city_id)
+        .filter(Raid.id == raid_id)
+        .first()
+    )
+    return tick_cities_now(db, list(row) if row else [])
+
 def _distance_tiles(a: City, b: City) -> float:
     dx = (b.x - a.x)
     dy = (b.y - a.y)
@@ -456,7 +469,7 @@ def preview_raid(
     target_city_id: int,
     carry_capacity: int = 1500,
     travel_seconds: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user),
     x_admin_key: str | None = Header(default=None, alias="X-Admin-Key"),
 ) -> dict:
@@ -737,7 +750,7 @@ def recall_raid(
     current_user=Depends(get_current_user),
     x_admin_key: str | None = Header(default=None, alias="X-Admin-Key"),
 ) -> dict:
-    now = tick_world_now(db)
+    now = _tick_for_raid(db, raid_id)
     is_admin = _is_admin(x_admin_key)
 
     # Raid lookup: same pattern as get_raid
@@ -748,7 +761,9 @@ def recall_raid(
              .filter(City.owner_id == current_user.id)
         )
 
-    raid = q.first()
+    # Lock the row (PostgreSQL) so a tick in another worker can't resolve the
+    # arrival at the same time; read the values current under the lock.
+    raid = q.with_for_update(of=Raid).populate_existing().first()
     if not raid:
         raise HTTPException(status_code=404, detail="Raid not found")
 
@@ -844,15 +859,23 @@ def recall_raid(
         },
     }
 @router.get("")
-def list_my_raids(
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+async def list_my_raids(
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user_async),
     x_admin_key: str | None = Header(default=None, alias="X-Admin-Key"),
     status: Optional[str] = None,
     limit: int = 50,
 ) -> dict:
     limit = max(1, min(limit, 500))
-    now = tick_world_now(db)
+
+    # tick is sync game code: run it on the underlying Session
+    if _is_admin(x_admin_key):
+        now = await db.run_sync(tick_world_now)
+    else:
+        my_city_ids = list(
+            (await db.execute(select(City.id).where(City.owner_id == current_user.id))).scalars()
+        )
+        now = await db.run_sync(lambda s: tick_cities_now(s, my_city_ids))
 
     # order: enroute first, then returning, then resolved; newest first within group
     status_rank = case(
@@ -861,24 +884,25 @@ def list_my_raids(
         else_=2,
     )
 
-    q = db.query(Raid)
+    stmt = select(Raid)
 
     if not _is_admin(x_admin_key):
-        q = (
-            q.join(City, City.id == Raid.attacker_city_id)
-             .filter(City.owner_id == current_user.id)
+        stmt = (
+            stmt.join(City, City.id == Raid.attacker_city_id)
+                .where(City.owner_id == current_user.id)
         )
 
     if status:
-        q = q.filter(Raid.status == status)
+        stmt = stmt.where(Raid.status == status)
 
     raids = (
-        q.order_by(status_rank.asc(), Raid.id.desc())
-         .limit(limit)
-         .all()
-    )
+        await db.execute(
+            stmt.order_by(status_rank.asc(), Raid.id.desc())
+                .limit(limit)
+        )
+    ).scalars().all()
 
-    return {
+    return fast_json({
         "raids": [
             {
                 "raid_id": r.id,
@@ -888,10 +912,10 @@ def list_my_raids(
                 "attacker_city_id": r.attacker_city_id,
                 "target_city_id": r.target_city_id,
                 "carry_capacity": r.carry_capacity,
-                "created_at": r.created_at.isoformat() if r.created_at else None,
-                "arrives_at": r.arrives_at.isoformat() if r.arrives_at else None,
-                "returns_at": r.returns_at.isoformat() if r.returns_at else None,
-                "resolved_at": r.resolved_at.isoformat() if r.resolved_at else None,
+                "created_at": json_time(r.created_at),
+                "arrives_at": json_time(r.arrives_at),
+                "returns_at": json_time(r.returns_at),
+                "resolved_at": json_time(r.resolved_at),
                 "time_remaining_seconds": _time_remaining_seconds(now, r),
                 "stolen": {
                     "food": r.stolen_food,
@@ -902,7 +926,7 @@ def list_my_raids(
             }
             for r in raids
         ]
-    }
+    })
 
 def _build_combat_report(
     *,
@@ -914,7 +938,7 @@ def _build_combat_report(
     sort_damage_by_power_lost: bool = True,
     include_outcome_hint: bool = True,
 ) -> dict:
-    now = tick_world_now(db)
+    now = _tick_for_raid(db, raid_id)
     is_admin = _is_admin(x_admin_key)
 
     # --- Raid lookup (admin can view any; normal users must own attacker city) ---
@@ -1283,7 +1307,7 @@ def get_combat_report(
     current_user=Depends(get_current_user),
     x_admin_key: str | None = Header(default=None, alias="X-Admin-Key"),
 ) -> dict:
-    return _build_combat_report(
+    return fast_json(_build_combat_report(
         raid_id=raid_id,
         db=db,
         current_user=current_user,
@@ -1291,7 +1315,7 @@ def get_combat_report(
         include_power_totals_in_main_blocks=True,
         sort_damage_by_power_lost=True,
         include_outcome_hint=True,
-    )
+    ))
 
 @router.get("/{raid_id}/report.html", response_class=HTMLResponse)
 def get_combat_report_html(
@@ -1468,7 +1492,7 @@ def get_raid(
     current_user=Depends(get_current_user),
     x_admin_key: str | None = Header(default=None, alias="X-Admin-Key"),
 ) -> dict:
-    now = tick_world_now(db)
+    now = _tick_for_raid(db, raid_id)
 
     is_admin = _is_admin(x_admin_key)
 
@@ -8,8 +8,9 @@ from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from app.game.governor import get_city_governor_bonus
+from app.game.resources import resources_at, settle_city
 from app.constants import MAX_LEVEL
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.building import Building
 from app.models.city import City
 from app.models.research import Research
@@ -40,7 +41,7 @@ class ResearchSetRequest(BaseModel):
 @router.get("/{city_id}/research")
 def list_research(
     city_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user),
     x_admin_key: str | None = Header(default=None, alias="X-Admin-Key"),
 ) -> dict:
@@ -90,6 +91,8 @@ def preview_research(
     x_admin_key: str | None = Header(default=None, alias="X-Admin-Key"),
 ) -> dict:
     city = _get_city_or_404(db, city_id, current_user, x_admin_key)
+    # current amounts for the checks, projected without touching the row
+    have = resources_at(city, datetime.utcnow(), ticked=False)
 
     key = payload.research_key.strip().lower()
 
@@ -170,10 +173,10 @@ def preview_research(
     )
 
     have_resources = (
-        city.food >= cost["food"]
-        and city.wood >= cost["wood"]
-        and city.stone >= cost["stone"]
-        and city.iron >= cost["iron"]
+        have["food"] >= cost["food"]
+        and have["wood"] >= cost["wood"]
+        and have["stone"] >= cost["stone"]
+        and have["iron"] >= cost["iron"]
     )
 
     return {
@@ -194,21 +197,22 @@ def preview_research(
             "research_speed_bonus": research_bonus,
         },
         "resources": {
-            "food": city.food,
-            "wood": city.wood,
-            "stone": city.stone,
-            "iron": city.iron,
+            "food": have["food"],
+            "wood": have["wood"],
+            "stone": have["stone"],
+            "iron": have["iron"],
         },
     }
 
 @router.get("/{city_id}/research/recommendations")
 def research_recommendations(
     city_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user),
     x_admin_key: str | None = Header(default=None, alias="X-Admin-Key"),
 ) -> dict:
     city = _get_city_or_404(db, city_id, current_user, x_admin_key)
+    have = resources_at(city, datetime.utcnow(), ticked=False)
 
     building_levels = {
         b.type: b.level
@@ -255,10 +259,10 @@ def research_recommendations(
         seconds = research_time_seconds(key, to_level)
 
         have_resources = (
-            city.food >= cost["food"]
-            and city.wood >= cost["wood"]
-            and city.stone >= cost["stone"]
-            and city.iron >= cost["iron"]
+            have["food"] >= cost["food"]
+            and have["wood"] >= cost["wood"]
+            and have["stone"] >= cost["stone"]
+            and have["iron"] >= cost["iron"]
         )
 
         recommendations.append(
@@ -325,6 +329,8 @@ def start_research(
     x_admin_key: str | None = Header(default=None, alias="X-Admin-Key"),
 ) -> dict:
     city = _get_city_or_404(db, city_id, current_user, x_admin_key)
+    # LAZY_RESOURCES: check/spend against current amounts
+    settle_city(city, datetime.utcnow())
 
     key = payload.research_key.strip().lower()
 
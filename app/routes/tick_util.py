@@ -1,15 +1,26 @@
 # app/routes/tick_util.py
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Tuple
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.config import TICK_ON_READ, TICK_THROTTLE_SECONDS
-from app.game.tick import tick_all_cities
+from app.config import (
+    TICK_ON_READ,
+    TICK_THROTTLE_SECONDS,
+    TICK_SCOPE,
+    TICKER_ENABLED,
+)
+from app.game.tick import tick_cities, tick_world_leased
+from app.models.city import City
 
 _LAST_GLOBAL_TICK_AT: Optional[datetime] = None
 
+# city_id -> last scoped tick time (only used when TICK_SCOPE == "city")
+_LAST_CITY_TICK_AT: dict[int, datetime] = {}
+_LAST_CITY_TICK_MAX_ENTRIES = 10_000
+
 def tick_world_now(db: Session) -> datetime:
     """
     Tick-on-read with global throttle.
@@ -19,7 +30,8 @@ def tick_world_now(db: Session) -> datetime:
 
     now = datetime.utcnow()
 
-    if not TICK_ON_READ:
+    # The background ticker owns world advancement; reads serve ticked state.
+    if not TICK_ON_READ or TICKER_ENABLED:
         return now
 
     if _LAST_GLOBAL_TICK_AT is not None:
@@ -27,6 +39,60 @@ def tick_world_now(db: Session) -> datetime:
         if elapsed < TICK_THROTTLE_SECONDS:
             return now  # throttle hit → skip tick
 
-    tick_all_cities(db, now)
+    # Other workers share the world: only the lease holder ticks this window
+    # (the others skip it too).
+    tick_world_leased(db, now, now + timedelta(seconds=TICK_THROTTLE_SECONDS))
+
     _LAST_GLOBAL_TICK_AT = now
     return now
+
+def tick_cities_now(db: Session, city_ids: Iterable[int]) -> datetime:
+    """
+    Tick-on-read for the cities a request touches.
+    With TICK_SCOPE=world this is just tick_world_now.
+    """
+    if TICK_SCOPE != "city":
+        return tick_world_now(db)
+
+    now = datetime.utcnow()
+
+    if not TICK_ON_READ or TICKER_ENABLED:
+        return now
+
+    ids = {int(c) for c in city_ids}
+    if not ids:
+        return now
+
+    stale = [
+        cid for cid in ids
+        if cid not in _LAST_CITY_TICK_AT
+        or (now - _LAST_CITY_TICK_AT[cid]).total_seconds() >= TICK_THROTTLE_SECONDS
+    ]
+    if not stale:
+        return now  # throttle hit → skip tick
+
+    result = tick_cities(db, now, ids)
+    if result is None:
+        # scope too large: a world tick, through the lease like any other
+        return tick_world_now(db)
+
+    if len(_LAST_CITY_TICK_AT) > _LAST_CITY_TICK_MAX_ENTRIES:
+        _LAST_CITY_TICK_AT.clear()
+    for cid in result.get("scope", ids):
+        _LAST_CITY_TICK_AT[int(cid)] = now
+
+    return now
+
+
+def tick_city_if_due(db: Session, city_id: int) -> Tuple[datetime, bool]:
+    """
+    Tick-on-read for a single city view, skipped when the city has nothing
+    due (cities.next_event_at NULL or in the future): production alone can
+    be projected from the stored columns, see resources_at(..., ticked=False).
+    Returns (now, ticked).
+    """
+    now = datetime.utcnow()
+    next_event_at = db.execute(select(City.next_event_at).where(City.id == int(city_id))).scalar()
+    if next_event_at is None or next_event_at > now:
+        return now, False
+    return tick_cities_now(db, [city_id]), True
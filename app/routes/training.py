@@ -14,13 +14,15 @@ from app.config import ADMIN_KEY
 from app.database import get_db
 from app.models.city import City
 from app.routes.auth import get_current_user
-from app.routes.tick_util import tick_world_now
+from app.routes.tick_util import tick_cities_now
 from app.models.city_troop import CityTroop
 from app.models.troop_type import TroopType
 from app.models.building import Building
 from app.models.training_queue import TrainingQueue
 from app.game.governor import get_city_governor_bonus
+from app.game.resources import settle_city
 from app.game.tick import _recalc_storage_for_city
+from app.game.world_events import TRAINING, retire_event
 
 router = APIRouter(prefix="/cities", tags=["training"])
 
@@ -177,9 +179,11 @@ def train_preview(
     current_user=Depends(get_current_user),
     x_admin_key: str | None = Header(default=None, alias="X-Admin-Key"),
 ) -> dict:
-    tick_world_now(db)
+    now = tick_cities_now(db, [city_id])
 
     city = _get_city_or_404(db, city_id, current_user, x_admin_key)
+    # LAZY_RESOURCES: check/spend against current amounts
+    settle_city(city, now)
 
     troops = [t.model_dump() for t in payload.troops]
     if not isinstance(troops, list) or not troops:
@@ -277,7 +281,7 @@ def get_train_queue(
     current_user=Depends(get_current_user),
     x_admin_key: str | None = Header(default=None, alias="X-Admin-Key"),
 ) -> dict:
-    tick_world_now(db)
+    tick_cities_now(db, [city_id])
     city = _get_city_or_404(db, city_id, current_user, x_admin_key)
 
     q = (
@@ -340,10 +344,10 @@ def cancel_train_queue(
     current_user=Depends(get_current_user),
     x_admin_key: str | None = Header(default=None, alias="X-Admin-Key"),
 ) -> dict:
-    tick_world_now(db)
+    now = tick_cities_now(db, [city_id])
     city = _get_city_or_404(db, city_id, current_user, x_admin_key)
-
-    now = datetime.utcnow()
+    # the refund lands on current amounts (LAZY_RESOURCES)
+    settle_city(city, now)
 
     # Load row first for friendly errors + refund amounts
     tq = (
@@ -374,6 +378,9 @@ def cancel_train_queue(
     if res.rowcount != 1:
         raise HTTPException(status_code=409, detail={"error": "Cancel race lost"})
 
+    # Core UPDATE: the flush listener never sees this row change
+    retire_event(db, TRAINING, int(queue_id))
+
     db.flush()
 
     # Refund (full refund of stored cost)
@@ -426,9 +433,11 @@ def train_queue(
     - Charges resources immediately (deterministic cost stored on each queue row)
     - Troops are granted later by tick() when finishes_at <= now
     """
-    tick_world_now(db)
+    now = tick_cities_now(db, [city_id])
 
     city = _get_city_or_404(db, city_id, current_user, x_admin_key)
+    # LAZY_RESOURCES: check/spend against current amounts
+    settle_city(city, now)
 
     troops = [t.model_dump() for t in payload.troops]
     if not isinstance(troops, list) or not troops:
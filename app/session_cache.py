@@ -0,0 +1,192 @@
+# app/session_cache.py
+"""
+Bearer token -> user resolution without hitting the database every request.
+
+Two layers, both optional (app/config.py):
+
+- cache:  per-process TTL/LRU map token -> (user_id, username, expires_at),
+          filled by get_current_user after the SessionToken/User lookup.
+          Entries live for AUTH_CACHE_TTL_SECONDS at most (and never past the
+          session's own expiry); logout evicts them. The TTL bounds how long
+          another worker keeps accepting a token revoked elsewhere.
+- signed: AUTH_SIGNED_TOKENS=1 issues "s1.<payload>.<hmac>" tokens that carry
+          user_id/username/expiry, so verifying them needs no session lookup.
+          Logout records the token's hash in revoked_tokens; a cache miss
+          checks that table (app/routes/auth.py), so the cache TTL bounds a
+          revoked signed token exactly like an opaque one.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import secrets
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from app.config import (
+    AUTH_CACHE_ENABLED,
+    AUTH_CACHE_TTL_SECONDS,
+    AUTH_CACHE_MAX_ENTRIES,
+    AUTH_SIGNED_TOKENS,
+    AUTH_TOKEN_SECRET,
+)
+
+SIGNED_PREFIX = "s1."
+
+
+@dataclass(frozen=True)
+class AuthUser:
+    """What routes get as current_user (they only read .id)."""
+    id: int
+    username: str
+    expires_at: datetime
+
+
+class TokenCache:
+    """Thread-safe TTL + LRU map (the sync routes run on the threadpool)."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.max_entries = max(1, int(max_entries))
+        self._entries: "OrderedDict[str, Tuple[AuthUser, datetime]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str, now: datetime) -> Optional[AuthUser]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            user, valid_until = entry
+            if valid_until <= now:
+                del self._entries[token]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return user
+
+    def put(self, token: str, user: AuthUser, now: datetime) -> None:
+        valid_until = min(now + self.ttl, user.expires_at)
+        if valid_until <= now:
+            return
+
+        with self._lock:
+            self._entries[token] = (user, valid_until)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def evict(self, token: str) -> None:
+        with self._lock:
+            self._entries.pop(token, None)
+
+    def evict_user(self, user_id: int) -> int:
+        with self._lock:
+            stale = [t for t, (u, _) in self._entries.items() if u.id == int(user_id)]
+            for t in stale:
+                del self._entries[t]
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+TOKEN_CACHE = TokenCache(AUTH_CACHE_TTL_SECONDS, AUTH_CACHE_MAX_ENTRIES)
+
+
+def cached_user(token: str, now: datetime) -> Optional[AuthUser]:
+    if not AUTH_CACHE_ENABLED:
+        return None
+    return TOKEN_CACHE.get(token, now)
+
+
+def remember_user(token: str, user: AuthUser, now: datetime) -> None:
+    if AUTH_CACHE_ENABLED:
+        TOKEN_CACHE.put(token, user, now)
+
+
+def forget_token(token: str) -> None:
+    """Drop a logged-out or deleted token from this process's cache."""
+    TOKEN_CACHE.evict(token)
+
+
+def forget_user(user_id: int) -> int:
+    return TOKEN_CACHE.evict_user(user_id)
+
+
+# ----------------------------
+# Signed tokens
+# ----------------------------
+
+if AUTH_SIGNED_TOKENS and not AUTH_TOKEN_SECRET:
+    raise RuntimeError("AUTH_SIGNED_TOKENS=1 requires AUTH_TOKEN_SECRET")
+
+
+def _secret() -> bytes:
+    return AUTH_TOKEN_SECRET.encode("utf-8")
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _unb64(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: str) -> str:
+    return _b64(hmac.new(_secret(), payload.encode("ascii"), hashlib.sha256).digest())
+
+
+def signed_tokens_enabled() -> bool:
+    return AUTH_SIGNED_TOKENS
+
+
+def is_signed_token(token: str) -> bool:
+    return token.startswith(SIGNED_PREFIX)
+
+
+def issue_signed_token(user_id: int, username: str, expires_at: datetime) -> str:
+    exp = int((expires_at - datetime(1970, 1, 1)).total_seconds())
+    nonce = secrets.token_hex(4)
+    payload = _b64(f"{int(user_id)}:{exp}:{nonce}:{username}".encode("utf-8"))
+    return f"{SIGNED_PREFIX}{payload}.{_sign(payload)}"
+
+
+def verify_signed_token(token: str, now: datetime) -> Optional[AuthUser]:
+    """
+    AuthUser for a well-formed, correctly signed token (expired ones included,
+    so callers can tell "expired" from "invalid"); None otherwise.
+    """
+    if not is_signed_token(token):
+        return None
+
+    try:
+        payload, sig = token[len(SIGNED_PREFIX):].split(".", 1)
+        if not hmac.compare_digest(sig, _sign(payload)):
+            return None
+        user_id, exp, _nonce, username = _unb64(payload).decode("utf-8").split(":", 3)
+        expires_at = datetime(1970, 1, 1) + timedelta(seconds=int(exp))
+    except (TypeError, ValueError):
+        return None
+
+    return AuthUser(id=int(user_id), username=username, expires_at=expires_at)
+
+
+def token_hash(token: str) -> str:
+    """Key for revoked_tokens (the raw token is never stored)."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
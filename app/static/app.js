@@ -3,6 +3,18 @@ let NEXT_BEFORE_ID = null;
 let AUTO_REFRESH = false;
 let AUTO_TIMER = null;
 
+// Server push (/ws). While the socket is open and its hello says it is live,
+// auto-refresh only polls every PUSH_FALLBACK_MS as a safety net; otherwise
+// it polls every POLL_MS.
+const POLL_MS = 5000;
+const PUSH_FALLBACK_MS = 60000;
+let PUSH = null;
+let PUSH_OPEN = false;
+let PUSH_RETRY_MS = 1000;
+let PUSH_RETRY_TIMER = null;
+let LAST_REFRESH_AT = 0;
+let PUSH_REFRESH_TIMER = null;
+
 function el(id) { return document.getElementById(id); }
 
 function normalizeBaseUrl(raw) {
@@ -98,12 +110,14 @@ async function login() {
   TOKEN = data.token;
   saveToken();
   setStatus("loginStatus", `✅ Logged in`);
+  connectPush();
   await refreshAll(true);
 }
 
 function logout() {
   TOKEN = null;
   saveToken();
+  disconnectPush();
   setStatus("loginStatus", "Logged out.");
   setStatus("enqueueStatus", "");
   setStatus("cityStatus", "");
@@ -201,6 +215,7 @@ async function refreshQueue(resetPaging = true) {
 }
 
 async function refreshAll(resetPaging = true) {
+  LAST_REFRESH_AT = Date.now();
   setStatus("cityStatus", "Refreshing...");
   try {
     await refreshCity();
@@ -246,17 +261,108 @@ function setAutoRefresh(on) {
   }
   if (AUTO_REFRESH) {
     AUTO_TIMER = setInterval(() => {
-      if (TOKEN) refreshAll(true).catch(() => {});
-    }, 5000);
+      if (!TOKEN) return;
+      const every = PUSH_OPEN ? PUSH_FALLBACK_MS : POLL_MS;
+      if (Date.now() - LAST_REFRESH_AT >= every) refreshAll(true).catch(() => {});
+    }, POLL_MS);
+  }
+}
+
+// ----------------------------
+// Server push
+// ----------------------------
+
+function pushUrl() {
+  const base = getBase().replace(/^http/i, "ws");
+  return `${base}/ws?token=${encodeURIComponent(TOKEN)}`;
+}
+
+function disconnectPush() {
+  if (PUSH_RETRY_TIMER) {
+    clearTimeout(PUSH_RETRY_TIMER);
+    PUSH_RETRY_TIMER = null;
+  }
+  if (PUSH) {
+    PUSH.onclose = null;
+    PUSH.close();
+  }
+  PUSH = null;
+  PUSH_OPEN = false;
+}
+
+// Coalesce a burst of events (one tick can finish several things) into one refresh
+function refreshSoon() {
+  if (PUSH_REFRESH_TIMER) return;
+  PUSH_REFRESH_TIMER = setTimeout(() => {
+    PUSH_REFRESH_TIMER = null;
+    if (TOKEN) refreshAll(true).catch(() => {});
+  }, 250);
+}
+
+function onPush(ev) {
+  const cityId = parseInt(el("cityId").value, 10);
+
+  switch (ev.type) {
+    case "hello":
+      // not live: no ticker, or this worker can't relay other workers' ticks
+      PUSH_OPEN = ev.live === true;
+      refreshSoon();
+      break;
+    case "resync":
+      refreshSoon();
+      break;
+    case "resources":
+      // no request needed: the frame carries the new totals
+      if (ev.city_id === cityId) {
+        el("resourcesBox").textContent = JSON.stringify(ev.resources, null, 2);
+      }
+      break;
+    case "mail":
+      setStatus("cityStatus", `✉️ New mail: ${ev.subject}`);
+      break;
+    default:
+      // raid / training / research / upgrade
+      if (ev.city_id === cityId) refreshSoon();
   }
 }
 
+function connectPush() {
+  disconnectPush();
+  if (!TOKEN || !("WebSocket" in window)) return;
+
+  let ws;
+  try {
+    ws = new WebSocket(pushUrl());
+  } catch {
+    return;  // polling keeps working
+  }
+  PUSH = ws;
+
+  ws.onopen = () => {
+    PUSH_RETRY_MS = 1000;
+  };
+  ws.onmessage = (msg) => {
+    try { onPush(JSON.parse(msg.data)); } catch { /* ignore */ }
+  };
+  ws.onclose = () => {
+    PUSH = null;
+    PUSH_OPEN = false;
+    if (!TOKEN) return;
+    // back off up to a minute; auto-refresh polls in the meantime
+    PUSH_RETRY_TIMER = setTimeout(connectPush, PUSH_RETRY_MS);
+    PUSH_RETRY_MS = Math.min(PUSH_RETRY_MS * 2, PUSH_FALLBACK_MS);
+  };
+}
+
 function wire() {
   // auto-fill Base URL to the server that served /ui/
   el("baseUrl").value = window.location.origin;
 
   loadToken();
-  if (TOKEN) setStatus("loginStatus", "Token loaded from localStorage (try Refresh).");
+  if (TOKEN) {
+    setStatus("loginStatus", "Token loaded from localStorage (try Refresh).");
+    connectPush();
+  }
 
   el("loginBtn").addEventListener("click", () =>
     login().catch(e => setStatus("loginStatus", `❌ ${e.message}`))
@@ -0,0 +1,83 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# Serialization time for a 500-message /mail/inbox payload:
+#   default  = dict with isoformat() strings -> jsonable_encoder -> JSONResponse
+#   FAST_JSON = dict with raw datetimes      -> ORJSONResponse (no encoder walk)
+# No server or database needed. ROUNDS=200 by default.
+
+ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+cd "$ROOT_DIR"
+
+FAST_JSON=1 python - <<'PY'
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+import app.fast_json as fj
+from app.models.mail_message import MailMessage
+from app.routes.mail import _to_dict
+
+if not fj.FAST_JSON_ENABLED:
+    raise SystemExit("orjson is not installed")
+
+ROUNDS = int(os.getenv("ROUNDS", "200"))
+T0 = datetime(2026, 5, 1, 12, 0, 0, 123456)
+
+msgs = [
+    MailMessage(
+        id=10_000 - i,
+        user_id=1,
+        kind="raid_report",
+        subject=f"Raid report #{i}",
+        body="Your troops returned with loot.\n" * 4,
+        payload_json=json.dumps({"raid_id": i + 1, "loot": {"food": 120, "wood": 80, "stone": 40, "iron": 10}}),
+        is_read=i % 3 == 0,
+        created_at=T0 - timedelta(minutes=i),
+        read_at=(T0 if i % 3 == 0 else None),
+    )
+    for i in range(500)
+]
+
+
+def inbox_payload():
+    return {
+        "messages": [_to_dict(m) for m in msgs],
+        "count": len(msgs),
+        "next_before_id": int(msgs[-1].id),
+        "user_id": 1,
+    }
+
+
+def default_path() -> bytes:
+    fj.FAST_JSON_ENABLED = False
+    return JSONResponse(jsonable_encoder(inbox_payload())).body
+
+
+def fast_path() -> bytes:
+    fj.FAST_JSON_ENABLED = True
+    return fj.fast_json(inbox_payload()).body
+
+
+assert json.loads(default_path()) == json.loads(fast_path()), "payloads differ"
+
+
+def bench(fn) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn()
+    return (time.perf_counter() - started) / ROUNDS * 1000.0
+
+
+before = bench(default_path)
+after = bench(fast_path)
+print(f"500-message inbox, {ROUNDS} rounds ({len(fast_path())} bytes)")
+print(f"  jsonable_encoder + json : {before:7.2f} ms")
+print(f"  FAST_JSON (orjson)      : {after:7.2f} ms")
+print(f"  speedup                 : {before / after:7.1f}x")
+PY
@@ -0,0 +1,109 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# EXPLAIN QUERY PLAN for the tick-stage and inbox hot queries against a
+# scratch SQLite schema built from the models. Fails if any of them falls
+# back to a full table scan. No server needed.
+
+ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+cd "$ROOT_DIR"
+
+DB_FILE=$(mktemp /tmp/evony_plan_XXXXXX.db)
+trap 'rm -f "$DB_FILE"' EXIT
+
+DATABASE_URL="sqlite:///$DB_FILE" python - <<'PY'
+import sys
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+import app.main  # noqa: F401  (registers every model)
+from app.database import Base, engine
+from app.models.mail_message import MailMessage
+from app.models.raid import Raid
+from app.models.research_queue import ResearchQueue
+from app.models.session import SessionToken
+from app.models.training_queue import TrainingQueue
+from app.models.upgrade import Upgrade
+
+Base.metadata.create_all(engine)
+now = datetime.utcnow()
+
+CHECKS = {
+    "upgrades due": select(Upgrade).where(Upgrade.completes_at <= now),
+    "next upgrade": select(func.min(Upgrade.completes_at)).where(Upgrade.completes_at > now),
+    "raid arrivals due": (
+        select(Raid)
+        .where(Raid.status == "enroute", Raid.arrives_at <= now)
+        .order_by(Raid.arrives_at, Raid.id)
+    ),
+    "raid returns due": (
+        select(Raid)
+        .where(Raid.status == "returning", Raid.returns_at <= now)
+        .order_by(Raid.returns_at, Raid.id)
+    ),
+    "next raid arrival": select(func.min(Raid.arrives_at)).where(Raid.status == "enroute"),
+    "training due": (
+        select(TrainingQueue.id)
+        .where(TrainingQueue.status == "training", TrainingQueue.finishes_at <= now)
+        .order_by(TrainingQueue.id)
+    ),
+    "research due": (
+        select(ResearchQueue.id)
+        .where(ResearchQueue.status == "researching", ResearchQueue.finishes_at <= now)
+        .order_by(ResearchQueue.id)
+    ),
+    "inbox": (
+        select(MailMessage)
+        .where(MailMessage.user_id == 1, MailMessage.id < 1000)
+        .order_by(MailMessage.id.desc()).limit(50)
+    ),
+    "inbox unread": (
+        select(MailMessage)
+        .where(MailMessage.user_id == 1, MailMessage.is_read == 0)
+        .order_by(MailMessage.id.desc()).limit(50)
+    ),
+    "inbox by kind": (
+        select(MailMessage)
+        .where(MailMessage.user_id == 1, MailMessage.kind == "raid_report")
+        .order_by(MailMessage.id.desc()).limit(50)
+    ),
+    "unread count": (
+        select(func.count(MailMessage.id))
+        .where(MailMessage.user_id == 1, MailMessage.is_read == 0)
+    ),
+    "expired sessions": (
+        select(SessionToken.id, SessionToken.token)
+        .where(SessionToken.expires_at <= now)
+        .order_by(SessionToken.expires_at, SessionToken.id).limit(500)
+    ),
+    "user sessions": (
+        select(SessionToken.id)
+        .where(SessionToken.user_id == 1)
+        .order_by(SessionToken.created_at.desc(), SessionToken.id.desc())
+    ),
+    "unread count by kind": (
+        select(func.count(MailMessage.id))
+        .where(MailMessage.user_id == 1, MailMessage.is_read == 0, MailMessage.kind == "raid_report")
+    ),
+}
+
+failed = 0
+with engine.connect() as conn:
+    for name, stmt in CHECKS.items():
+        compiled = stmt.compile(dialect=engine.dialect)
+        params = tuple(compiled.params[k] for k in compiled.positiontup)
+        rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled), params).all()
+        plan = [str(r[-1]) for r in rows]
+
+        scans = [p for p in plan if p.startswith("SCAN ")]
+        mark = "❌" if scans else "✅"
+        print(f"{mark} {name}: " + " | ".join(plan))
+        if scans:
+            failed += 1
+
+if failed:
+    print(f"❌ {failed} hot query plan(s) use a full scan", file=sys.stderr)
+    sys.exit(1)
+print("✅ no full scans")
+PY
@@ -27,7 +27,8 @@ SET
   wood=$SET_WOOD,
   stone=$SET_STONE,
   iron=$SET_IRON,
-  last_tick_at=datetime('now')
+  last_tick_at=datetime('now'),
+  full_at=NULL
 WHERE id IN ($ATTACKER_CITY_ID,$TARGET_CITY_ID);
 "
 
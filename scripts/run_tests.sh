@@ -11,6 +11,10 @@ run() {
   "./scripts/$name"
 }
 
+run "query_plan_testing.sh"
+run "tick_equivalence_testing.sh"
+run "signed_token_testing.sh"
+run "session_prune_testing.sh"
 run "test_seed.sh"
 run "train_testing.sh"
 run "train_buildings_rules_testing.sh"
@@ -0,0 +1,101 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# Session pruning (app/maintenance.py prune_sessions): seeds expired sessions
+# and more than SESSION_MAX_PER_USER live ones for one user, prunes in small
+# chunks, and checks the reported counts and that every deleted token (even
+# one sitting in the token cache) then gets 401 while the kept ones still
+# work. Runs the app in-process against a scratch SQLite database.
+
+ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+cd "$ROOT_DIR"
+
+DB_FILE=$(mktemp /tmp/evony_prune_XXXXXX.db)
+trap 'rm -f "$DB_FILE"' EXIT
+
+DATABASE_URL="sqlite:///$DB_FILE" AUTH_SIGNED_TOKENS=0 AUTH_CACHE_ENABLED=1 \
+  SESSION_MAX_PER_USER=3 SESSION_PRUNE_CHUNK=2 PASSWORD_HASH_WORKERS=0 python - <<'PY'
+import secrets
+import sys
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+import app.main
+from app.database import Base, SessionLocal, engine
+from app.maintenance import prune_sessions
+from app.models.session import SessionToken
+
+EXPIRED = 5
+LIVE = 7
+KEEP = 3  # SESSION_MAX_PER_USER above
+
+Base.metadata.create_all(engine)
+client = TestClient(app.main.app)
+
+failed = 0
+
+
+def check(name: str, ok: bool, detail: object = "") -> None:
+    global failed
+    print(f"{'✅' if ok else '❌'} {name}" + (f" ({detail})" if detail and not ok else ""))
+    if not ok:
+        failed += 1
+
+
+r = client.post("/auth/register", json={"username": "pruner", "password": "ChangeMe123!"})
+user_id, city_id = r.json()["user_id"], r.json()["city_id"]
+
+now = datetime.utcnow()
+expired, live = [], []
+with SessionLocal() as db:
+    for i in range(EXPIRED):
+        token = secrets.token_hex(32)
+        db.add(SessionToken(user_id=user_id, token=token, created_at=now - timedelta(days=2, minutes=i),
+                            expires_at=now - timedelta(hours=1, minutes=i)))
+        expired.append(token)
+    # live[0] is the newest
+    for i in range(LIVE):
+        token = secrets.token_hex(32)
+        db.add(SessionToken(user_id=user_id, token=token, created_at=now - timedelta(minutes=i),
+                            expires_at=now + timedelta(hours=12)))
+        live.append(token)
+    db.commit()
+
+
+def city_status(token: str) -> int:
+    return client.get(f"/cities/{city_id}", headers={"Authorization": f"Bearer {token}"}).status_code
+
+
+# every live token is cached now; pruning must evict the ones it deletes
+check("all live sessions accepted before the prune", all(city_status(t) == 200 for t in live))
+check("expired sessions rejected before the prune", all(city_status(t) == 401 for t in expired))
+
+with SessionLocal() as db:
+    report = prune_sessions(db, now)
+    remaining = {t for (t,) in db.execute(select(SessionToken.token)).all()}
+    left = int(db.execute(select(func.count(SessionToken.id))).scalar() or 0)
+print(report)
+
+check("expired_deleted", report["expired_deleted"] == EXPIRED, report["expired_deleted"])
+check("over_cap_deleted", report["over_cap_deleted"] == LIVE - KEEP, report["over_cap_deleted"])
+check("over_cap_users", report["over_cap_users"] == 1, report["over_cap_users"])
+# chunks of SESSION_PRUNE_CHUNK=2: 5 expired -> 3, 4 over the cap -> 2
+check("deleted in chunks", report["chunks"] == 5, report["chunks"])
+check("sessions_remaining", report["sessions_remaining"] == KEEP == left, (report["sessions_remaining"], left))
+check("the newest sessions are kept", remaining == set(live[:KEEP]))
+
+check("kept sessions still accepted", all(city_status(t) == 200 for t in live[:KEEP]))
+check("capped sessions get 401 despite the cache", all(city_status(t) == 401 for t in live[KEEP:]))
+check("expired sessions still get 401", all(city_status(t) == 401 for t in expired))
+
+with SessionLocal() as db:
+    again = prune_sessions(db, now)
+check("a second prune finds nothing", again["expired_deleted"] == 0 and again["over_cap_deleted"] == 0, again)
+
+if failed:
+    print(f"❌ {failed} session prune check(s) failed", file=sys.stderr)
+    sys.exit(1)
+print("✅ session pruning works")
+PY
@@ -0,0 +1,101 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# Signed-token logout (AUTH_SIGNED_TOKENS=1): a logged-out token must get 401
+# on the worker that served the logout and, once the token cache is empty
+# (another worker, or a restart), from the revoked_tokens row. Runs the app
+# in-process against a scratch SQLite database; no server needed.
+
+ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+cd "$ROOT_DIR"
+
+DB_FILE=$(mktemp /tmp/evony_signed_XXXXXX.db)
+trap 'rm -f "$DB_FILE"' EXIT
+
+DATABASE_URL="sqlite:///$DB_FILE" AUTH_SIGNED_TOKENS=1 AUTH_TOKEN_SECRET=signed-token-test \
+  AUTH_CACHE_ENABLED=1 PASSWORD_HASH_WORKERS=0 python - <<'PY'
+import sys
+
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+from sqlalchemy import false, func, select
+
+import app.main
+import app.routes.auth as auth
+from app.database import Base, SessionLocal, engine
+from app.models.revoked_token import RevokedToken
+from app.session_cache import TOKEN_CACHE
+
+Base.metadata.create_all(engine)
+client = TestClient(app.main.app)
+
+failed = 0
+
+
+def check(name: str, ok: bool, detail: object = "") -> None:
+    global failed
+    print(f"{'✅' if ok else '❌'} {name}" + (f" ({detail})" if detail and not ok else ""))
+    if not ok:
+        failed += 1
+
+
+def login(username: str) -> tuple[str, int]:
+    r = client.post("/auth/register", json={"username": username, "password": "ChangeMe123!"})
+    city_id = r.json()["city_id"]
+    token = client.post("/auth/login", json={"username": username, "password": "ChangeMe123!"}).json()["token"]
+    return token, city_id
+
+
+def city_status(token: str, city_id: int) -> int:
+    return client.get(f"/cities/{city_id}", headers={"Authorization": f"Bearer {token}"}).status_code
+
+
+def revocations() -> int:
+    with SessionLocal() as db:
+        return int(db.execute(select(func.count(RevokedToken.id))).scalar() or 0)
+
+
+token, city_id = login("signer")
+check("login issues a signed token", token.startswith("s1."), token[:8])
+check("signed token is accepted", city_status(token, city_id) == 200)
+
+r = client.post("/auth/logout", headers={"Authorization": f"Bearer {token}"})
+check("logout revokes it", r.status_code == 200 and r.json().get("revoked") is True, r.text)
+check("revocation stored once", revocations() == 1, revocations())
+
+check("401 on the same worker", city_status(token, city_id) == 401)
+
+TOKEN_CACHE.clear()  # another worker, or this one after a restart
+check("401 with an empty token cache", city_status(token, city_id) == 401)
+try:
+    with client.websocket_connect(f"/ws?token={token}") as ws:
+        ws.receive_json()
+    ws_refused = False
+except WebSocketDisconnect:
+    ws_refused = True
+check("/ws refuses it too", ws_refused)
+
+r = client.post("/auth/logout", headers={"Authorization": f"Bearer {token}"})
+check("second logout is harmless", r.status_code == 200 and revocations() == 1, r.text)
+
+# Two concurrent logouts: both miss the existence check, the second insert
+# hits the unique token_hash and must still answer 200.
+other, other_city = login("racer")
+check("second user accepted", city_status(other, other_city) == 200)
+client.post("/auth/logout", headers={"Authorization": f"Bearer {other}"})
+real_query = auth._revoked_query
+auth._revoked_query = lambda _token: select(RevokedToken.id).where(false())
+try:
+    r = client.post("/auth/logout", headers={"Authorization": f"Bearer {other}"})
+finally:
+    auth._revoked_query = real_query
+check("racing logout answers 200", r.status_code == 200, r.text)
+check("racing logout stored no duplicate", revocations() == 2, revocations())
+TOKEN_CACHE.clear()
+check("racer's token stays revoked", city_status(other, other_city) == 401)
+
+if failed:
+    print(f"❌ {failed} signed-token check(s) failed", file=sys.stderr)
+    sys.exit(1)
+print("✅ signed-token revocation works across workers")
+PY
@@ -146,7 +146,8 @@ drain_attacker() {
       food  = MAX(0, food  - $DRAIN_FOOD),
       wood  = MAX(0, wood  - $DRAIN_WOOD),
       stone = MAX(0, stone - $DRAIN_STONE),
-      iron  = MAX(0, iron  - $DRAIN_IRON)
+      iron  = MAX(0, iron  - $DRAIN_IRON),
+      full_at = NULL
     WHERE id=$cid;
   "
 }
@@ -0,0 +1,208 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# Tick equivalence: the same seeded world (raids in both directions,
+# upgrades, training, research, governors) ticked forward six hours under
+#   default               per-city production on loaded rows
+#   TICK_BULK_PRODUCTION  production as UPDATE statements
+#   LAZY_RESOURCES        production derived on read, settled at the end
+#   scoped                default mode, every city ticked on its own first
+# must end in identical city, troop, raid, hero, queue and mail state.
+# Scratch SQLite per run, no server needed. SEED=7 / CITIES=40 by default.
+
+ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+cd "$ROOT_DIR"
+
+SEED="${SEED:-7}"
+CITIES="${CITIES:-40}"
+
+WORK_DIR=$(mktemp -d /tmp/evony_tick_eq_XXXXXX)
+trap 'rm -rf "$WORK_DIR"' EXIT
+
+run_world() {
+  local name="$1"; shift
+  echo "== $name =="
+  env "$@" DATABASE_URL="sqlite:///$WORK_DIR/$name.db" \
+    SEED="$SEED" CITIES="$CITIES" OUT="$WORK_DIR/$name.json" \
+    TICK_SCOPE_MODE="${TICK_SCOPE_MODE:-world}" python - <<'PY'
+import json
+import os
+import random
+from datetime import datetime, timedelta
+
+import app.main  # noqa: F401  (registers every model)
+import app.game.tick as tick
+from app.database import Base, SessionLocal, engine
+from app.game.resources import materialize_city
+from app.models.building import Building
+from app.models.city import City
+from app.models.city_troop import CityTroop
+from app.models.hero import Hero
+from app.models.mail_message import MailMessage
+from app.models.raid import Raid
+from app.models.raid_troop import RaidTroop
+from app.models.raid_defender_troop import RaidDefenderTroop
+from app.models.research import Research
+from app.models.research_queue import ResearchQueue
+from app.models.training_queue import TrainingQueue
+from app.models.troop_type import TroopType
+from app.models.upgrade import Upgrade
+from app.models.user import User
+
+Base.metadata.create_all(engine)
+
+rng = random.Random(int(os.environ["SEED"]))
+n_cities = int(os.environ["CITIES"])
+T0 = datetime(2026, 5, 1, 12, 0, 0)
+
+db = SessionLocal()
+troop_types = [
+    TroopType(id=1, code="t1_inf", name="Inf", tier=1, attack=10, defense=12, hp=120, speed=100, carry=5),
+    TroopType(id=2, code="t1_arc", name="Arc", tier=1, attack=14, defense=8, hp=90, speed=120, carry=3),
+    TroopType(id=3, code="t2_cav", name="Cav", tier=2, attack=25, defense=15, hp=200, speed=200, carry=10),
+]
+db.add_all(troop_types)
+
+for i in range(1, n_cities + 1):
+    db.add(User(id=i, username=f"u{i}", password_hash="x", created_at=T0))
+    db.add(City(
+        id=i, owner_id=i, name=f"C{i}", x=rng.randint(0, 50), y=rng.randint(0, 50),
+        food=rng.randint(0, 9000), wood=rng.randint(0, 9000),
+        stone=rng.randint(0, 5000), iron=rng.randint(0, 4000),
+        last_tick_at=T0 - timedelta(seconds=rng.randint(0, 4000)),
+        created_at=T0,
+    ))
+    for t in ["townhall", "farm", "sawmill", "quarry", "ironmine", "warehouse", "academy", "barracks"]:
+        db.add(Building(city_id=i, type=t, level=rng.randint(1, 5)))
+    for tt in troop_types:
+        if rng.random() < 0.8:
+            db.add(CityTroop(city_id=i, troop_type_id=tt.id, count=rng.randint(0, 300)))
+    if rng.random() < 0.5:
+        db.add(Hero(city_id=i, name=f"H{i}", level=rng.randint(1, 6), xp=rng.randint(0, 90),
+                    specialty=rng.choice(["GENERAL", "DEFENDER", "BUILDER", "SCOUT"]), status="governor"))
+    if rng.random() < 0.5:
+        db.add(Upgrade(city_id=i, building_type=rng.choice(["farm", "warehouse", "townhall", "quarry"]),
+                       from_level=1, to_level=6, started_at=T0,
+                       completes_at=T0 + timedelta(seconds=rng.randint(-600, 14000))))
+    for _ in range(rng.randint(0, 2)):
+        db.add(TrainingQueue(city_id=i, troop_type_id=rng.randint(1, 3), count=rng.randint(1, 50),
+                             status="training", started_at=T0,
+                             finishes_at=T0 + timedelta(seconds=rng.randint(-300, 14000))))
+    if rng.random() < 0.4:
+        db.add(ResearchQueue(city_id=i, research_key="agriculture", from_level=0, to_level=1,
+                             started_at=T0, status="researching",
+                             finishes_at=T0 + timedelta(seconds=rng.randint(-300, 14000))))
+db.flush()
+
+raid_id = 0
+for attacker in range(1, n_cities + 1):
+    for _ in range(rng.randint(0, 2)):
+        target = rng.randint(1, n_cities)
+        if target == attacker:
+            continue
+        raid_id += 1
+        outbound = rng.randint(60, 7200)
+        status = "enroute" if rng.random() < 0.8 else "returning"
+        arrives = T0 + timedelta(seconds=rng.randint(-1200, 12000))
+        raid = Raid(id=raid_id, attacker_city_id=attacker, target_city_id=target,
+                    carry_capacity=rng.randint(100, 3000), created_at=arrives - timedelta(seconds=outbound),
+                    status=status, outbound_seconds=outbound, return_seconds=rng.randint(60, 7200),
+                    arrives_at=arrives, returns_at=None)
+        if status == "returning":
+            raid.returns_at = arrives + timedelta(seconds=rng.randint(60, 7200))
+            raid.stolen_food = rng.randint(0, 500)
+            raid.stolen_iron = rng.randint(0, 500)
+        db.add(raid)
+        db.flush()
+        for tid in rng.sample([1, 2, 3], rng.randint(1, 3)):
+            db.add(RaidTroop(raid_id=raid.id, troop_type_id=tid, count_sent=rng.randint(1, 200), count_lost=0))
+
+# stored rate / cap columns from the buildings, as registration leaves them
+for c in db.query(City).all():
+    tick.refresh_city_stats(db, c)
+db.commit()
+db.close()
+
+scoped = os.environ["TICK_SCOPE_MODE"] == "city"
+end = T0 + timedelta(hours=6)
+for at in [T0 + timedelta(minutes=10), T0 + timedelta(hours=1), T0 + timedelta(hours=4), end]:
+    s = SessionLocal()
+    if scoped:
+        for cid in range(1, n_cities + 1):
+            tick.tick_cities(s, at, [cid])
+    tick.tick_all_cities(s, at)
+    s.close()
+
+# lazy mode leaves production unwritten: settle every city for the comparison
+s = SessionLocal()
+for c in s.query(City).all():
+    materialize_city(c, end)
+s.commit()
+
+
+def dump(model, key, skip=()):
+    rows = []
+    for o in s.query(model).all():
+        row = {c.name: getattr(o, c.key) for c in model.__table__.columns if c.name not in skip}
+        rows.append({k: v.isoformat() if isinstance(v, datetime) else v for k, v in row.items()})
+    return sorted(rows, key=key)
+
+
+state = {
+    "cities": dump(City, lambda r: r["id"], ("created_at", "full_at", "next_event_at")),
+    "troops": dump(CityTroop, lambda r: (r["city_id"], r["troop_type_id"]), ("id",)),
+    "raids": dump(Raid, lambda r: r["id"]),
+    "raid_troops": dump(RaidTroop, lambda r: (r["raid_id"], r["troop_type_id"]), ("id",)),
+    "defender_troops": dump(RaidDefenderTroop, lambda r: (r["raid_id"], r["troop_type_id"]), ("id",)),
+    "heroes": dump(Hero, lambda r: r["id"]),
+    "buildings": dump(Building, lambda r: r["id"]),
+    "upgrades": dump(Upgrade, lambda r: r["id"]),
+    "training": dump(TrainingQueue, lambda r: r["id"]),
+    "research_queue": dump(ResearchQueue, lambda r: r["id"]),
+    "research": dump(Research, lambda r: (r["city_id"], r["research_key"]), ("id",)),
+    "mail": dump(MailMessage, lambda r: (r["user_id"], r["subject"], r["body"]), ("id", "created_at")),
+}
+with open(os.environ["OUT"], "w") as f:
+    json.dump(state, f, indent=1, sort_keys=True)
+
+statuses = {st: sum(1 for r in state["raids"] if r["status"] == st) for st in ("enroute", "returning", "resolved")}
+print(f"raids={statuses} mail={len(state['mail'])} troops={len(state['troops'])}")
+PY
+}
+
+run_world default
+run_world bulk TICK_BULK_PRODUCTION=1
+run_world lazy LAZY_RESOURCES=1
+TICK_SCOPE_MODE=city run_world scoped
+
+WORK_DIR="$WORK_DIR" python - <<'PY'
+import json
+import os
+import sys
+
+work = os.environ["WORK_DIR"]
+states = {name: json.load(open(f"{work}/{name}.json")) for name in ("default", "bulk", "lazy", "scoped")}
+base = states.pop("default")
+
+if not any(r["status"] == "resolved" for r in base["raids"]) or not base["mail"]:
+    print("❌ seeded world resolved no raids; the comparison would prove nothing", file=sys.stderr)
+    sys.exit(1)
+
+failed = 0
+for name, state in states.items():
+    diff = [table for table in base if base[table] != state[table]]
+    if diff:
+        failed += 1
+        print(f"❌ {name} differs from default in: {', '.join(diff)}")
+        table = diff[0]
+        for a, b in zip(base[table], state[table]):
+            if a != b:
+                print(f"   first {table} difference:\n     default: {a}\n     {name}: {b}")
+                break
+    else:
+        print(f"✅ {name} matches default")
+
+if failed:
+    sys.exit(1)
+print("✅ tick modes agree")
+PY